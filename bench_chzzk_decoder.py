@@ -0,0 +1,133 @@
+# bench_chzzk_decoder.py
+# 치지직 채팅 프레임 해석 방식 비교 (기존: 프레임/profile 전부 json.loads, 신규: '!' 사전 검사 + profile 지연 해석)
+# 사용 예: python bench_chzzk_decoder.py --chat-log logs/chat_20250101.jsonl.gz
+#          python bench_chzzk_decoder.py --frames frames.txt   (한 줄에 웹소켓 프레임 하나)
+import sys
+import json
+import time
+import random
+import argparse
+
+from src import chzzk_decoder
+from src.chzzk_decoder import decode_frame, parse_nickname, CHAT_CMD
+from src.chat_recorder import iter_chat_log
+from src.utils import extract_guess
+
+SAMPLE_MESSAGES = ["ㅋㅋㅋㅋㅋ", "안녕하세요", "오늘 방송 재밌네요", "이거 뭐임?", "ㄹㅇ", "와 대박", "굿굿", "하이하이 반가워요"]
+
+def build_chat(nickname, msg, msg_time):
+    # 실제 치지직 93101 프레임의 채팅 한 건과 비슷한 크기/구조
+    profile = {
+        "userIdHash": f"{random.getrandbits(128):032x}", "nickname": nickname, "profileImageUrl": "",
+        "userRoleCode": "common_user", "badge": None, "title": None, "verifiedMark": False,
+        "activityBadges": [{"badgeNo": 1, "badgeId": "donation_newbie", "imageUrl": "https://example.com/badge.png", "activated": True}],
+        "streamingProperty": {"subscription": {"accumulativeMonth": 3, "tier": 1}, "nicknameColor": {"colorCode": "CC000"}},
+    }
+    extras = {"chatType": "STREAMING", "osType": "PC", "streamingChannelId": "0" * 32, "emojis": {}}
+    return {
+        "svcid": "game", "cid": "N1abcd", "mbrCnt": 1500, "uid": profile["userIdHash"],
+        "profile": json.dumps(profile, ensure_ascii=False), "msg": msg, "msgTypeCode": 1, "msgStatusType": "NORMAL",
+        "extras": json.dumps(extras, ensure_ascii=False), "ctime": msg_time, "utime": msg_time, "msgTime": msg_time,
+    }
+
+def build_frame(chats):
+    return json.dumps({"svcid": "game", "ver": "1", "bdy": chats, "cmd": CHAT_CMD, "tid": None, "cid": "N1abcd"}, ensure_ascii=False)
+
+def synthetic_frames(count, guess_ratio, per_frame, seed):
+    random.seed(seed)
+    frames = []
+    now = int(time.time() * 1000)
+    for i in range(count):
+        chats = []
+        for j in range(per_frame):
+            msg = f"!단어{random.randint(0, 9999)}" if random.random() < guess_ratio else random.choice(SAMPLE_MESSAGES)
+            chats.append(build_chat(f"시청자{random.randint(0, 5000)}", msg, now + i * 50 + j))
+        frames.append(build_frame(chats))
+    return frames
+
+def frames_from_chat_log(path, per_frame):
+    chats = [build_chat(e["n"], e["m"], int(e["st"] or e["t"] * 1000))
+             for e in iter_chat_log(path) if e["p"] == "치지직"]
+    return [build_frame(chats[i:i + per_frame]) for i in range(0, len(chats), per_frame)]
+
+def legacy_decode(frame):
+    # 기존 ChzzkMonitor.run 과 동일한 처리
+    found = []
+    data = json.loads(frame)
+    if data.get('cmd') == CHAT_CMD:
+        for chat in data.get('bdy', []):
+            msg = chat.get('msg', '').strip()
+            profile = json.loads(chat.get('profile', '{}'))
+            nickname = profile.get('nickname', '익명')
+            if "클린봇" in msg: continue
+            guess = extract_guess(msg)
+            if guess:
+                found.append((nickname, guess))
+    return found
+
+def fast_decode(frame):
+    found = []
+    cmd, data = decode_frame(frame)
+    if cmd == CHAT_CMD and data is not None:
+        for chat in data.get('bdy', []):
+            msg = (chat.get('msg') or '').strip()
+            guess = extract_guess(msg)
+            if not guess or "클린봇" in msg: continue
+            found.append((parse_nickname(chat.get('profile')), guess))
+    return found
+
+def measure(decoder, frames, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            decoder(frame)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="치지직 채팅 프레임 해석 마이크로 벤치마크")
+    parser.add_argument("--frames", default=None, help="웹소켓 프레임 파일 (한 줄에 한 프레임)")
+    parser.add_argument("--chat-log", default=None, help="CHAT_RECORD_PATH 로 저장한 채팅 기록 (.jsonl.gz) 으로 프레임 생성")
+    parser.add_argument("--count", type=int, default=5000, help="합성 프레임 수")
+    parser.add_argument("--per-frame", type=int, default=3, help="프레임당 채팅 수")
+    parser.add_argument("--guess-ratio", type=float, default=0.05, help="합성 채팅 중 '!' 로 시작하는 비율")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 측정 횟수 (최솟값 사용)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.frames:
+        with open(args.frames, encoding="utf-8") as f:
+            frames = [line.strip() for line in f if line.strip()]
+    elif args.chat_log:
+        frames = frames_from_chat_log(args.chat_log, args.per_frame)
+    else:
+        frames = synthetic_frames(args.count, args.guess_ratio, args.per_frame, args.seed)
+    if not frames:
+        print("[오류] 측정할 프레임이 없습니다.")
+        sys.exit(1)
+
+    expected = [legacy_decode(frame) for frame in frames]
+    if [fast_decode(frame) for frame in frames] != expected:
+        print("[오류] 신규 해석 결과가 기존 방식과 다릅니다.")
+        sys.exit(1)
+
+    skipped = sum(1 for frame in frames if decode_frame(frame)[1] is None)
+    total_bytes = sum(len(frame.encode("utf-8")) for frame in frames)
+    print(f"[벤치] 프레임 {len(frames):,}개 ({total_bytes / 1024 / 1024:.1f}MB) | 정답 후보 {sum(map(len, expected)):,}건 | 해석 생략 프레임 {skipped:,}개")
+
+    results = [("기존 (json 전체 해석)", measure(legacy_decode, frames, args.repeat))]
+    default_loads = chzzk_decoder._loads
+    chzzk_decoder._loads = json.loads
+    results.append(("신규 (json)", measure(fast_decode, frames, args.repeat)))
+    chzzk_decoder._loads = default_loads
+    if chzzk_decoder.JSON_BACKEND != "json":
+        results.append((f"신규 ({chzzk_decoder.JSON_BACKEND})", measure(fast_decode, frames, args.repeat)))
+
+    baseline = results[0][1]
+    for name, elapsed in results:
+        print(f"- {name:<24} {elapsed * 1e6 / len(frames):>8.2f} µs/프레임 | {len(frames) / elapsed:>10,.0f} 프레임/s | x{baseline / elapsed:.1f}")
+
+if __name__ == "__main__":
+    main()
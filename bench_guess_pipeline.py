@@ -0,0 +1,492 @@
+# bench_guess_pipeline.py
+# 채팅 폭주 상황을 흉내 내어 word_detected -> handle_new_word -> _bg_check_word -> on_word_check_finished
+# 경로의 처리량과 지연 시간을 측정하는 벤치마크 (GUI 없이 offscreen Qt 로 실행)
+# 사용 예: python bench_guess_pipeline.py --rate 200 --duration 30
+import os
+import sys
+import time
+import random
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 벤치 중 메일이 발송되지 않도록 메일 설정 제거
+for _key in ("MAIL_SENDER", "MAIL_PASSWORD", "MAIL_RECEIVER"):
+    os.environ.pop(_key, None)
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+from src.utils import apply_dueum_rule
+from src.tracing import tracer
+
+BENCH_BAD_WORDS = ["벤치욕설", "테스트비속어", "나쁜말"]
+DEFAULT_MIX = "valid=30,used=15,typo=20,profanity=10,wrong_start=25"
+TRUSTED_SOURCES = ('URI', 'Standard', 'naver_wiki', 'admin', 'subway', 'wikipedia')
+
+# 무작위 단어 생성용 음절 (자주 쓰이는 음절 위주로 제한해야 끝말잇기가 이어짐)
+COMMON_SYLLABLES = list(
+    "가각간갈감강개거건걸검게격견결경계고곡공과관광교구국군굴궁권귀규균그극근금기긴길김"
+    "나난날남내너녀년노농누눈다단달담당대더도독동두드득등라락란람랑래량려력련령례로록론료"
+    "루류률르름리린림립마막만말망매머면명모목몽무문물미민밀바박반발방배백번벌범법벽변별병"
+    "보복본봉부북분불비빈사산살삼상새생서석선설성세소속손송수숙순술시식신실심아악안알암압"
+    "애야약양어억언얼엄업여역연열염영예오옥온와완왕외요욕용우운울원월위유육윤율은음응의이"
+    "인일임입자작잔장재저적전절점정제조족존종좌주죽준중지직진질집차착찬참창채책처천철청체"
+    "초촉총최추축춘출충취측치친칠침카타탁탄탈탐탑태택토통투특파판팔패편평포폭표풍피필하학"
+    "한할함합항해핵행향허헌험혁현혈협형혜호혹혼홍화확환활황회획효후훈휘휴흑흥희"
+)
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    f = int(k)
+    c = min(f + 1, len(sorted_values) - 1)
+    return sorted_values[f] + (sorted_values[c] - sorted_values[f]) * (k - f)
+
+class SQLiteDatabaseManager:
+    """
+    DatabaseManager 와 같은 메서드를 제공하는 SQLite 대체품. 벤치마크에서 MySQL 없이 게임 로직을 돌릴 때 사용.
+    db_latency_ms 를 주면 쿼리마다 지연을 넣어 원격 DB 왕복 시간을 흉내 냅니다.
+    """
+    def __init__(self, words, db_latency_ms=0.0):
+        self.current_game_id = None
+        self.lock = threading.Lock()
+        self.banned_chars = {}
+        self.db_latency = db_latency_ms / 1000.0
+        self.history_count = 0
+        self.system_log_count = 0
+
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE ko_word (
+                num INTEGER PRIMARY KEY AUTOINCREMENT,
+                word TEXT NOT NULL UNIQUE,
+                is_use INTEGER DEFAULT 0,
+                is_use_date TEXT,
+                is_use_user TEXT,
+                can_use INTEGER DEFAULT 1,
+                start_char TEXT,
+                end_char TEXT,
+                source TEXT NOT NULL,
+                available INTEGER DEFAULT 1
+            )
+        """)
+        self.conn.execute("CREATE INDEX idx_start_char ON ko_word(start_char)")
+        self.conn.execute("CREATE INDEX idx_end_char ON ko_word(end_char)")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO ko_word (word, start_char, end_char, source) VALUES (?, ?, ?, 'Standard')",
+            ((w, w[0], w[-1]) for w in words)
+        )
+        self.conn.commit()
+
+    def _query(self, sql, params=()):
+        if self.db_latency:
+            time.sleep(self.db_latency)
+        return self.conn.execute(sql, params)
+
+    def connect(self): pass
+
+    def log_system(self, level, source, message, trace=None):
+        self.system_log_count += 1
+
+    def log_history(self, nickname, input_word, previous_word, status, reason=None):
+        self.history_count += 1
+
+    def get_recent_logs(self, log_type, limit=10):
+        return []
+
+    def start_new_game_session(self, start_word):
+        self.current_game_id = 1
+
+    def end_game_session(self, fail_count, end_word, end_platform, end_user):
+        self.current_game_id = None
+
+    def check_and_use_word(self, word, nickname):
+        word = word.strip()
+        with self.lock:
+            if word[-1] in self.banned_chars:
+                return "forbidden_end_char"
+            row = self._query("SELECT num, is_use, can_use, available FROM ko_word WHERE word = ?", (word,)).fetchone()
+            if not row: return "not_found"
+            pk_num, is_use, can_use, available = row
+            if not available: return "unavailable"
+            if not can_use: return "forbidden"
+            if is_use: return "used"
+            cur = self._query(
+                "UPDATE ko_word SET is_use = 1, is_use_date = ?, is_use_user = ? WHERE num = ? AND is_use = 0",
+                (datetime.now().isoformat(), nickname, pk_num)
+            )
+            return "success" if cur.rowcount > 0 else "used"
+
+    def check_remaining_words(self, start_char):
+        with self.lock:
+            banned = list(self.banned_chars.keys())
+            sql = f"""
+                SELECT count(*) FROM ko_word
+                WHERE start_char = ? AND is_use = 0 AND can_use = 1 AND available = 1
+                AND source IN ({','.join('?' * len(TRUSTED_SOURCES))})
+            """
+            params = [start_char, *TRUSTED_SOURCES]
+            if banned:
+                sql += f" AND end_char NOT IN ({','.join('?' * len(banned))})"
+                params.extend(banned)
+            return self._query(sql, params).fetchone()[0]
+
+    def check_and_ban_start_char(self, last_word):
+        if not last_word: return
+        target_char = last_word[-1]
+        with self.lock:
+            rows = self._query(
+                "SELECT end_char FROM ko_word WHERE start_char IN (%s) AND is_use = 0 AND can_use = 1 AND available = 1"
+                % ','.join('?' * len(apply_dueum_rule(target_char))),
+                apply_dueum_rule(target_char)
+            ).fetchall()
+            if len(rows) <= 5:
+                self.banned_chars[target_char] = datetime.now()
+
+    def toggle_banned_char(self, char):
+        with self.lock:
+            if char in self.banned_chars:
+                del self.banned_chars[char]
+                return f"[성공] '{char}' 글자가 금지 목록에서 해제되었습니다."
+            self.banned_chars[char] = datetime(2099, 12, 31)
+            return f"[성공] '{char}' 글자가 영구 금지 목록에 추가되었습니다."
+
+    def get_banned_end_chars(self):
+        with self.lock:
+            return list(self.banned_chars.keys())
+
+    def check_rare_end_word(self, end_char):
+        with self.lock:
+            return self._query("SELECT count(*) FROM ko_word WHERE end_char = ?", (end_char,)).fetchone()[0]
+
+    def get_used_word_count(self):
+        with self.lock:
+            return self._query("SELECT COUNT(*) FROM ko_word WHERE is_use = 1").fetchone()[0]
+
+    def mark_word_as_forbidden(self, word):
+        with self.lock:
+            return self._query("UPDATE ko_word SET can_use = 0 WHERE word = ?", (word.strip(),)).rowcount > 0
+
+    def admin_force_use_word(self, word, nickname="console-admin"):
+        with self.lock:
+            return self._query("UPDATE ko_word SET is_use = 1, is_use_user = ? WHERE word = ?", (nickname, word)).rowcount > 0
+
+    def test_db_integrity(self):
+        return True, "정상 응답 (SQLite)"
+
+    def get_last_used_word(self):
+        return ("시작", None)
+
+    def get_random_start_word(self):
+        with self.lock:
+            row = self._query("SELECT word FROM ko_word WHERE can_use = 1 AND available = 1 ORDER BY RANDOM() LIMIT 1").fetchone()
+            return row[0] if row else "시작"
+
+    def get_and_use_random_available_word(self, nickname="console-random"):
+        with self.lock:
+            row = self._query("SELECT num, word FROM ko_word WHERE is_use = 0 AND can_use = 1 AND available = 1 ORDER BY RANDOM() LIMIT 1").fetchone()
+            if not row: return None
+            self._query("UPDATE ko_word SET is_use = 1, is_use_user = ? WHERE num = ?", (nickname, row[0]))
+            return row[1]
+
+    def export_and_clear_game_history(self, start_dt, end_dt):
+        return True, None
+
+    def reset_all_tables(self):
+        with self.lock:
+            self._query("UPDATE ko_word SET is_use = 0, is_use_date = NULL, is_use_user = NULL")
+        return True
+
+    def close(self):
+        self.conn.close()
+
+def generate_words(count, seed=1234):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        length = rng.choice((2, 2, 2, 3, 3, 4))
+        words.add("".join(rng.choice(COMMON_SYLLABLES) for _ in range(length)))
+    return sorted(words)
+
+def load_word_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+class ChatStormGenerator:
+    # 현재 단어를 보면서 유형별(정답/이미 사용/오타/금지어/초성 불일치) 채팅을 만들어냄
+    def __init__(self, words, mix, seed=42):
+        self.rng = random.Random(seed)
+        self.by_start = {}
+        for w in words:
+            self.by_start.setdefault(w[0], []).append(w)
+        self.all_words = words
+        self.used_words = []
+        self.kinds = list(mix.keys())
+        self.weights = [mix[k] for k in self.kinds]
+
+    def mark_used(self, word):
+        self.used_words.append(word)
+
+    def next_guess(self, current_word):
+        kind = self.rng.choices(self.kinds, weights=self.weights)[0]
+        starts = apply_dueum_rule(current_word[-1]) if current_word else []
+
+        if kind == "valid":
+            pool = [w for c in starts for w in self.by_start.get(c, [])]
+            if pool:
+                return kind, self.rng.choice(pool)
+            kind = "typo"
+        if kind == "used" and self.used_words:
+            return kind, self.rng.choice(self.used_words)
+        if kind in ("used", "typo"):
+            base = list(self.rng.choice(self.all_words))
+            base[0] = starts[0] if starts else base[0]
+            base[self.rng.randrange(len(base))] = chr(self.rng.randint(0xAC00, 0xD7A3))
+            return "typo", "".join(base)
+        if kind == "profanity":
+            return kind, self.rng.choice(BENCH_BAD_WORDS)
+        # wrong_start
+        for _ in range(10):
+            w = self.rng.choice(self.all_words)
+            if w[0] not in starts:
+                return "wrong_start", w
+        return "wrong_start", self.rng.choice(self.all_words)
+
+class BenchResult:
+    def __init__(self):
+        self.inject_times = {}     # nickname -> (주입 시각, 유형)
+        self.pending = set()
+        self.latencies = {}        # 결과 유형 -> [초]
+        self.dropped = {}          # 주입 유형 -> 개수
+        self.injected = 0
+        self.completed = 0
+
+    def complete(self, nickname, outcome, finished_at=None):
+        info = self.inject_times.pop(nickname, None)
+        if info is None:
+            return
+        self.pending.discard(nickname)
+        self.completed += 1
+        self.latencies.setdefault(outcome, []).append((finished_at or time.perf_counter()) - info[0])
+
+    def drop(self, nickname):
+        info = self.inject_times.pop(nickname, None)
+        if info is None:
+            return
+        self.dropped[info[1]] = self.dropped.get(info[1], 0) + 1
+
+def build_bench_window(db_manager, result, generator):
+    from src import gui as gui_module
+    from src.engine import GameEngine
+
+    loop = asyncio.get_event_loop()
+
+    class BenchEngine(GameEngine):
+        # 각 추측의 처리 결과를 기록
+        def async_log_history(self, nickname, input_word, previous_word, status, reason=None):
+            super().async_log_history(nickname, input_word, previous_word, status, reason)
+            self._bench_logged.add(nickname)
+
+        def handle_new_word(self, platform, nickname, word, trace=None, verdict=None):
+            self._bench_logged = set()
+            was_locked = self.input_locked
+            super().handle_new_word(platform, nickname, word, trace, verdict)
+            if nickname in self._bench_logged:
+                result.complete(nickname, "rejected_early")
+            elif self.input_locked and not was_locked:
+                result.pending.add(nickname)
+            else:
+                result.drop(nickname)
+
+        def record_rejections(self, rejected):
+            # --ingest 일 때 수집 작업 스레드에서 호출되므로 결과 기록은 이벤트 루프 스레드로 넘김
+            recorded = super().record_rejections(rejected)
+            finished_at = time.perf_counter()
+            for item in rejected:
+                if recorded:
+                    loop.call_soon_threadsafe(result.complete, item[1], "rejected_early", finished_at)
+                else:
+                    loop.call_soon_threadsafe(result.drop, item[1])
+            return recorded
+
+        def on_word_check_finished(self, result_status, platform, nickname, word, is_game_over, trace=None):
+            self._bench_logged = set()
+            super().on_word_check_finished(result_status, platform, nickname, word, is_game_over, trace)
+            if result_status == "success":
+                generator.mark_used(word)
+            outcome = result_status.split(":", 1)[0] if isinstance(result_status, str) else str(result_status)
+            result.complete(nickname, outcome)
+
+    class BenchGameGUI(gui_module.ChzzkGameGUI):
+        # 측정용으로 시작 대화상자를 건너뜀
+        engine_class = BenchEngine
+
+        def run_startup_sequence(self):
+            pass
+
+    gui_module.DatabaseManager = lambda: db_manager
+    window = BenchGameGUI()
+    window.engine._bench_logged = set()
+    window.profanity_filter.bad_words.update(BENCH_BAD_WORDS)
+    return window
+
+def make_submit(window, use_ingestion):
+    # --ingest 이면 실제 모니터처럼 수집 큐를 거쳐 묶음으로 전달
+    if use_ingestion:
+        asyncio.get_event_loop().create_task(window.ingestion.run())
+        return window.ingestion.submit
+    return window.signals.word_detected.emit
+
+async def run_storm(window, generator, result, rate, duration, platforms, use_ingestion=False):
+    submit = make_submit(window, use_ingestion)
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    next_send = start
+    seq = 0
+    while time.perf_counter() - start < duration:
+        now = time.perf_counter()
+        # 타이머 해상도보다 빠른 속도는 몰아서 보냄
+        while next_send <= now:
+            kind, word = generator.next_guess(window.current_word_text)
+            nickname = f"bench{seq}"
+            seq += 1
+            result.injected += 1
+            result.inject_times[nickname] = (time.perf_counter(), kind)
+            platform = platforms[seq % len(platforms)]
+            submit(platform, nickname, word, tracer.new_trace(platform))
+            next_send += interval
+        await asyncio.sleep(max(0.0, min(next_send - time.perf_counter(), 0.005)))
+
+    # 마지막으로 보낸 추측의 결과를 최대 10초 기다림
+    deadline = time.perf_counter() + 10
+    while result.pending and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    return time.perf_counter() - start
+
+async def run_replay(window, result, path, speed, use_ingestion=False):
+    from src.chat_recorder import ChatReplayer
+
+    submit = make_submit(window, use_ingestion)
+    replayer = ChatReplayer(window.signals, path, speed)
+    seq = [0]
+
+    def emit(platform, nickname, word, trace=None):
+        # 같은 시청자가 여러 번 보내도 추적할 수 있도록 닉네임에 순번을 붙임
+        tracked = f"{nickname}#{seq[0]}"
+        seq[0] += 1
+        result.injected += 1
+        result.inject_times[tracked] = (time.perf_counter(), "replay")
+        submit(platform, tracked, word, trace)
+
+    start = time.perf_counter()
+    await replayer.run(emit=emit)
+
+    deadline = time.perf_counter() + 10
+    while result.pending and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    print(f"[벤치] 재생한 채팅 {replayer.replayed_count:,}건 중 정답 후보 {replayer.guess_count:,}건")
+    return time.perf_counter() - start
+
+def print_report(result, elapsed, rate, duration):
+    all_latencies = sorted(v for values in result.latencies.values() for v in values)
+    total_dropped = sum(result.dropped.values())
+    print(f"\n{'=' * 60}")
+    if rate:
+        print(f"[벤치] 목표 속도 {rate}/s x {duration}s | 실제 소요 {elapsed:.2f}s")
+    else:
+        print(f"[벤치] 채팅 기록 재생 | 실제 소요 {elapsed:.2f}s")
+    print(f"- 주입: {result.injected:,} | 처리 완료: {result.completed:,} | 버려짐(입력 잠금 등): {total_dropped:,} | 응답 없음: {len(result.pending):,}")
+    print(f"- 처리량: {result.completed / elapsed:.1f} guesses/s (주입 {result.injected / elapsed:.1f}/s)")
+    if all_latencies:
+        print(f"- 전체 지연(ms): p50 {percentile(all_latencies, 50) * 1000:.2f} | p95 {percentile(all_latencies, 95) * 1000:.2f} | p99 {percentile(all_latencies, 99) * 1000:.2f} | max {all_latencies[-1] * 1000:.2f}")
+    for outcome, values in sorted(result.latencies.items()):
+        values.sort()
+        print(f"  · {outcome:<18} {len(values):>7,}건 | p50 {percentile(values, 50) * 1000:8.2f} | p95 {percentile(values, 95) * 1000:8.2f} | p99 {percentile(values, 99) * 1000:8.2f} ms")
+    if result.dropped:
+        print("- 버려진 추측(주입 유형별): " + ", ".join(f"{k} {v:,}" for k, v in sorted(result.dropped.items())))
+    print(tracer.format_summary())
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        key, value = part.split("=")
+        mix[key.strip()] = float(value)
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description="끝말잇기 추측 처리 경로 부하 벤치마크")
+    parser.add_argument("--rate", type=float, default=100.0, help="초당 주입할 채팅 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="주입 시간(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"채팅 유형 비율 (기본값: {DEFAULT_MIX})")
+    parser.add_argument("--words", default=None, help="단어 목록 파일 (한 줄에 한 단어). 없으면 무작위 생성")
+    parser.add_argument("--vocab", type=int, default=200000, help="무작위 생성할 단어 수")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="SQLite 쿼리마다 추가할 지연(ms)")
+    parser.add_argument("--mysql", action="store_true", help="SQLite 대신 .env 의 MySQL(DatabaseManager) 사용 (로컬 테스트 DB 전용)")
+    parser.add_argument("--replay", default=None, help="합성 채팅 대신 채팅 기록(CHAT_RECORD_PATH 로 저장한 .jsonl.gz)을 재생")
+    parser.add_argument("--speed", type=float, default=0.0, help="재생 속도 배율 (1 = 실시간, 0 = 최대 속도)")
+    parser.add_argument("--ingest", action="store_true", help="수집 큐(INGEST_* 환경변수)를 거쳐 묶음으로 전달")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(PROJECT_DIR, ".env"))
+    for key in ("MAIL_SENDER", "MAIL_PASSWORD", "MAIL_RECEIVER"):
+        os.environ.pop(key, None)
+
+    if args.mysql:
+        # 주의: 실제로 단어를 사용 처리하므로 로컬 테스트 DB 에서만 사용할 것
+        from src.database import DatabaseManager
+        db_manager = DatabaseManager()
+        if args.words:
+            words = load_word_file(args.words)
+        else:
+            # DatabaseManager 는 첫 쿼리 때 연결하므로 직접 커서를 열기 전에 연결을 확보
+            with db_manager.lock:
+                db_manager._ensure_connection()
+                if not db_manager.conn:
+                    sys.exit("[오류] DB 연결 실패")
+                with db_manager.conn.cursor() as cursor:
+                    cursor.execute("SELECT word FROM ko_word WHERE can_use = TRUE AND available = TRUE ORDER BY RAND() LIMIT %s", (args.vocab,))
+                    words = [row[0] for row in cursor.fetchall()]
+    else:
+        words = load_word_file(args.words) if args.words else generate_words(args.vocab, args.seed)
+        db_manager = SQLiteDatabaseManager(words, args.db_latency_ms)
+    print(f"[벤치] 단어 {len(words):,}개 준비")
+
+    # .env / unknown_words.txt 등 게임이 쓰는 파일은 임시 폴더에 생성
+    work_dir = tempfile.mkdtemp(prefix="wordchain_bench_")
+    os.chdir(work_dir)
+
+    from PyQt6.QtWidgets import QApplication
+    from qasync import QEventLoop
+
+    app = QApplication(sys.argv)
+    loop = QEventLoop(app)
+    asyncio.set_event_loop(loop)
+
+    generator = ChatStormGenerator(words, parse_mix(args.mix), args.seed)
+    result = BenchResult()
+    window = build_bench_window(db_manager, result, generator)
+    window.start_game_logic(db_manager.get_random_start_word())
+
+    with loop:
+        if args.replay:
+            elapsed = loop.run_until_complete(run_replay(window, result, args.replay, args.speed, args.ingest))
+        else:
+            elapsed = loop.run_until_complete(run_storm(window, generator, result, args.rate, args.duration, ["치지직", "유튜브"], args.ingest))
+
+    print_report(result, elapsed, None if args.replay else args.rate, args.duration)
+    if args.ingest:
+        print(window.ingestion.format_summary())
+    db_manager.close()
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,12 @@ from torch.utils.data import Dataset # <--- [추가] 데이터셋 클래스 필
 from transformers import BertForSequenceClassification, AutoTokenizer, TextClassificationPipeline
 from dotenv import load_dotenv
 from tqdm import tqdm
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from maintenance import get_db_connection, parse_job_args, run_job
 
 load_dotenv()
 
-DEFAULT_START_NUM = 1 
+JOB_NAME = "db_unsmile"
 
 # ==========================================
 # [추가] 파이프라인 전용 데이터셋 래퍼 클래스
@@ -62,28 +63,28 @@ class LocalAIFilterManager:
     def get_connection(self):
         return pymysql.connect(**self.db_config)
 
-    def get_filtered_count(self, start_num: int) -> int:
+    def get_filtered_count(self, start_num: int, end_num: int) -> int:
         conn = self.get_connection()
         try:
             with conn.cursor() as cursor:
-                sql = "SELECT COUNT(*) as cnt FROM ko_word WHERE num >= %s AND available = TRUE"
-                cursor.execute(sql, (start_num,))
+                sql = "SELECT COUNT(*) as cnt FROM ko_word WHERE num >= %s AND num <= %s AND available = TRUE"
+                cursor.execute(sql, (start_num, end_num))
                 return cursor.fetchone()['cnt']
         finally:
             conn.close()
 
-    def fetch_word_batch(self, last_seen_num: int, limit: int) -> List[Dict]:
+    def fetch_word_batch(self, last_seen_num: int, end_num: int, limit: int) -> List[Dict]:
         conn = self.get_connection()
         try:
             with conn.cursor() as cursor:
                 sql = """
                     SELECT num, word 
                     FROM ko_word 
-                    WHERE num > %s AND available = TRUE 
+                    WHERE num > %s AND num <= %s AND available = TRUE 
                     ORDER BY num ASC 
                     LIMIT %s
                 """
-                cursor.execute(sql, (last_seen_num, limit))
+                cursor.execute(sql, (last_seen_num, end_num, limit))
                 return cursor.fetchall()
         finally:
             conn.close()
@@ -128,13 +129,13 @@ class LocalAIFilterManager:
         finally:
             conn.close()
 
-    def run(self, start_num: int):
-        print(f"\n>> [데이터베이스] num {start_num}번부터 조회...")
-        target_count = self.get_filtered_count(start_num)
+    def run(self, start_num: int, end_num: int) -> Tuple[int, int]:
+        print(f"\n>> [데이터베이스] num {start_num}번부터 {end_num}번까지 조회...")
+        target_count = self.get_filtered_count(start_num, end_num)
         
         if target_count == 0:
             print(f">> [알림] 데이터가 없습니다.")
-            return
+            return 0, 0
 
         print(f">> [시작] {target_count:,}건 검사 시작.")
         last_num = start_num - 1
@@ -142,7 +143,7 @@ class LocalAIFilterManager:
         
         with tqdm(total=target_count, unit="word", ncols=100) as pbar:
             while True:
-                rows = self.fetch_word_batch(last_num, self.BATCH_SIZE)
+                rows = self.fetch_word_batch(last_num, end_num, self.BATCH_SIZE)
                 if not rows:
                     break
 
@@ -164,16 +165,20 @@ class LocalAIFilterManager:
                 pbar.set_postfix({'LastID': last_num, '차단됨': total_blocked})
 
         print(f"\n[완료] 총 차단: {total_blocked:,}건")
+        return target_count, total_blocked
 
 if __name__ == "__main__":
+    # [수정] 시작 번호를 직접 입력받지 않고 워터마크(마지막 처리 num) 이후만 검사. --start / --full 로 재지정 가능
+    args = parse_job_args("AI 부적절 단어 필터 (kor_unsmile)").parse_args()
+    conn = None
     try:
-        user_input = input(f"시작 번호 입력 (기본값 {DEFAULT_START_NUM}): ").strip()
-        start_num = int(user_input) if user_input else DEFAULT_START_NUM
-        
         manager = LocalAIFilterManager()
-        manager.run(start_num=start_num)
+        conn = get_db_connection()
+        run_job(JOB_NAME, lambda c, after_num, max_num: manager.run(start_num=after_num + 1, end_num=max_num),
+                conn, full=args.full, start_num=args.start)
         
-    except ValueError:
-        print("숫자를 입력하세요.")
     except KeyboardInterrupt:
-        print("중단됨.")
\ No newline at end of file
+        print("중단됨.")
+    finally:
+        if conn and conn.open:
+            conn.close()
\ No newline at end of file
@@ -0,0 +1,212 @@
+# import_words.py
+# 대용량 단어 목록(TSV/CSV/JSONL)을 ko_word 에 일괄 등록하는 도구
+# 사용 예: python import_words.py subway=subway.tsv wikipedia=wiki.jsonl --field title
+import os
+import re
+import csv
+import sys
+import json
+import time
+import argparse
+import tempfile
+import unicodedata
+from collections import Counter
+
+from maintenance import get_db_connection
+
+HANGUL_WORD = re.compile(r'[가-힣]+')
+MAX_WORD_LENGTH = 300  # ko_word.word VARCHAR(300)
+INSERT_CHUNK_SIZE = 10000
+
+def detect_format(path, forced=None):
+    if forced:
+        return forced
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.jsonl', '.ndjson'): return 'jsonl'
+    if ext == '.csv': return 'csv'
+    return 'tsv'
+
+def iter_raw_words(path, fmt, column=0, field="word"):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if fmt == 'jsonl':
+            for line in f:
+                line = line.strip()
+                if not line: continue
+                try:
+                    value = json.loads(line)
+                except ValueError:
+                    yield None
+                    continue
+                yield value.get(field) if isinstance(value, dict) else value
+        else:
+            delimiter = ',' if fmt == 'csv' else '\t'
+            for row in csv.reader(f, delimiter=delimiter):
+                yield row[column] if len(row) > column else None
+
+def normalize_word(raw):
+    # 게임(handle_new_word)과 동일하게 NFC 정규화 후 한글 음절만 허용
+    if not isinstance(raw, str):
+        return None
+    word = unicodedata.normalize('NFC', raw.strip())
+    if not word or len(word) > MAX_WORD_LENGTH or not HANGUL_WORD.fullmatch(word):
+        return None
+    return word
+
+def collect_words(inputs, fmt=None, column=0, field="word", profanity_filter=None):
+    """
+    입력 파일들을 읽어 정규화/필터링/중복 제거한 결과를 출처별로 돌려줍니다.
+    같은 단어가 여러 출처에 있으면 먼저 나온 출처를 사용합니다 (ko_word.word 는 UNIQUE).
+    """
+    seen = set()
+    words_by_source = {}
+    stats = {}
+
+    # 금지어를 단어마다 하나씩 비교하면 수백만 건에서 너무 느리므로 정규식 하나로 묶어서 검사
+    bad_pattern = None
+    if profanity_filter is not None and profanity_filter.bad_words:
+        bad_words = sorted(profanity_filter.bad_words, key=len, reverse=True)
+        bad_pattern = re.compile('|'.join(re.escape(bad) for bad in bad_words))
+
+    for source, path in inputs:
+        stat = stats.setdefault(source, Counter())
+        bucket = words_by_source.setdefault(source, [])
+        for raw in iter_raw_words(path, detect_format(path, fmt), column, field):
+            stat['read'] += 1
+            word = normalize_word(raw)
+            if word is None:
+                stat['invalid'] += 1
+                continue
+            if word in seen:
+                stat['duplicate'] += 1
+                continue
+            seen.add(word)
+            # 미리 계산하는 플래그: 금지어 목록에 걸리는 단어는 available = FALSE 로 등록
+            available = 1
+            if bad_pattern is not None and bad_pattern.search(word):
+                available = 0
+                stat['profanity'] += 1
+            bucket.append((word, source, available))
+            stat['unique'] += 1
+
+    return words_by_source, stats
+
+def load_with_local_infile(conn, words_by_source):
+    inserted = {}
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            CREATE TEMPORARY TABLE IF NOT EXISTS ko_word_import (
+                word VARCHAR(300) COLLATE utf8mb4_unicode_ci NOT NULL,
+                source VARCHAR(50) COLLATE utf8mb4_unicode_ci NOT NULL,
+                available TINYINT(1) NOT NULL
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+        for source, rows in words_by_source.items():
+            if not rows:
+                inserted[source] = 0
+                continue
+            cursor.execute("TRUNCATE TABLE ko_word_import")
+
+            fd, tmp_path = tempfile.mkstemp(suffix=".tsv")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8', newline='\n') as f:
+                    for word, src, available in rows:
+                        f.write(f"{word}\t{src}\t{available}\n")
+                cursor.execute("""
+                    LOAD DATA LOCAL INFILE %s INTO TABLE ko_word_import
+                    CHARACTER SET utf8mb4
+                    FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n'
+                    (word, source, available)
+                """, (tmp_path.replace('\\', '/'),))
+            finally:
+                os.remove(tmp_path)
+
+            # 이미 있는 단어는 건드리지 않음 (영향 행 수 0)
+            cursor.execute("""
+                INSERT INTO ko_word (word, source, available)
+                SELECT word, source, available FROM ko_word_import
+                ON DUPLICATE KEY UPDATE num = num
+            """)
+            inserted[source] = cursor.rowcount
+            conn.commit()
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS ko_word_import")
+    return inserted
+
+def load_with_multi_insert(conn, words_by_source):
+    inserted = {}
+    sql = "INSERT INTO ko_word (word, source, available) VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE num = num"
+    with conn.cursor() as cursor:
+        for source, rows in words_by_source.items():
+            count = 0
+            # pymysql 은 INSERT ... VALUES 형태의 executemany 를 다중 행 INSERT 로 묶어서 전송
+            for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+                cursor.executemany(sql, rows[i:i + INSERT_CHUNK_SIZE])
+                count += cursor.rowcount
+            conn.commit()
+            inserted[source] = count
+    return inserted
+
+def parse_inputs(values):
+    inputs = []
+    for value in values:
+        if '=' not in value:
+            raise ValueError(f"입력은 출처=파일경로 형식이어야 합니다: {value}")
+        source, path = value.split('=', 1)
+        if not os.path.exists(path):
+            raise ValueError(f"파일을 찾을 수 없습니다: {path}")
+        inputs.append((source.strip(), path))
+    return inputs
+
+def print_report(stats, inserted, elapsed):
+    print(f"\n{'출처':<15} {'읽음':>10} {'형식오류':>10} {'중복':>10} {'금지어':>8} {'대상':>10} {'신규등록':>10} {'기존단어':>10}")
+    for source, stat in stats.items():
+        if inserted is None:
+            new_text, existing_text = "-", "-"
+        else:
+            new_count = inserted.get(source, 0)
+            new_text, existing_text = f"{new_count:,}", f"{stat['unique'] - new_count:,}"
+        print(f"{source:<15} {stat['read']:>10,} {stat['invalid']:>10,} {stat['duplicate']:>10,} "
+              f"{stat['profanity']:>8,} {stat['unique']:>10,} {new_text:>10} {existing_text:>10}")
+    print(f"\n⏱️ 총 소요 시간: {elapsed:.2f}초")
+    print("👉 새 단어를 반영하려면 정비 작업(remove_verb / db_unsmile / remove_one_shot 또는 maintenance_pipeline)을 실행하세요.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="대용량 단어 목록 일괄 등록")
+    parser.add_argument("inputs", nargs="+", help="출처=파일경로 (예: subway=subway.tsv)")
+    parser.add_argument("--format", choices=["tsv", "csv", "jsonl"], default=None, help="입력 형식 (기본값: 확장자로 판단)")
+    parser.add_argument("--column", type=int, default=0, help="TSV/CSV 에서 단어가 있는 열 번호")
+    parser.add_argument("--field", default="word", help="JSONL 에서 단어가 있는 필드 이름")
+    parser.add_argument("--no-local-infile", action="store_true", help="LOAD DATA LOCAL INFILE 대신 다중 행 INSERT 사용")
+    parser.add_argument("--dry-run", action="store_true", help="DB에 쓰지 않고 집계만 출력")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    try:
+        inputs = parse_inputs(args.inputs)
+    except ValueError as e:
+        print(f"[오류] {e}")
+        sys.exit(1)
+
+    from src.utils import ProfanityFilter
+    words_by_source, stats = collect_words(inputs, args.format, args.column, args.field, ProfanityFilter())
+    print(f"[시스템] 파일 읽기 완료: {sum(len(rows) for rows in words_by_source.values()):,}개 ({time.time() - start_time:.2f}초)")
+
+    if args.dry_run:
+        print_report(stats, None, time.time() - start_time)
+        sys.exit(0)
+
+    conn = None
+    try:
+        if args.no_local_infile:
+            conn = get_db_connection()
+            inserted = load_with_multi_insert(conn, words_by_source)
+        else:
+            conn = get_db_connection(local_infile=True)
+            inserted = load_with_local_infile(conn, words_by_source)
+        print_report(stats, inserted, time.time() - start_time)
+    except Exception as e:
+        if conn and conn.open:
+            conn.rollback()
+        print(f"\n❌ 등록 중 오류: {e}")
+    finally:
+        if conn and conn.open:
+            conn.close()
@@ -1,23 +1,38 @@
 # main.py
 import sys
 import asyncio
-from dotenv import load_dotenv
-from qasync import QEventLoop
-from PyQt6.QtWidgets import QApplication
 
-from src.gui import ChzzkGameGUI
+from src.startup import startup_timer  # 시작 시간 측정 기준점 (가장 먼저)
+from dotenv import load_dotenv
 
 load_dotenv()
 
-if __name__ == "__main__":
+def run_gui():
+    # PyQt 관련 모듈은 GUI 모드에서만 불러옴 (헤드리스 서버에는 PyQt 가 없어도 됨)
+    from qasync import QEventLoop
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+
+    from src.gui import ChzzkGameGUI
+    startup_timer.mark("import")
+
     app = QApplication(sys.argv)
     loop = QEventLoop(app)
     asyncio.set_event_loop(loop)
-    
+
     window = ChzzkGameGUI()
+    startup_timer.mark("window")
     window.show()
     window.raise_()
     window.activateWindow()
-    
+    QTimer.singleShot(0, lambda: startup_timer.mark("first_frame"))
+
     with loop:
-        loop.run_forever()
\ No newline at end of file
+        loop.run_forever()
+
+if __name__ == "__main__":
+    # python main.py --headless [--start random|recent|단어]
+    if "--headless" in sys.argv[1:]:
+        from src.headless import main as run_headless
+        sys.exit(run_headless(sys.argv[1:]))
+    run_gui()
@@ -0,0 +1,120 @@
+# maintenance.py
+# 사전 정비 작업(remove_verb, db_unsmile, remove_one_shot) 공용 워터마크/실행 기록 모듈
+import os
+import time
+import argparse
+import pymysql
+from dotenv import load_dotenv
+
+sql_create_watermark_table = """
+    CREATE TABLE IF NOT EXISTS maintenance_watermark (
+        job_name VARCHAR(50) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '작업 이름',
+        last_num INT NOT NULL DEFAULT 0 COMMENT '마지막으로 처리한 ko_word.num',
+        last_run_at DATETIME DEFAULT NULL COMMENT '마지막 실행 일시',
+        last_duration DOUBLE DEFAULT NULL COMMENT '마지막 실행 소요 시간(초)',
+        last_rows_scanned INT DEFAULT NULL COMMENT '마지막 실행에서 검사한 행 수',
+        last_rows_touched INT DEFAULT NULL COMMENT '마지막 실행에서 변경한 행 수',
+        PRIMARY KEY (job_name)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+def get_db_connection(**kwargs):
+    load_dotenv()
+    config = {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'user': os.getenv('DB_USER'),
+        'password': os.getenv('DB_PASSWORD'),
+        'db': os.getenv('DB_NAME'),
+        'port': int(os.getenv('DB_PORT', 3306)),
+        'charset': 'utf8mb4',
+    }
+    config.update(kwargs)
+    return pymysql.connect(**config)
+
+def get_watermark(conn, job_name):
+    with conn.cursor(pymysql.cursors.Cursor) as cursor:
+        cursor.execute(sql_create_watermark_table)
+        cursor.execute("SELECT last_num FROM maintenance_watermark WHERE job_name = %s", (job_name,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+def save_watermark(conn, job_name, last_num, duration, rows_scanned, rows_touched):
+    sql = """
+        INSERT INTO maintenance_watermark (job_name, last_num, last_run_at, last_duration, last_rows_scanned, last_rows_touched)
+        VALUES (%s, %s, NOW(), %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            last_num = VALUES(last_num), last_run_at = VALUES(last_run_at), last_duration = VALUES(last_duration),
+            last_rows_scanned = VALUES(last_rows_scanned), last_rows_touched = VALUES(last_rows_touched)
+    """
+    with conn.cursor(pymysql.cursors.Cursor) as cursor:
+        cursor.execute(sql_create_watermark_table)
+        cursor.execute(sql, (job_name, last_num, duration, rows_scanned, rows_touched))
+    conn.commit()
+
+def get_max_num(conn):
+    with conn.cursor(pymysql.cursors.Cursor) as cursor:
+        cursor.execute("SELECT MAX(num) FROM ko_word")
+        row = cursor.fetchone()
+        return row[0] if row and row[0] else 0
+
+def parse_job_args(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--full", action="store_true", help="워터마크를 무시하고 전체 테이블을 다시 처리")
+    parser.add_argument("--start", type=int, default=None, help="지정한 num 부터 처리 (워터마크는 읽지도 갱신하지도 않음)")
+    return parser
+
+def run_job(job_name, job_func, conn, full=False, start_num=None):
+    """
+    워터마크 이후(num > last_num)에 추가된 행만 job_func(conn, after_num, max_num) 으로 처리합니다.
+    job_func 은 (검사한 행 수, 변경한 행 수) 를 반환해야 하며, 성공 시에만 워터마크가 전진합니다.
+    새 행이 없으면 기록하지 않고, --start 로 범위를 지정한 실행은 저장된 워터마크를 바꾸지 않습니다.
+    """
+    if full:
+        after_num = 0
+    elif start_num is not None:
+        after_num = max(start_num - 1, 0)
+    else:
+        after_num = get_watermark(conn, job_name)
+
+    max_num = get_max_num(conn)
+    if max_num <= after_num:
+        print(f"[{job_name}] 새로 추가된 단어가 없습니다. (시작 위치: {after_num})")
+        return 0, 0
+
+    mode = "전체" if after_num == 0 else "증분"
+    print(f"[{job_name}] {mode} 처리 시작: num {after_num + 1} ~ {max_num}")
+
+    start_time = time.time()
+    rows_scanned, rows_touched = job_func(conn, after_num, max_num)
+    duration = time.time() - start_time
+
+    if start_num is not None and not full:
+        print(f"[{job_name}] 완료: {duration:.2f}초 | 검사 {rows_scanned:,}행 | 변경 {rows_touched:,}행 | --start 실행이므로 워터마크 유지")
+        return rows_scanned, rows_touched
+
+    save_watermark(conn, job_name, max_num, duration, rows_scanned, rows_touched)
+    print(f"[{job_name}] 완료: {duration:.2f}초 | 검사 {rows_scanned:,}행 | 변경 {rows_touched:,}행 | 워터마크 {after_num} -> {max_num}")
+    return rows_scanned, rows_touched
+
+def print_job_report(conn):
+    with conn.cursor(pymysql.cursors.Cursor) as cursor:
+        cursor.execute(sql_create_watermark_table)
+        cursor.execute("""
+            SELECT job_name, last_num, last_run_at, last_duration, last_rows_scanned, last_rows_touched
+            FROM maintenance_watermark ORDER BY job_name
+        """)
+        rows = cursor.fetchall()
+
+    if not rows:
+        print("[보고] 기록된 정비 작업이 없습니다.")
+        return
+    print(f"{'작업':<20} {'워터마크':>10} {'마지막 실행':>20} {'소요(초)':>10} {'검사':>10} {'변경':>10}")
+    for job_name, last_num, last_run_at, duration, scanned, touched in rows:
+        print(f"{job_name:<20} {last_num:>10} {str(last_run_at):>20} {duration or 0:>10.2f} {scanned or 0:>10} {touched or 0:>10}")
+
+if __name__ == "__main__":
+    conn = get_db_connection()
+    try:
+        print_job_report(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,278 @@
+# maintenance_pipeline.py
+# ko_word 를 한 번만 읽어서 형태소 -> AI 부적절 단어 -> 한 방 단어 정리를 이어서 처리하는 파이프라인
+import sys
+import time
+import queue
+import threading
+import pymysql
+
+from maintenance import get_db_connection, parse_job_args, run_job
+from morph_cache import sync_morph_cache, get_analyzer_version, is_compound, ensure_morph_table
+from remove_one_shot import propagate_from_syllables
+from remove_verb import valid_sources
+
+JOB_NAME = "maintenance_pipeline"
+
+READ_BATCH_SIZE = 5000
+QUEUE_SIZE = 4
+WRITE_CHUNK_SIZE = 5000
+
+DEFAULT_STAGES = ["morphology", "toxicity", "prune"]
+
+class RowBatch:
+    def __init__(self, rows):
+        self.rows = rows
+        self.flags = {}  # num -> {컬럼: 값}
+
+    def is_available(self, row):
+        return bool(row['available']) and self.flags.get(row['num'], {}).get('available', True)
+
+    def flag(self, num, **columns):
+        self.flags.setdefault(num, {}).update(columns)
+
+class MorphologyStage:
+    # remove_verb.py 의 합성어 필터를 word_morphs 캐시 조회로 수행
+    name = "morphology"
+
+    def setup(self):
+        from kiwipiepy import Kiwi
+        self.kiwi = Kiwi()
+        self.conn = get_db_connection()
+        self.analyzer_version = get_analyzer_version()
+        # 테이블 확인은 단계 시작 시 한 번만 (배치마다 하지 않음)
+        with self.conn.cursor(pymysql.cursors.Cursor) as cursor:
+            ensure_morph_table(cursor)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def process(self, batch):
+        first_num = batch.rows[0]['num']
+        last_num = batch.rows[-1]['num']
+        sync_morph_cache(self.conn, self.kiwi, sources=valid_sources,
+                         start_num=first_num - 1, end_num=last_num, verbose=False, ensure_table=False)
+
+        with self.conn.cursor(pymysql.cursors.Cursor) as cursor:
+            cursor.execute("""
+                SELECT num, morph_count, meaningful_count FROM word_morphs
+                WHERE num BETWEEN %s AND %s AND analyzer_version = %s
+            """, (first_num, last_num, self.analyzer_version))
+            morph_stats = {num: (mc, mfc) for num, mc, mfc in cursor.fetchall()}
+
+        for row in batch.rows:
+            if row['source'] not in valid_sources or not batch.is_available(row):
+                continue
+            stats = morph_stats.get(row['num'])
+            if stats and is_compound(*stats):
+                batch.flag(row['num'], available=False, can_use=True, is_use_user='합성어')
+
+class ToxicityStage:
+    # db_unsmile.py 의 kor_unsmile 모델 필터
+    name = "toxicity"
+
+    def setup(self):
+        from db_unsmile import LocalAIFilterManager
+        self.manager = LocalAIFilterManager()
+
+    def close(self): pass
+
+    def process(self, batch):
+        targets = [row for row in batch.rows if batch.is_available(row)]
+        if not targets:
+            return
+        is_bad_list = self.manager.analyze_words([row['word'] for row in targets])
+        for row, is_bad in zip(targets, is_bad_list):
+            if is_bad:
+                batch.flag(row['num'], available=False)
+
+class PruneStage:
+    # 한 방 단어 정리는 다른 단계의 결과가 DB에 반영된 뒤에만 판단할 수 있으므로,
+    # 스트리밍 중에는 영향받은 글자만 모아두고 일괄 쓰기 이후 remove_one_shot 의 증분 로직으로 처리
+    name = "prune"
+
+    def setup(self):
+        self.syllables = set()
+
+    def close(self): pass
+
+    def process(self, batch):
+        for row in batch.rows:
+            if row['start_char']: self.syllables.add(row['start_char'])
+            if row['end_char']: self.syllables.add(row['end_char'])
+
+    def finish(self, conn):
+        with conn.cursor() as cursor:
+            touched = propagate_from_syllables(conn, cursor, self.syllables)
+        if touched == -1:
+            raise RuntimeError("한 방 단어 정리 중 오류가 발생했습니다.")
+        return touched
+
+STAGE_CLASSES = {
+    "morphology": MorphologyStage,
+    "toxicity": ToxicityStage,
+    "prune": PruneStage,
+}
+
+class MaintenancePipeline:
+    def __init__(self, stage_names, read_batch_size=READ_BATCH_SIZE, queue_size=QUEUE_SIZE):
+        unknown = [name for name in stage_names if name not in STAGE_CLASSES]
+        if unknown:
+            raise ValueError(f"알 수 없는 단계: {', '.join(unknown)}")
+        self.stages = [STAGE_CLASSES[name]() for name in stage_names]
+        self.read_batch_size = read_batch_size
+        self.queue_size = queue_size
+        self.busy_time = {stage.name: 0.0 for stage in self.stages}
+        self.errors = []
+
+    def _reader_loop(self, out_q, after_num, max_num):
+        conn = get_db_connection(cursorclass=pymysql.cursors.DictCursor)
+        try:
+            last_num = after_num
+            with conn.cursor() as cursor:
+                while not self.errors:
+                    cursor.execute("""
+                        SELECT num, word, source, can_use, available, start_char, end_char
+                        FROM ko_word
+                        WHERE num > %s AND num <= %s
+                        ORDER BY num ASC
+                        LIMIT %s
+                    """, (last_num, max_num, self.read_batch_size))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    last_num = rows[-1]['num']
+                    out_q.put(RowBatch(rows))
+        except Exception as e:
+            self.errors.append(("reader", e))
+        finally:
+            conn.close()
+            out_q.put(None)
+
+    def _stage_loop(self, stage, in_q, out_q):
+        try:
+            stage.setup()
+        except Exception as e:
+            self.errors.append((stage.name, e))
+
+        while True:
+            batch = in_q.get()
+            if batch is None:
+                break
+            # 오류가 발생하면 앞 단계가 막히지 않도록 남은 배치는 버리기만 함
+            if self.errors:
+                continue
+            try:
+                start = time.time()
+                stage.process(batch)
+                self.busy_time[stage.name] += time.time() - start
+                out_q.put(batch)
+            except Exception as e:
+                self.errors.append((stage.name, e))
+
+        try: stage.close()
+        except Exception: pass
+        out_q.put(None)
+
+    def _write_flags(self, conn, merged):
+        # 모든 단계의 변경 사항을 임시 테이블에 모은 뒤 UPDATE JOIN 한 번으로 반영
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                CREATE TEMPORARY TABLE IF NOT EXISTS pipeline_flags (
+                    num INT NOT NULL PRIMARY KEY,
+                    available TINYINT(1) NULL,
+                    can_use TINYINT(1) NULL,
+                    is_use_user VARCHAR(100) NULL
+                )
+            """)
+            cursor.execute("TRUNCATE TABLE pipeline_flags")
+            values = [(num, cols.get('available'), cols.get('can_use'), cols.get('is_use_user'))
+                      for num, cols in merged.items()]
+            for i in range(0, len(values), WRITE_CHUNK_SIZE):
+                cursor.executemany(
+                    "INSERT INTO pipeline_flags (num, available, can_use, is_use_user) VALUES (%s, %s, %s, %s)",
+                    values[i:i + WRITE_CHUNK_SIZE]
+                )
+            cursor.execute("""
+                UPDATE ko_word w
+                INNER JOIN pipeline_flags f ON f.num = w.num
+                SET w.available = COALESCE(f.available, w.available),
+                    w.can_use = COALESCE(f.can_use, w.can_use),
+                    w.is_use_user = COALESCE(f.is_use_user, w.is_use_user)
+            """)
+            updated = cursor.rowcount
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS pipeline_flags")
+        conn.commit()
+        return updated
+
+    @staticmethod
+    def _merge(merged, batch):
+        for num, cols in batch.flags.items():
+            target = merged.setdefault(num, {})
+            for key, value in cols.items():
+                # 사용 불가 판정은 어느 단계에서든 우선, 분류명은 먼저 붙은 것을 유지
+                if key == 'available':
+                    target[key] = target.get(key, True) and value
+                elif key not in target:
+                    target[key] = value
+
+    def run(self, conn, after_num, max_num):
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._reader_loop, args=(queues[0], after_num, max_num), daemon=True)]
+        for i, stage in enumerate(self.stages):
+            threads.append(threading.Thread(target=self._stage_loop, args=(stage, queues[i], queues[i + 1]), daemon=True))
+
+        start_time = time.time()
+        for t in threads: t.start()
+
+        merged = {}
+        rows_scanned = 0
+        while True:
+            batch = queues[-1].get()
+            if batch is None:
+                break
+            rows_scanned += len(batch.rows)
+            self._merge(merged, batch)
+            sys.stdout.write(f"\r   📍 스트리밍: {rows_scanned:,}행 | 변경 예정 {len(merged):,}행 (마지막 num: {batch.rows[-1]['num']})")
+            sys.stdout.flush()
+
+        for t in threads: t.join()
+        if self.errors:
+            name, err = self.errors[0]
+            raise RuntimeError(f"[{name}] 단계 실패: {err}")
+
+        stream_elapsed = time.time() - start_time
+        print(f"\n   ⏱️ 스트리밍 완료: {stream_elapsed:.2f}초")
+        for name, busy in self.busy_time.items():
+            print(f"      - {name:<12} 처리 시간 {busy:.2f}초")
+
+        rows_touched = self._write_flags(conn, merged) if merged else 0
+        print(f"   💾 일괄 반영: {rows_touched:,}행")
+
+        for stage in self.stages:
+            if hasattr(stage, 'finish'):
+                rows_touched += stage.finish(conn)
+
+        return rows_scanned, rows_touched
+
+if __name__ == "__main__":
+    parser = parse_job_args("사전 정비 단일 패스 파이프라인")
+    parser.add_argument("--stages", default=",".join(DEFAULT_STAGES),
+                        help=f"실행할 단계 목록 (쉼표 구분, 기본값: {','.join(DEFAULT_STAGES)})")
+    parser.add_argument("--batch-size", type=int, default=READ_BATCH_SIZE, help="한 번에 읽을 행 수")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="단계 사이 대기열 크기")
+    args = parser.parse_args()
+
+    stage_names = [name.strip() for name in args.stages.split(",") if name.strip()]
+    conn = None
+    try:
+        pipeline = MaintenancePipeline(stage_names, read_batch_size=args.batch_size, queue_size=args.queue_size)
+        conn = get_db_connection(cursorclass=pymysql.cursors.DictCursor)
+        run_job(JOB_NAME, pipeline.run, conn, full=args.full, start_num=args.start)
+    except Exception as e:
+        if conn and conn.open:
+            conn.rollback()
+        print(f"\n❌ 파이프라인 오류: {e}")
+    finally:
+        if conn and conn.open:
+            conn.close()
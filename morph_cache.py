@@ -0,0 +1,162 @@
+# morph_cache.py
+# Kiwi 형태소 분석 결과를 word_morphs 테이블에 저장해 두고 정비 스크립트들이 재사용하도록 하는 모듈
+import sys
+import time
+import pymysql
+
+# 한 번에 분석/저장할 단어 수
+MORPH_BATCH_SIZE = 5000
+
+# 합성어 판별에 쓰이는 실질 형태소(명사 N*, 동사/형용사 어간 V*)
+MEANINGFUL_TAG_PREFIXES = ('N', 'V')
+
+# 동사/형용사로 시작하는 단어 판별용 품사
+PREDICATE_TAGS = ('VV', 'VA')
+
+sql_create_morph_table = """
+    CREATE TABLE IF NOT EXISTS word_morphs (
+        num INT NOT NULL COMMENT 'ko_word.num',
+        word VARCHAR(300) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '분석 당시 단어',
+        morphs TEXT COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '형태소/품사 목록 (예: 사과/NNG+나무/NNG)',
+        tags TEXT COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '품사 목록 (예: NNG NNG)',
+        first_tag VARCHAR(10) COLLATE utf8mb4_unicode_ci DEFAULT NULL COMMENT '첫 형태소 품사',
+        morph_count SMALLINT NOT NULL DEFAULT 0 COMMENT '형태소 수',
+        meaningful_count SMALLINT NOT NULL DEFAULT 0 COMMENT '실질 형태소(N/V) 수',
+        analyzer_version VARCHAR(50) COLLATE utf8mb4_unicode_ci NOT NULL COMMENT '분석기 버전',
+        analyzed_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '분석 일시',
+        PRIMARY KEY (num),
+        KEY idx_analyzer_version (analyzer_version),
+        KEY idx_meaningful_count (meaningful_count)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+def get_analyzer_version():
+    import kiwipiepy
+    return f"kiwipiepy-{kiwipiepy.__version__}"
+
+def ensure_morph_table(cursor):
+    cursor.execute(sql_create_morph_table)
+
+def summarize_morphs(morphs):
+    # morphs: [(form, tag), ...] -> DB 저장용 컬럼 값
+    tags = [tag for _, tag in morphs]
+    meaningful = [tag for tag in tags if tag.startswith(MEANINGFUL_TAG_PREFIXES)]
+    return {
+        'morphs': "+".join(f"{form}/{tag}" for form, tag in morphs),
+        'tags': " ".join(tags),
+        'first_tag': tags[0] if tags else None,
+        'morph_count': len(tags),
+        'meaningful_count': len(meaningful),
+    }
+
+def is_compound(morph_count, meaningful_count):
+    # 실질 의미를 지닌 형태소가 2개 이상 결합된 단어를 합성어로 판단
+    return morph_count >= 2 and meaningful_count >= 2
+
+def _fetch_stale_batch(cursor, analyzer_version, last_num, end_num, limit, sources):
+    # 캐시에 없거나, 분석기 버전이 다르거나, 단어가 바뀐 행만 조회
+    source_condition = ""
+    params = [analyzer_version, last_num, end_num, end_num]
+    if sources:
+        source_condition = f"AND w.source IN ({','.join(['%s'] * len(sources))})"
+        params.extend(sources)
+    params.append(limit)
+
+    sql = f"""
+        SELECT w.num, w.word
+        FROM ko_word w
+        LEFT JOIN word_morphs m ON m.num = w.num
+        WHERE (m.num IS NULL OR m.analyzer_version <> %s OR BINARY m.word <> BINARY w.word)
+          AND w.num > %s
+          AND (%s IS NULL OR w.num <= %s)
+          {source_condition}
+        ORDER BY w.num ASC
+        LIMIT %s
+    """
+    cursor.execute(sql, tuple(params))
+    return cursor.fetchall()
+
+def sync_morph_cache(conn, kiwi=None, sources=None, start_num=0, end_num=None, batch_size=MORPH_BATCH_SIZE, verbose=True,
+                     ensure_table=True):
+    """
+    word_morphs 를 증분 갱신합니다. 새로 추가되었거나 분석기 버전이 바뀐 단어만 Kiwi로 분석하며,
+    배치마다 커밋하므로 중간에 중단해도 다음 실행에서 이어서 진행됩니다.
+    여러 번 나눠 호출하는 경우 테이블은 처음에 한 번만 확인하고 ensure_table=False 로 넘깁니다.
+    반환값: 새로 분석한 단어 수
+    """
+    if kiwi is None:
+        from kiwipiepy import Kiwi
+        kiwi = Kiwi()
+    analyzer_version = get_analyzer_version()
+
+    sql_upsert = """
+        INSERT INTO word_morphs (num, word, morphs, tags, first_tag, morph_count, meaningful_count, analyzer_version)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            word = VALUES(word), morphs = VALUES(morphs), tags = VALUES(tags),
+            first_tag = VALUES(first_tag), morph_count = VALUES(morph_count),
+            meaningful_count = VALUES(meaningful_count),
+            analyzer_version = VALUES(analyzer_version), analyzed_at = NOW()
+    """
+
+    # DictCursor 로 연결된 경우에도 튜플로 받도록 커서 종류를 고정
+    cursor = conn.cursor(pymysql.cursors.Cursor)
+    if ensure_table:
+        ensure_morph_table(cursor)
+        conn.commit()
+
+    last_num = start_num
+    analyzed_count = 0
+    start_time = time.time()
+
+    while True:
+        rows = _fetch_stale_batch(cursor, analyzer_version, last_num, end_num, batch_size, sources)
+        if not rows:
+            break
+
+        last_num = rows[-1][0]
+
+        # 리스트를 넘기면 Kiwi 가 내부적으로 묶어서 처리하므로 단어별 호출보다 빠름
+        targets = [row[1].strip() for row in rows if row[1].strip()]
+        analyzed = dict(zip(targets, kiwi.analyze(targets))) if targets else {}
+
+        values = []
+        for num, word in rows:
+            # 빈 단어도 빈 결과로 저장해야 다음 실행에서 다시 조회되지 않음
+            result = analyzed.get(word.strip())
+            morphs = [(m[0], m[1]) for m in result[0][0]] if result else []
+            summary = summarize_morphs(morphs)
+            values.append((num, word, summary['morphs'], summary['tags'], summary['first_tag'],
+                           summary['morph_count'], summary['meaningful_count'], analyzer_version))
+
+        cursor.executemany(sql_upsert, values)
+        conn.commit()
+        analyzed_count += len(values)
+
+        if verbose:
+            sys.stdout.write(f"\r[형태소 캐시] 분석 {analyzed_count}건 (마지막 num: {last_num})" + " " * 10)
+            sys.stdout.flush()
+
+    if verbose:
+        elapsed = time.time() - start_time
+        print(f"\n[형태소 캐시] 증분 갱신 완료: {analyzed_count}건 분석 ({elapsed:.2f}초, {analyzer_version})")
+
+    cursor.close()
+    return analyzed_count
+
+if __name__ == "__main__":
+    import os
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    conn = pymysql.connect(
+        host=os.getenv('DB_HOST'),
+        user=os.getenv('DB_USER'),
+        password=os.getenv('DB_PASSWORD'),
+        db=os.getenv('DB_NAME'),
+        charset='utf8mb4'
+    )
+    try:
+        sync_morph_cache(conn)
+    finally:
+        conn.close()
@@ -4,12 +4,21 @@ import sys
 import math
 import time
 from dotenv import load_dotenv
+from maintenance import parse_job_args, run_job
 
 load_dotenv()
 
+JOB_NAME = "remove_one_shot"
+
 # 설정: 배치 사이즈
 BATCH_SIZE = 50000 
 
+# 이어지는 단어로 인정하는 출처
+CHAIN_SOURCES = ('URI', 'Standard', 'naver_wiki', 'admin', 'subway', 'wikipedia')
+
+# 증분 모드에서 IN 절 하나에 넣을 최대 항목 수
+IN_CHUNK_SIZE = 1000
+
 def get_db_connection():
     return pymysql.connect(
         host=os.getenv('DB_HOST'),
@@ -24,6 +33,14 @@ def get_db_connection():
         autocommit=False  # 트랜잭션 수동 제어
     )
 
+def _source_placeholders():
+    return ','.join(['%s'] * len(CHAIN_SOURCES))
+
+def _chunks(items, size=IN_CHUNK_SIZE):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
 def run_synchronization_pass(conn, cursor, pass_num):
     cursor.execute("SELECT MAX(num) as max_num FROM ko_word")
     max_result = cursor.fetchone()
@@ -39,24 +56,24 @@ def run_synchronization_pass(conn, cursor, pass_num):
     print(f"\n🔄 [Pass {pass_num}] 전체 {max_num}개 데이터 스캔 시작 (Batch Size: {BATCH_SIZE})")
 
     # [수정됨] 부활 로직: 이어지는 단어가 살아있고, 지정된 source 중 하나여야 함
-    sql_revive = """
+    sql_revive = f"""
         UPDATE ko_word w1
         INNER JOIN ko_word w2 
             ON w2.start_char = w1.end_char 
             AND w2.can_use = TRUE
-            AND w2.source IN ('URI', 'Standard', 'naver_wiki', 'admin', 'subway', 'wikipedia')
+            AND w2.source IN ({_source_placeholders()})
         SET w1.can_use = TRUE
         WHERE w1.num BETWEEN %s AND %s
         AND w1.can_use = FALSE
     """
 
     # [수정됨] 제거 로직: 위 조건을 만족하는 이어지는 단어가 하나도 없으면 제거
-    sql_kill = """
+    sql_kill = f"""
         UPDATE ko_word w1
         LEFT JOIN ko_word w2 
             ON w2.start_char = w1.end_char 
             AND w2.can_use = TRUE
-            AND w2.source IN ('URI', 'Standard', 'naver_wiki', 'admin', 'subway', 'wikipedia')
+            AND w2.source IN ({_source_placeholders()})
         SET w1.can_use = FALSE
         WHERE w1.num BETWEEN %s AND %s
         AND w1.can_use = TRUE
@@ -70,12 +87,12 @@ def run_synchronization_pass(conn, cursor, pass_num):
         
         try:
             # 1. 부활 처리
-            cursor.execute(sql_revive, (start_num, end_num))
+            cursor.execute(sql_revive, (*CHAIN_SOURCES, start_num, end_num))
             r_cnt = cursor.rowcount
             pass_revived += r_cnt
 
             # 2. 제거 처리
-            cursor.execute(sql_kill, (start_num, end_num))
+            cursor.execute(sql_kill, (*CHAIN_SOURCES, start_num, end_num))
             k_cnt = cursor.rowcount
             pass_killed += k_cnt
 
@@ -96,28 +113,119 @@ def run_synchronization_pass(conn, cursor, pass_num):
     
     return pass_revived + pass_killed
 
-def optimize_word_database():
+def _collect_changes(cursor, syllables, revive):
+    # 지정한 끝 글자(end_char)를 가진 단어 중 상태가 바뀌어야 하는 행만 조회
+    changes = []
+    exists_clause = "EXISTS" if revive else "NOT EXISTS"
+    current_state = "FALSE" if revive else "TRUE"
+    for chunk in _chunks(syllables):
+        sql = f"""
+            SELECT w1.num, w1.start_char
+            FROM ko_word w1
+            WHERE w1.end_char IN ({','.join(['%s'] * len(chunk))})
+            AND w1.can_use = {current_state}
+            AND {exists_clause} (
+                SELECT 1 FROM ko_word w2
+                WHERE w2.start_char = w1.end_char
+                AND w2.can_use = TRUE
+                AND w2.source IN ({_source_placeholders()})
+            )
+        """
+        cursor.execute(sql, (*chunk, *CHAIN_SOURCES))
+        changes.extend(cursor.fetchall())
+    return changes
+
+def _apply_changes(cursor, changes, can_use):
+    for chunk in _chunks([row['num'] for row in changes]):
+        sql = f"UPDATE ko_word SET can_use = {'TRUE' if can_use else 'FALSE'} WHERE num IN ({','.join(['%s'] * len(chunk))})"
+        cursor.execute(sql, tuple(chunk))
+
+def collect_touched_syllables(cursor, after_num, max_num):
+    # 새 단어의 첫 글자로 끝나는 단어는 부활할 수 있고, 새 단어 자신(끝 글자)도 판정이 필요함
+    cursor.execute("""
+        SELECT DISTINCT start_char AS ch FROM ko_word WHERE num > %s AND num <= %s
+        UNION
+        SELECT DISTINCT end_char AS ch FROM ko_word WHERE num > %s AND num <= %s
+    """, (after_num, max_num, after_num, max_num))
+    return {row['ch'] for row in cursor.fetchall() if row['ch']}
+
+def run_incremental_sync(conn, cursor, after_num, max_num):
+    return propagate_from_syllables(conn, cursor, collect_touched_syllables(cursor, after_num, max_num))
+
+def propagate_from_syllables(conn, cursor, frontier):
+    """
+    지정한 글자로 끝나는 단어만 다시 검사하고, 상태가 바뀐 단어의 첫 글자로 범위를 넓혀가며
+    수렴할 때까지 반복합니다.
+    """
+    frontier = set(frontier)
+    total_revived = 0
+    total_killed = 0
+    pass_num = 1
+    start_time = time.time()
+
+    while frontier:
+        print(f"\n🔄 [Pass {pass_num}] 영향받은 글자 {len(frontier)}개 재검사")
+        try:
+            revived = _collect_changes(cursor, frontier, revive=True)
+            _apply_changes(cursor, revived, can_use=True)
+            killed = _collect_changes(cursor, frontier, revive=False)
+            _apply_changes(cursor, killed, can_use=False)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"\n❌ Pass Error: {e}")
+            return -1
+
+        total_revived += len(revived)
+        total_killed += len(killed)
+        print(f"   🟢부활: {len(revived)} | 🔴제거: {len(killed)}")
+
+        # 상태가 바뀐 단어의 첫 글자로 끝나는 단어들이 다음 검사 대상
+        frontier = {row['start_char'] for row in revived + killed if row['start_char']}
+        pass_num += 1
+
+    elapsed = time.time() - start_time
+    print(f"\n✅ [수렴 완료] {elapsed:.2f}초 소요 | 🟢부활: {total_revived} | 🔴제거: {total_killed}")
+    return total_revived + total_killed
+
+def run_full_sync(conn, cursor):
+    pass_count = 1
+    total_touched = 0
+    while True:
+        total_changed = run_synchronization_pass(conn, cursor, pass_count)
+        
+        if total_changed == -1:
+            return -1
+        
+        if total_changed == 0:
+            print(f"\n✅ [수렴 완료] 더 이상 상태가 변하는 단어가 없습니다.")
+            return total_touched
+        
+        total_touched += total_changed
+        print(f"   👉 상태 변경이 감지되었습니다. 연쇄 작용 반영을 위해 재검사합니다...")
+        pass_count += 1
+
+def optimize_word_database(full=False, start_num=None):
     conn = get_db_connection()
     cursor = conn.cursor()
 
+    def job(job_conn, after_num, max_num):
+        if after_num == 0:
+            print("--- 🚀 끝말잇기 DB 상태 완전 동기화 (Source 필터링 적용) ---")
+            touched = run_full_sync(job_conn, cursor)
+        else:
+            print("--- 🚀 끝말잇기 DB 증분 동기화 (새 단어가 건드린 글자만 검사) ---")
+            touched = run_incremental_sync(job_conn, cursor, after_num, max_num)
+        if touched == -1:
+            raise RuntimeError("동기화 중 오류가 발생하여 워터마크를 갱신하지 않습니다.")
+        # num 은 중간이 비어 있을 수 있으므로 범위 폭이 아니라 실제 행 수를 보고
+        cursor.execute("SELECT COUNT(*) AS cnt FROM ko_word WHERE num > %s AND num <= %s", (after_num, max_num))
+        return cursor.fetchone()['cnt'], touched
+
     try:
         cursor.execute("SET SQL_SAFE_UPDATES = 0;")
         
-        print("--- 🚀 끝말잇기 DB 상태 완전 동기화 (Source 필터링 적용) ---")
-        
-        pass_count = 1
-        while True:
-            total_changed = run_synchronization_pass(conn, cursor, pass_count)
-            
-            if total_changed == -1:
-                break
-            
-            if total_changed == 0:
-                print(f"\n✅ [수렴 완료] 더 이상 상태가 변하는 단어가 없습니다.")
-                break
-            
-            print(f"   👉 상태 변경이 감지되었습니다. 연쇄 작용 반영을 위해 재검사합니다...")
-            pass_count += 1
+        run_job(JOB_NAME, job, conn, full=full, start_num=start_num)
             
         print(f"\n{'='*40}")
         cursor.execute("SELECT count(*) as cnt FROM ko_word WHERE can_use = TRUE")
@@ -133,4 +241,5 @@ def optimize_word_database():
             conn.close()
 
 if __name__ == "__main__":
-    optimize_word_database()
\ No newline at end of file
+    args = parse_job_args("한 방 단어(이어지는 단어 없음) 정리").parse_args()
+    optimize_word_database(full=args.full, start_num=args.start)
\ No newline at end of file
@@ -1,123 +1,105 @@
-import os
-import pymysql
-from dotenv import load_dotenv
-from kiwipiepy import Kiwi
+from maintenance import get_db_connection, parse_job_args, run_job
+from morph_cache import sync_morph_cache, get_analyzer_version, PREDICATE_TAGS
 
-def process_compound_words_only():
-    # 1. .env 파일에서 DB 정보 로드
-    load_dotenv()
-    
-    db_host = os.getenv('DB_HOST')
-    db_user = os.getenv('DB_USER')
-    db_password = os.getenv('DB_PASSWORD')
-    db_name = os.getenv('DB_NAME')
+JOB_NAME = "remove_verb"
 
-    # Kiwi 형태소 분석기 초기화
-    kiwi = Kiwi()
-    
-    # [수정 2] 지시하신 2가지 출처로 한정
-    valid_sources = ['URI', 'Standard']
+# [수정 2] 지시하신 2가지 출처로 한정
+valid_sources = ['URI', 'Standard']
+
+def process_compound_words_only(conn, after_num, max_num, include_verb=False):
+    source_placeholders = ','.join(['%s'] * len(valid_sources))
+    cursor = conn.cursor()
+
+    # [수정 3] 매번 Kiwi 로 전체 사전을 분석하지 않고, word_morphs 캐시를 증분 갱신한 뒤 조회만 수행
+    sync_morph_cache(conn, sources=valid_sources, start_num=after_num)
+    analyzer_version = get_analyzer_version()
     
-    conn = None
-    try:
-        # DB 연결
-        conn = pymysql.connect(
-            host=db_host,
-            user=db_user,
-            password=db_password,
-            db=db_name,
-            charset='utf8mb4'
-        )
-        cursor = conn.cursor()
-        
-        # [수정 2] source가 URI, Standard인 항목 중 available이 True인 것만 조회
-        sql_select = """
-            SELECT word, source, can_use 
-            FROM ko_word 
-            WHERE source IN ('URI', 'Standard')
-              AND available = True
-        """
-        cursor.execute(sql_select)
-        results = cursor.fetchall()
-        
-        total_count = len(results)
-        processed_count = 0
-        category_updated_count = 0
-        source_updated_count = 0
+    # [수정 2] source가 URI, Standard인 항목 중 available이 True인 것만 대상 (워터마크 이후 범위)
+    range_condition = "AND w.num > %s AND w.num <= %s"
+    sql_count = f"""
+        SELECT COUNT(*) 
+        FROM ko_word w
+        WHERE w.source IN ({source_placeholders})
+          AND w.available = True
+          {range_condition}
+    """
+    cursor.execute(sql_count, (*valid_sources, after_num, max_num))
+    total_count = cursor.fetchone()[0]
+
+    if total_count == 0:
+        print("[보고] 지시하신 조건(URI/Standard 출처 및 available=True)에 부합하는 대상 단어가 없습니다.")
+        cursor.close()
+        return 0, 0
 
-        if total_count == 0:
-            print("[보고] 지시하신 조건(URI/Standard 출처 및 available=True)에 부합하는 대상 단어가 없습니다.")
-            return
+    # [수정 1] 합성어 판별: 명사(N), 동사/형용사 어간(V) 등 실질 의미를 지닌 형태소가 2개 이상 결합된 단어
+    sql_update_compound = f"""
+        UPDATE ko_word w
+        INNER JOIN word_morphs m ON m.num = w.num AND m.analyzer_version = %s
+        SET w.is_use_user = '합성어', w.available = False, w.can_use = (w.source IN ({source_placeholders}))
+        WHERE w.source IN ({source_placeholders})
+          AND w.available = True
+          AND m.morph_count >= 2
+          AND m.meaningful_count >= 2
+          {range_condition}
+    """
+    cursor.execute(sql_update_compound, (analyzer_version, *valid_sources, *valid_sources, after_num, max_num))
+    category_updated_count = cursor.rowcount
 
-        # UPDATE 쿼리 준비
-        sql_update_category = """
-            UPDATE ko_word 
-            SET is_use_user = %s, available = False, can_use = %s 
-            WHERE word = %s
+    # 선택 사항: 동사/형용사 어간으로 시작하는 단어 필터 (캐시 조회만으로 처리)
+    verb_updated_count = 0
+    if include_verb:
+        tag_placeholders = ','.join(['%s'] * len(PREDICATE_TAGS))
+        sql_update_verb = f"""
+            UPDATE ko_word w
+            INNER JOIN word_morphs m ON m.num = w.num AND m.analyzer_version = %s
+            SET w.is_use_user = '동사/형용사', w.available = False, w.can_use = (w.source IN ({source_placeholders}))
+            WHERE w.source IN ({source_placeholders})
+              AND w.available = True
+              AND m.first_tag IN ({tag_placeholders})
+              {range_condition}
         """
-        sql_update_can_use = "UPDATE ko_word SET can_use = %s WHERE word = %s"
+        cursor.execute(sql_update_verb, (analyzer_version, *valid_sources, *valid_sources, *PREDICATE_TAGS, after_num, max_num))
+        verb_updated_count = cursor.rowcount
 
-        for row in results:
-            word = row[0].strip()
-            source = row[1]
-            current_can_use = row[2]
-            
-            if not word:
-                processed_count += 1
-                continue
-                
-            # Kiwi를 활용한 단어 분석
-            analysis_result = kiwi.analyze(word)
-            
-            if not analysis_result:
-                processed_count += 1
-                continue
-            
-            morphs = analysis_result[0][0]
-            category = None
-            
-            # [수정 1] 동사/형용사 판별 로직 제거, 합성어 판별 로직만 단독 수행
-            if len(morphs) >= 2:
-                # 명사(N), 동사/형용사 어간(V) 등 실질 의미를 지닌 형태소가 2개 이상 결합되었는지 확인
-                meaningful_morphs = [m for m in morphs if m[1].startswith('N') or m[1].startswith('V')]
-                if len(meaningful_morphs) >= 2:
-                    category = '합성어'
-            
-            expected_can_use = True if source in valid_sources else False
-            status_msg = "해당 없음 (상태 유지)"
-            
-            # DB 업데이트 로직
-            if category:
-                cursor.execute(sql_update_category, (category, expected_can_use, word))
-                category_updated_count += 1
-                status_msg = f"{category} 판별 (available=False 처리)"
-                
-            elif current_can_use != expected_can_use:
-                cursor.execute(sql_update_can_use, (expected_can_use, word))
-                source_updated_count += 1
-                status_msg = f"can_use 상태 교정 ({expected_can_use})"
-            
-            processed_count += 1
-            
-            # 실시간 콘솔 한 줄 출력
-            print(f"\r[처리 진행률: {processed_count}/{total_count}] 단어: '{word}' -> {status_msg}" + " " * 15, end='', flush=True)
-            
-        # 작업 완료 후 커밋
-        conn.commit()
-        
-        print("\n\n[보고] 합성어 전용 검수 및 DB 업데이트가 완료되었습니다.")
-        print(f"- 총 검사 대상 단어: {total_count}건")
-        print(f"- 합성어 필터링(available=False 처리): {category_updated_count}건")
-        print(f"- 사용 가능 여부(can_use) 상태 교정: {source_updated_count}건")
+    # 출처 기준 can_use 상태 교정
+    sql_update_can_use = f"""
+        UPDATE ko_word w
+        SET w.can_use = (w.source IN ({source_placeholders}))
+        WHERE w.source IN ({source_placeholders})
+          AND w.available = True
+          AND w.can_use <> (w.source IN ({source_placeholders}))
+          {range_condition}
+    """
+    cursor.execute(sql_update_can_use, (*valid_sources, *valid_sources, *valid_sources, after_num, max_num))
+    source_updated_count = cursor.rowcount
         
+    # 작업 완료 후 커밋
+    conn.commit()
+    cursor.close()
+    
+    print("\n[보고] 합성어 전용 검수 및 DB 업데이트가 완료되었습니다.")
+    print(f"- 총 검사 대상 단어: {total_count}건")
+    print(f"- 합성어 필터링(available=False 처리): {category_updated_count}건")
+    if include_verb:
+        print(f"- 동사/형용사 필터링(available=False 처리): {verb_updated_count}건")
+    print(f"- 사용 가능 여부(can_use) 상태 교정: {source_updated_count}건")
+
+    return total_count, category_updated_count + verb_updated_count + source_updated_count
+
+if __name__ == "__main__":
+    parser = parse_job_args("URI/Standard 출처 합성어 필터")
+    parser.add_argument("--verb", action="store_true", help="동사/형용사 어간으로 시작하는 단어도 필터링")
+    args = parser.parse_args()
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        run_job(JOB_NAME, lambda c, a, m: process_compound_words_only(c, a, m, include_verb=args.verb),
+                conn, full=args.full, start_num=args.start)
     except Exception as e:
         if conn and conn.open:
             conn.rollback()
         print(f"\n[오류 보고] DB 처리 중 문제가 발생했습니다: {e}")
     finally:
         if conn and conn.open:
-            cursor.close()
             conn.close()
-
-if __name__ == "__main__":
-    process_compound_words_only()
\ No newline at end of file
@@ -0,0 +1,150 @@
+# src/chat_recorder.py
+import os
+import gzip
+import json
+import time
+import queue
+import asyncio
+import threading
+from datetime import datetime
+
+from .utils import extract_guess
+from .tracing import tracer
+
+class ChatRecorder:
+    # 모니터가 받은 모든 채팅을 gzip 압축 JSONL 로 기록 (재생/성능 분석용)
+    # 한 줄 형식: {"t": 수신 시각(epoch 초), "p": 플랫폼, "n": 닉네임, "m": 메시지, "st": 플랫폼 메시지 시각(ms) 또는 null}
+    def __init__(self, path, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.record_count = 0
+        self.queue = queue.Queue()
+        # 파일 열기/쓰기에 실패하면 기록을 멈춤 (작업 스레드 없이 큐만 계속 쌓이지 않도록)
+        self.disabled = False
+
+        log_dir = os.path.dirname(path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+
+        self.worker = threading.Thread(target=self._writer_loop, daemon=True)
+        self.worker.start()
+
+    def record(self, platform, nickname, message, server_time=None):
+        if self.disabled:
+            return
+        self.queue.put((time.time(), platform, nickname, message, server_time))
+
+    def _writer_loop(self):
+        try:
+            f = gzip.open(self.path, 'at', encoding='utf-8')
+        except Exception as e:
+            self._disable(f"채팅 기록 파일 열기 실패: {e}")
+            return
+
+        last_flush = time.time()
+        try:
+            while True:
+                try:
+                    item = self.queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = False
+
+                if item is None:
+                    break
+                try:
+                    if item:
+                        t, platform, nickname, message, server_time = item
+                        f.write(json.dumps({"t": round(t, 3), "p": platform, "n": nickname, "m": message, "st": server_time},
+                                           ensure_ascii=False, separators=(',', ':')) + "\n")
+                        self.record_count += 1
+
+                    if time.time() - last_flush >= self.flush_interval:
+                        f.flush()
+                        last_flush = time.time()
+                except Exception as e:
+                    # 디스크 부족 등. 이후 채팅은 기록하지 않음
+                    self._disable(f"채팅 기록 쓰기 실패: {e} (이후 기록 중단, {self.record_count:,}건 기록됨)")
+                    break
+        finally:
+            try:
+                f.close()
+            except Exception:
+                # 쓰기 실패 후 닫을 때 남은 버퍼를 쓰다 다시 실패할 수 있음 (이미 중단 로그를 남김)
+                pass
+
+    def _disable(self, message):
+        self.disabled = True
+        print(f"[오류] {message}")
+        # 이미 쌓인 항목은 버려서 메모리를 돌려줌
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def close(self):
+        self.queue.put(None)
+        self.worker.join(timeout=3)
+
+def create_recorder_from_env():
+    # CHAT_RECORD_PATH 예: logs/chat_%Y%m%d_%H%M%S.jsonl.gz (strftime 형식 지원)
+    path = os.getenv("CHAT_RECORD_PATH")
+    if not path:
+        return None
+    path = datetime.now().strftime(path)
+    print(f"[시스템] 채팅 기록 활성화: {path}")
+    return ChatRecorder(path)
+
+def iter_chat_log(path):
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    except (EOFError, gzip.BadGzipFile):
+        # 비정상 종료로 마지막 블록이 잘린 경우 읽을 수 있는 곳까지만 사용
+        return
+
+class ChatReplayer:
+    # 기록된 채팅을 GameSignals 로 다시 흘려보냄. speed=1 은 실시간, N 은 N배속, 0 은 최대 속도
+    def __init__(self, signals, path, speed=1.0):
+        self.signals = signals
+        self.path = path
+        self.speed = speed
+        self.running = True
+        self.replayed_count = 0
+        self.guess_count = 0
+
+    def stop(self):
+        self.running = False
+
+    async def run(self, emit=None):
+        if emit is None:
+            emit = self.signals.word_detected.emit
+
+        first_t = None
+        start = time.perf_counter()
+        for event in iter_chat_log(self.path):
+            if not self.running:
+                break
+            if first_t is None:
+                first_t = event["t"]
+
+            if self.speed > 0:
+                delay = (event["t"] - first_t) / self.speed - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif self.replayed_count % 500 == 0:
+                # 최대 속도에서도 이벤트 루프가 멈추지 않도록 주기적으로 양보
+                await asyncio.sleep(0)
+
+            self.replayed_count += 1
+            # 치지직 모니터와 동일하게 클린봇 메시지는 제외
+            if event["p"] == "치지직" and "클린봇" in event["m"]:
+                continue
+            guess = extract_guess(event["m"])
+            if guess:
+                self.guess_count += 1
+                # 기록된 플랫폼 시각은 과거 시점이므로 재생 시에는 수신 시점부터 추적
+                emit(event["p"], event["n"], guess, tracer.new_trace(event["p"]))
@@ -0,0 +1,41 @@
+# src/chzzk_decoder.py
+import re
+import json
+
+try:
+    import orjson
+    _loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:
+    _loads = json.loads
+    JSON_BACKEND = "json"
+
+CHAT_CMD = 93101
+
+# 프레임 최상위의 "cmd" 값. 채팅 본문/profile 안의 따옴표는 \" 로 이스케이프되어 있어 여기에 걸리지 않음
+_CMD_PATTERN = re.compile(r'"cmd"\s*:\s*(\d+)')
+# 메시지가 '!' 로 시작하는 채팅이 하나라도 있는지 (앞쪽 공백/이스케이프된 줄바꿈 허용)
+_GUESS_MSG_PATTERN = re.compile(r'"msg"\s*:\s*"(?:\s|\\[nrt])*!')
+
+def decode_frame(raw, keep_all=False):
+    """
+    웹소켓 프레임을 해석해 (cmd, data)를 돌려줍니다.
+    채팅 프레임(93101)에 '!' 로 시작하는 메시지가 하나도 없으면 JSON 해석 없이 (93101, None)을 돌려줍니다.
+    keep_all=True 이면 (채팅 기록 중 등) 항상 전체를 해석합니다.
+    """
+    if not keep_all:
+        match = _CMD_PATTERN.search(raw)
+        if match and int(match.group(1)) == CHAT_CMD and not _GUESS_MSG_PATTERN.search(raw):
+            return CHAT_CMD, None
+    data = _loads(raw)
+    return data.get('cmd'), data
+
+def parse_nickname(profile_raw):
+    # profile 은 문자열로 한 번 더 감싼 JSON 이므로 정답 후보일 때만 해석
+    if not profile_raw:
+        return "익명"
+    try:
+        profile = _loads(profile_raw)
+    except ValueError:
+        return "익명"
+    return (profile or {}).get('nickname', '익명')
@@ -1,6 +1,11 @@
 # src/commands.py
 import time
 from .utils import apply_dueum_rule
+from .metrics import metrics
+from .query_stats import query_stats
+from .tracing import tracer
+from .registry import unknown_words, violation_users
+from .mailer import mail_outbox
 
 class CommandManager:
     def __init__(self, main_window):
@@ -23,6 +28,11 @@ class CommandManager:
         elif cmd == "game": return self._handle_game_control(args)
         # [신규] network start/stop
         elif cmd == "network": return self._handle_network_control(args)
+        elif cmd == "stats": return self._handle_stats(args)
+        elif cmd == "dbstats": return self._handle_dbstats(args)
+        elif cmd == "trace": return tracer.format_summary()
+        elif cmd == "registry": return self._handle_registry(args)
+        elif cmd == "profile": return self._handle_profile(args)
         
         else: return f"[오류] 알 수 없는 명령어: {cmd}"
 
@@ -52,6 +62,42 @@ class CommandManager:
             return None
         return "[오류] network start 또는 network stop 만 가능"
 
+    def _handle_stats(self, args):
+        if args and args[0].lower() == "reset":
+            metrics.reset()
+            return "[성공] 측정값 초기화됨"
+        return "\n".join([metrics.format_summary(), self.gui.ingestion.format_summary(), self.gui.monitors.format_summary(),
+                          unknown_words.format_summary(), violation_users.format_summary(), mail_outbox.format_summary()])
+
+    def _handle_registry(self, args):
+        if args and args[0].lower() == "export":
+            try:
+                return "\n".join(f"[성공] {r.name} 횟수 저장: {r.export_counts()}" for r in (unknown_words, violation_users))
+            except OSError as e:
+                return f"[오류] 횟수 저장 실패: {e}"
+        return "\n".join([unknown_words.format_summary(), violation_users.format_summary()])
+
+    def _handle_dbstats(self, args):
+        if args and args[0].lower() == "reset":
+            query_stats.reset()
+            return "[성공] 쿼리 통계 초기화됨"
+        try: limit = int(args[0]) if args else 10
+        except ValueError: return "[오류] dbstats [개수] 또는 dbstats reset"
+        return query_stats.format_summary(limit)
+
+    def _handle_profile(self, args):
+        if not args: return "[오류] profile start [초] [sample|cprofile] 또는 profile stop"
+        action = args[0].lower()
+        if action == "start":
+            seconds, mode = None, "sample"
+            for arg in args[1:]:
+                try: seconds = float(arg)
+                except ValueError: mode = arg.lower()
+            return self.gui.start_profiling(seconds, mode)
+        elif action == "stop":
+            return self.gui.stop_profiling()
+        return "[오류] profile start 또는 profile stop 만 가능"
+
     def _handle_chcw(self, full_command):
         try: target_word = full_command[len("chcw"):].strip().replace('"', '').replace("'", "")
         except: return "[오류] 파싱 실패"
@@ -1,11 +1,12 @@
 # src/database.py
-import pymysql
 import os
 import csv
 import threading
 import queue
 from datetime import datetime, timedelta
 
+from .metrics import metrics
+
 class DatabaseManager:
     def __init__(self):
         self.host = os.getenv("DB_HOST", "localhost")
@@ -20,13 +21,15 @@ class DatabaseManager:
         
         self.banned_chars = {}
         
-        self.connect()
+        # 연결은 첫 쿼리(보통 사전 점검의 test_db_integrity, 백그라운드 스레드)에서 맺음 -> 창이 DB 연결을 기다리지 않음
 
         self.log_queue = queue.Queue()
         self.log_worker = threading.Thread(target=self._log_worker_loop, daemon=True)
         self.log_worker.start()
 
     def connect(self):
+        import pymysql
+        from .query_stats import InstrumentedCursor
         try:
             if self.conn:
                 try: self.conn.close()
@@ -40,7 +43,7 @@ class DatabaseManager:
                 port=self.port,
                 charset='utf8mb4',
                 autocommit=True,
-                cursorclass=pymysql.cursors.Cursor,
+                cursorclass=InstrumentedCursor,
                 connect_timeout=10 
             )
                 
@@ -59,11 +62,13 @@ class DatabaseManager:
             self.connect()
 
     def _create_worker_connection(self):
+        import pymysql
+        from .query_stats import InstrumentedCursor
         try:
             return pymysql.connect(
                 host=self.host, user=self.user, password=self.password,
                 db=self.db_name, port=self.port, charset='utf8mb4',
-                autocommit=True, cursorclass=pymysql.cursors.Cursor
+                autocommit=True, cursorclass=InstrumentedCursor
             )
         except: return None
 
@@ -141,6 +146,7 @@ class DatabaseManager:
             except Exception as e:
                 print(f"[오류] 게임 종료 기록 실패: {e}")
 
+    @metrics.timed("db_check_and_use_word")
     def check_and_use_word(self, word, nickname):
         word = word.strip()
         with self.lock:
@@ -169,6 +175,7 @@ class DatabaseManager:
                 err_str = str(e).replace('\n', ' ')
                 return f"error:{err_str}"
 
+    @metrics.timed("db_check_remaining_words")
     def check_remaining_words(self, start_char):
         with self.lock:
             self._ensure_connection()
@@ -0,0 +1,560 @@
+# src/engine.py
+import os
+import time
+import asyncio
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+from .ingestion import WordSnapshot, prevalidate
+from .metrics import metrics
+from .tracing import tracer
+from .state_journal import journal, TIME_FORMAT
+from .registry import unknown_words, violation_users
+from .mailer import mail_outbox
+from .utils import (apply_dueum_rule, handle_violation_alert, log_unknown_word,
+                    send_alert_email, send_rare_word_email, send_game_start_email)
+
+class Signal:
+    # PyQt 없이 쓰는 시그널. 이벤트 루프가 아닌 스레드에서 emit 하면 루프 스레드로 넘겨서 호출 (Qt 의 queued 연결과 같은 효과)
+    def __init__(self):
+        self.slots = []
+        self.loop = None
+        self.loop_thread = None
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def bind(self, loop):
+        # 이벤트 루프 스레드에서 호출해야 함
+        self.loop = loop
+        self.loop_thread = threading.get_ident()
+
+    def emit(self, *args):
+        if self.loop is not None and threading.get_ident() != self.loop_thread:
+            self.loop.call_soon_threadsafe(self._dispatch, args)
+        else:
+            self._dispatch(args)
+
+    def _dispatch(self, args):
+        for slot in list(self.slots):
+            try:
+                slot(*args)
+            except Exception:
+                # Qt 와 마찬가지로 한 슬롯의 예외가 다른 슬롯/보낸 쪽을 멈추지 않도록 출력만 함
+                traceback.print_exc()
+
+class EngineSignals:
+    # GameSignals 와 같은 이름의 순수 파이썬 시그널 묶음 (헤드리스 모드용)
+    NAMES = ("word_detected", "word_batch", "stream_offline", "stream_connected", "log_request", "gui_log_message")
+
+    def __init__(self):
+        for name in self.NAMES:
+            setattr(self, name, Signal())
+
+    def bind(self, loop):
+        for name in self.NAMES:
+            getattr(self, name).bind(loop)
+
+class EngineView:
+    """
+    엔진 상태가 바뀔 때 호출되는 화면 쪽 인터페이스. 기본 구현은 아무것도 하지 않으며 필요한 메서드만 재정의합니다.
+    Qt 창(ChzzkGameGUI)과 헤드리스 콘솔 출력(ConsoleView)이 이 인터페이스를 구현합니다.
+    """
+    def log(self, message): pass
+    def clear_log(self): pass
+    def flush(self): pass
+    def show_word(self, word): pass
+    def show_winner(self, platform, nickname): pass
+    def show_hint(self, last_char): pass
+    def show_word_count(self, count): pass
+    def show_banned_chars(self, banned): pass
+    def show_paused(self, paused): pass
+    def show_offline(self, offline): pass
+    def show_reset_time(self, text): pass
+    def show_game_over(self, last_word, last_winner, used_count): pass
+    def show_countdown(self, seconds): pass
+    def show_playing(self): pass
+    def refresh_runtime(self): pass
+
+def check_db_reset_time():
+    # 사전 점검: db_reset_time (상태 저널, 없으면 기존 .env 값)이 올바른 과거 날짜인지 확인. (정상 여부, 메시지)
+    env_date_str = journal.get("db_reset_time") or os.getenv("db_reset_time")
+    if not env_date_str:
+        return False, "환경변수(db_reset_time) 없음"
+    try:
+        env_dt = datetime.strptime(env_date_str, TIME_FORMAT)
+    except ValueError:
+        return False, f"날짜 형식 오류 ({env_date_str})"
+    if env_dt > datetime.now():
+        return False, f"미래 날짜 감지 ({env_date_str})"
+    return True, f"날짜 정상 ({env_date_str})"
+
+class GameEngine:
+    """
+    끝말잇기 규칙과 게임 상태 (현재 단어, 실패 횟수, 입력 잠금, 게임 종료/재시작).
+    UI 와 무관하게 asyncio 이벤트 루프 위에서 동작하며 화면 갱신은 view(EngineView)에 맡깁니다.
+    DB 검증은 이벤트 루프의 기본 스레드 풀에서 실행하고 결과는 루프 스레드에서 반영합니다.
+    """
+    UNLOCK_DELAY = 1.0          # 정답 처리 후 다음 입력을 받기까지 (초)
+    UNLOCK_FALLBACK = 5.0       # 검증이 늦어질 때 입력 잠금 강제 해제 (초)
+    RESTART_COUNTDOWN = 10      # 게임 종료 후 재시작까지 (초)
+
+    def __init__(self, signals, db_manager, profanity_filter, snapshot=None, view=None, unknown_word_logger=None):
+        self.signals = signals
+        self.db_manager = db_manager
+        self.profanity_filter = profanity_filter
+        self.snapshot = snapshot if snapshot is not None else WordSnapshot()
+        self.view = view if view is not None else EngineView()
+        self.log_unknown_word = unknown_word_logger or log_unknown_word
+
+        self._current_word = ""
+        self.start_time = None
+        self.program_start_dt = datetime.now()
+        self.current_game_start_dt = datetime.now() # CSV 백업을 위한 게임 시작시간 변수
+        self.last_change_time = time.time()
+
+        # 게임 진행 상태는 .env 대신 상태 저널에 기록 (이전 버전의 .env 값은 저널에 없을 때만 사용)
+        journal.open_from_env()
+        # 미등록 단어/위반 사용자 기록 파일은 백그라운드에서 미리 읽어 둠 (첫 오답 때 기다리지 않도록)
+        unknown_words.open()
+        violation_users.open()
+        # 메일은 작업 스레드 하나가 보관함에서 꺼내 보냄 (지난 실행에서 못 보낸 메일도 이어서 발송)
+        mail_outbox.start(self.db_manager.log_system)
+        self.db_reset_date = journal.get("db_reset_time") or os.getenv("db_reset_time", "알 수 없음")
+        self._restore_banned_chars()
+
+        self.current_fail_count = 0
+        # 사전 탈락은 수집 작업 스레드에서도 집계하므로 실패 수 증가는 잠금으로 보호
+        self.fail_lock = threading.Lock()
+        self.last_platform = None
+        self.last_user = None
+        self.word_count = 0
+
+        # 소스 이름 -> SourceStats (연결 상태 online 과 소스별 처리량)
+        self.platform_status = {}
+        self.is_global_offline = False
+        self.last_offline_log_time = {}
+
+        self.is_paused = False
+        self.answer_check_enabled = True
+        self.input_locked = False
+        self.is_game_over = False
+        self.email_sent_flag = False
+        self.last_sent_hour = -1
+
+        self._unlock_handle = None
+        self._fallback_handle = None
+        self._restart_task = None
+        self._clock_task = None
+
+    @property
+    def loop(self):
+        return asyncio.get_event_loop()
+
+    @property
+    def current_word(self):
+        return self._current_word
+
+    @current_word.setter
+    def current_word(self, word):
+        # 현재 단어가 바뀔 때마다 수집 단계의 사전 검사 기준도 함께 교체
+        self._current_word = word
+        self.snapshot.publish(word)
+
+    def log(self, message):
+        self.view.log(message)
+
+    def async_log_system(self, level, source, message, trace=None):
+        self.db_manager.log_system(level, source, message, trace)
+
+    def async_log_history(self, nickname, input_word, previous_word, status, reason=None):
+        self.db_manager.log_history(nickname, input_word, previous_word, status, reason)
+
+    # ---- 게임 진행 ----
+
+    def start_game(self, start_word, start_user=None, restore_time=False):
+        if isinstance(start_word, (tuple, list)):
+            start_word = str(start_word[0]) if start_word else "시작"
+
+        self.start_time = time.time()
+        self.current_word = start_word
+        self.is_game_over = False
+
+        # [추가 반영] 현재 라운드 게임 시작 시간을 명확히 기록 (CSV 파일명 용도)
+        self.current_game_start_dt = datetime.now()
+
+        self.current_fail_count = 0
+        self.db_manager.start_new_game_session(start_word)
+
+        self.view.show_word(start_word)
+        self.view.flush()
+
+        if restore_time:
+            saved_str = journal.get("last_change_time") or os.getenv("last_word_change_time")
+            if saved_str:
+                try: self.last_change_time = datetime.strptime(saved_str, TIME_FORMAT).timestamp()
+                except ValueError: self.last_change_time = time.time()
+            else: self.last_change_time = time.time()
+            self.last_platform = journal.get("last_platform")
+            self.last_user = start_user
+        else: self.last_change_time = time.time()
+
+        journal.update(current_word=start_word,
+                       last_change_time=datetime.fromtimestamp(self.last_change_time).strftime(TIME_FORMAT),
+                       last_platform=self.last_platform if restore_time else None, last_user=start_user)
+
+        self.view.show_winner(self.last_platform if restore_time else None, start_user)
+        self.view.clear_log()
+        self.answer_check_enabled = True
+        self.set_paused(False)
+
+        self.word_count = self.db_manager.get_used_word_count()
+        self.view.show_word_count(self.word_count)
+
+        self.async_log_system(1, "Game", f"게임 시작 (시작 단어: {start_word})")
+        self.view.show_hint(start_word[-1])
+        self.log(f"[시스템] 게임 시작! 시작 단어: {start_word}")
+
+        self.refresh_banned_chars()
+        self._send_start_email(start_word, start_user)
+        self._ensure_clock()
+
+    def set_paused(self, paused):
+        self.is_paused = paused
+        self.view.show_paused(paused)
+
+    def refresh_banned_chars(self):
+        self.view.show_banned_chars(self.db_manager.get_banned_end_chars())
+        # 금지 글자는 DB 관리자 메모리에만 있으므로 바뀐 경우에만 저널에 남겨 재시작 후에도 유지
+        banned = {char: banned_at.strftime(TIME_FORMAT) for char, banned_at in dict(self.db_manager.banned_chars).items()}
+        if banned != journal.get("banned_chars", {}):
+            journal.update(banned_chars=banned)
+
+    def _restore_banned_chars(self):
+        for char, banned_at in journal.get("banned_chars", {}).items():
+            try:
+                self.db_manager.banned_chars.setdefault(char, datetime.strptime(banned_at, TIME_FORMAT))
+            except (TypeError, ValueError):
+                continue
+
+    def recent_start_word(self):
+        # "최근 사용한 단어" 시작: 저널에 마지막 상태가 있으면 DB 조회 없이 그대로 이어감. (단어, 사용자, 시간 복원 여부)
+        word = journal.get("current_word")
+        if word:
+            return word, journal.get("last_user"), True
+        ret = self.db_manager.get_last_used_word()
+        if isinstance(ret, tuple):
+            return ret[0], ret[1], False
+        return str(ret), None, False
+
+    def handle_word_batch(self, batch):
+        # 수집 큐가 묶어 보낸 후보를 도착 순서대로 처리 (첫 정답 후보가 입력을 잠그면 나머지는 무시됨)
+        for platform, nickname, word, trace, verdict in batch:
+            self.handle_new_word(platform, nickname, word, trace, verdict)
+
+    def handle_new_word(self, platform, nickname, word, trace=None, verdict=None):
+        if trace: trace.mark("dispatched")
+        outcome = self._screen_new_word(platform, nickname, word, trace, verdict)
+        # 검증으로 넘어간 경우에는 on_word_check_finished 에서 추적을 마무리
+        if outcome != "pending":
+            tracer.finish(trace, outcome)
+
+    def accepting_answers(self):
+        # 수집 작업 스레드에서도 읽으므로 상태 값만 확인
+        return not (self.is_paused or self.input_locked or self.is_game_over
+                    or not self.answer_check_enabled or self.is_global_offline)
+
+    def _screen_new_word(self, platform, nickname, word, trace, verdict):
+        if not self.accepting_answers(): return "ignored"
+
+        # 수집 단계를 거치지 않았거나, 검사 이후 현재 단어가 바뀐 경우에만 여기서 다시 검사
+        if verdict is None or verdict[1] != self.current_word:
+            word, reject = prevalidate(word, self.snapshot.state, self.profanity_filter)
+        else:
+            reject = verdict[0]
+
+        if reject:
+            self._add_fail()
+            message = self._record_rejection(platform, nickname, word, *reject, self.current_word)
+            if message:
+                self.log(message)
+            return "rejected"
+
+        self.input_locked = True
+        self._fallback_handle = self.loop.call_later(self.UNLOCK_FALLBACK, self.force_unlock_input)
+
+        self.loop.create_task(self._check_word(platform, word, nickname, trace))
+        return "pending"
+
+    def record_rejections(self, rejected):
+        # 수집 작업 스레드에서 호출. 묶음에서 첫 통과 후보보다 앞선 사전 탈락 후보만 넘어오므로 순서가 바뀌지 않음.
+        # GUI 스레드로 보내지 않고 여기서 기록/집계하며, 화면 로그는 묶음마다 한 번만 시그널로 보냄.
+        # 기록했으면 True (입력을 받지 않는 중이면 무시하고 False)
+        if not self.accepting_answers():
+            for item in rejected:
+                tracer.finish(item[3], "ignored")
+            return False
+        messages = []
+        for platform, nickname, word, trace, (reason, detail), previous_word in rejected:
+            message = self._record_rejection(platform, nickname, word, reason, detail, previous_word)
+            if message:
+                messages.append(message)
+            tracer.finish(trace, "rejected")
+        self._add_fail(len(rejected))
+        if messages:
+            self.signals.gui_log_message.emit("\n".join(messages))
+        return True
+
+    def _add_fail(self, count=1):
+        with self.fail_lock:
+            self.current_fail_count += count
+
+    def _record_rejection(self, platform, nickname, word, reason, detail, previous_word):
+        # DB 기록만 하고 화면에 남길 메시지를 돌려줌 (GUI 스레드/수집 작업 스레드 어디서든 호출 가능)
+        if reason == "profanity":
+            self.async_log_history(nickname, word, previous_word, "Fail", f"금지어({detail})")
+            threading.Thread(target=self.db_manager.mark_word_as_forbidden, args=(word,), daemon=True).start()
+            return f"[차단] {platform} - {nickname}: {word} (금지어: {detail})"
+        elif reason == "too_short":
+            self.async_log_history(nickname, word, previous_word, "Fail", "한 글자")
+            return f"[실패] {platform} - {nickname}: {word} [한 글자 금지]"
+        elif reason == "not_hangul":
+            self.async_log_history(nickname, word, previous_word, "Fail", "한글 아님")
+        elif reason == "wrong_start":
+            self.async_log_history(nickname, word, previous_word, "Fail", "규칙 위반")
+            return f"[실패] {platform} - {nickname}: {word} [초성 불일치]"
+        return None
+
+    async def _check_word(self, platform, word, nickname, trace):
+        try:
+            result, is_game_over = await self.loop.run_in_executor(None, self._bg_check_word, word, nickname)
+        except Exception as e:
+            err_str = str(e).replace('\n', ' ')
+            print(f"[검증 스레드 외부 오류] {err_str}")
+            result, is_game_over = f"error:{err_str}", False
+        if trace: trace.mark("validated")
+        self.on_word_check_finished(result, platform, nickname, word, is_game_over, trace)
+
+    def _bg_check_word(self, word, nickname):
+        # 스레드 풀에서 실행
+        result = self.db_manager.check_and_use_word(word, nickname)
+        is_game_over = False
+
+        if result == "success":
+            next_starts = apply_dueum_rule(word[-1])
+            any_left = False
+            for char in next_starts:
+                if self.db_manager.check_remaining_words(char) > 0:
+                    any_left = True
+                    break
+            if not any_left:
+                is_game_over = True
+        return result, is_game_over
+
+    @metrics.timed("gui_update")
+    def on_word_check_finished(self, result_status, platform, nickname, word, is_game_over, trace=None):
+        if result_status == "success":
+            self._unlock_handle = self.loop.call_later(self.UNLOCK_DELAY, self.unlock_input)
+
+            self.last_platform = platform
+            self.last_user = nickname
+
+            self.async_log_history(nickname, word, self.current_word, "Success")
+
+            self.view.show_winner(platform, nickname)
+            self.log(f"[성공] {platform} - {nickname}: {word}")
+
+            threading.Thread(target=self._check_and_send_rare_word, args=(word, nickname), daemon=True).start()
+
+            self.current_word = word
+            self.view.show_word(word)
+
+            self.last_change_time = time.time()
+            journal.update(current_word=word, last_change_time=datetime.fromtimestamp(self.last_change_time).strftime(TIME_FORMAT),
+                           last_platform=platform, last_user=nickname)
+            self.email_sent_flag = False
+
+            self.word_count += 1
+            self.view.show_word_count(self.word_count)
+            self.view.refresh_runtime()
+            self.view.show_hint(word[-1])
+
+            if is_game_over:
+                self.log(f"[시스템] 게임 종료!")
+                self.process_game_over(word, nickname)
+        else:
+            self.unlock_input()
+            self._add_fail()
+            fail_msg = f"[실패] {platform} - {nickname}: {word}"
+
+            if result_status == "not_found":
+                self.async_log_history(nickname, word, self.current_word, "Fail", "사전없음")
+                self.log(f"{fail_msg} [단어장에 없음]")
+                self.log_unknown_word(word)
+            elif result_status == "unavailable":
+                self.async_log_history(nickname, word, self.current_word, "Fail", "부적절")
+                self.log(f"{fail_msg} [사용 불가 단어]")
+                handle_violation_alert(nickname, word)
+            elif result_status == "forbidden":
+                self.async_log_history(nickname, word, self.current_word, "Fail", "금지어")
+                self.log(f"{fail_msg} [금지됨]")
+            elif result_status == "forbidden_end_char":
+                self.async_log_history(nickname, word, self.current_word, "Fail", "끝글자금지")
+                self.log(f"{fail_msg} [금지됨]")
+            elif result_status == "used":
+                self.async_log_history(nickname, word, self.current_word, "Fail", "이미사용")
+                self.log(f"{fail_msg} [이미 사용됨]")
+            elif str(result_status).startswith("error:"):
+                error_detail = result_status.split(":", 1)[1] if ":" in result_status else "상세 오류 없음"
+                self.async_log_history(nickname, word, self.current_word, "Fail", f"DB에러: {error_detail[:10]}")
+                self.log(f"[시스템 오류] {fail_msg} (DB 에러: {error_detail})")
+            else:
+                self.log(f"[시스템 오류] {fail_msg} (알 수 없는 에러 상태: {result_status})")
+
+        tracer.finish(trace, result_status.split(":", 1)[0])
+
+    def unlock_input(self):
+        self.input_locked = False
+        if self._fallback_handle is not None:
+            self._fallback_handle.cancel()
+            self._fallback_handle = None
+
+    def force_unlock_input(self):
+        self._fallback_handle = None
+        if self.input_locked:
+            self.input_locked = False
+            self.log("[시스템 주의] 단어 검증 지연 발생. 입력 잠금 강제 해제됨.")
+
+    def process_game_over(self, last_word, last_winner):
+        self.db_manager.check_and_ban_start_char(last_word)
+        self.refresh_banned_chars()
+
+        self.db_manager.end_game_session(self.current_fail_count, last_word, self.last_platform, self.last_user)
+
+        # [수정 반영] 게임 종료 시 game_history만 전용 백업 수행 후 비우기
+        end_dt = datetime.now()
+        threading.Thread(target=self.db_manager.export_and_clear_game_history, args=(self.current_game_start_dt, end_dt), daemon=True).start()
+
+        today_str = datetime.now().strftime(TIME_FORMAT)
+        journal.update(db_reset_time=today_str)
+        self.db_reset_date = today_str
+        self.view.show_reset_time(today_str)
+
+        self.is_game_over = True
+        self.view.show_game_over(last_word, last_winner, self.db_manager.get_used_word_count())
+        if self._restart_task is not None:
+            self._restart_task.cancel()
+        self._restart_task = self.loop.create_task(self._restart_countdown())
+
+    async def _restart_countdown(self):
+        self.view.show_countdown(self.RESTART_COUNTDOWN)
+        reset_future = None
+        for remaining in range(self.RESTART_COUNTDOWN - 1, -1, -1):
+            await asyncio.sleep(1)
+            self.view.show_countdown(remaining)
+            if reset_future is None:
+                # 카운트다운이 도는 동안 단어 사용 기록 초기화를 미리 진행
+                reset_future = self.loop.run_in_executor(None, self.db_manager.reset_all_tables)
+
+        if not reset_future.done():
+            self.log("[시스템] 게임 재시작 최적화 진행 중... (약간의 대기)")
+        await reset_future
+        self._restart_task = None
+        self.start_game(self.db_manager.get_random_start_word(), restore_time=False)
+        self.view.show_playing()
+
+    # ---- 방송 연결 상태 ----
+
+    def handle_stream_offline(self, platform_name):
+        if platform_name in self.platform_status:
+            self.platform_status[platform_name].online = False
+
+        if not any(stats.online for stats in self.platform_status.values()):
+            if not self.is_global_offline:
+                self.is_global_offline = True
+                self.async_log_system(10, "Game", "모든 방송 연결 끊김. 대기 모드 진입.")
+                self.view.show_offline(True)
+                self.log("[시스템] 모든 방송 연결이 끊겼습니다. 재접속 대기 중...")
+        else:
+            now = time.time()
+            last_log = self.last_offline_log_time.get(platform_name, 0)
+            if now - last_log > 30:
+                self.log(f"[시스템] {platform_name} 연결 불안정. 재접속 시도 중...")
+                self.last_offline_log_time[platform_name] = now
+
+    def handle_stream_connected(self, platform_name):
+        stats = self.platform_status.get(platform_name)
+        if stats is not None and not stats.online:
+            self.log(f"[시스템] {platform_name} 방송 연결됨.")
+            stats.online = True
+
+        if self.is_global_offline:
+            self.is_global_offline = False
+            self.view.show_offline(False)
+            self.log("[시스템] 방송 연결 복구. 게임 재개.")
+
+    # ---- 주기 작업 ----
+
+    def _ensure_clock(self):
+        if self._clock_task is None or self._clock_task.done():
+            self._clock_task = self.loop.create_task(self._run_clock())
+
+    async def _run_clock(self):
+        while True:
+            await asyncio.sleep(1)
+            self.tick()
+
+    def tick(self):
+        # 1초마다: 정각 알림 메일, 10초마다 금지 글자 갱신
+        if self.start_time is None:
+            return
+        now_ts = time.time()
+        now = datetime.now()
+        if now.minute == 0 and self.last_sent_hour != now.hour:
+            self.last_sent_hour = now.hour
+            self.async_log_system(6, "Game", f"정각({now.hour}시) 알림 메일 발송")
+            self.send_hourly_mail()
+
+        if int(now_ts) % 10 == 0:
+            self.refresh_banned_chars()
+
+    def runtime_text(self):
+        # (프로그램 시작 시각 / 게임 진행 시간, 현재 단어 경과 시간)
+        start_str = self.program_start_dt.strftime('%Y.%m.%d %H:%M:%S')
+        if self.start_time is None:
+            return f"{start_str} / 0:00:00", None
+        now_ts = time.time()
+        return (f"{start_str} / {timedelta(seconds=int(now_ts - self.start_time))}",
+                str(timedelta(seconds=int(now_ts - self.last_change_time))))
+
+    def stop(self):
+        for task in (self._clock_task, self._restart_task):
+            if task is not None:
+                task.cancel()
+        for handle in (self._unlock_handle, self._fallback_handle):
+            if handle is not None:
+                handle.cancel()
+        journal.close()
+        unknown_words.close()
+        violation_users.close()
+        mail_outbox.close()
+
+    # ---- 메일 ----
+
+    # 발송 결과(성공/최종 실패)는 메일 보관함 작업 스레드가 app_logs 에 남기고, 여기서는 보관함에 넣지 못한 경우만 기록
+
+    def send_hourly_mail(self):
+        queued, msg = send_alert_email(self.current_word, self.last_user)
+        if not queued: self.async_log_system(8, "Mail", "메일 발송 실패", msg)
+
+    def _check_and_send_rare_word(self, word, nickname):
+        # 스레드에서 실행 (희귀 여부 DB 조회)
+        count = self.db_manager.check_rare_end_word(word[-1])
+        if count != -1 and count <= 10:
+            queued, msg = send_rare_word_email(word, nickname)
+            if not queued: self.async_log_system(8, "Mail", "희귀단어 알림 발송 실패", msg)
+
+    def _send_start_email(self, word, user):
+        queued, msg = send_game_start_email(word, user)
+        if not queued: self.async_log_system(8, "Mail", "게임 시작 알림 메일 발송 실패", msg)
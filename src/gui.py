@@ -7,9 +7,8 @@ import socket
 import asyncio
 import threading
 import math
-import unicodedata
 import traceback 
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QFrame, QSizePolicy, QMessageBox, QGridLayout,
@@ -20,8 +19,20 @@ from PyQt6.QtGui import QFont, QCloseEvent, QFontMetrics
 
 from .signals import GameSignals
 from .database import DatabaseManager
-from .network import ChzzkMonitor, YouTubeMonitor
-from .utils import apply_dueum_rule, send_alert_email, send_rare_word_email, send_game_start_email, ProfanityFilter, update_env_variable, handle_violation_alert, send_crash_report_email
+from .monitor_manager import MonitorManager
+from .chat_recorder import create_recorder_from_env
+from .metrics import metrics, start_metrics_server_from_env
+from .profiler import CPUProfiler
+from .query_stats import query_stats
+from .tracing import tracer
+from .ingestion import create_ingestion_from_env, WordSnapshot
+from .engine import GameEngine, check_db_reset_time
+from .startup import startup_timer, run_startup_checks
+from .registry import unknown_words, violation_users
+from .mailer import mail_outbox
+from .memory_watchdog import create_watchdog_from_env
+from .stall_detector import create_stall_detector_from_env
+from .utils import apply_dueum_rule, ProfanityFilter, send_crash_report_email
 
 def resource_path(relative_path):
     try:
@@ -68,7 +79,9 @@ class ShutdownDialog(QDialog):
         QApplication.processEvents()
 
 class StartupCheckDialog(QDialog):
-    check_finished_signal = pyqtSignal(bool, str, bool, str, bool, str, bool, str)
+    # 점검 하나가 끝날 때마다 (이름, 성공 여부, 메시지), 모두 끝나면 완료 시그널
+    check_item_signal = pyqtSignal(str, bool, str)
+    check_finished_signal = pyqtSignal()
 
     def __init__(self, chzzk_monitor, youtube_monitor, db_manager):
         super().__init__()
@@ -80,7 +93,9 @@ class StartupCheckDialog(QDialog):
         
         self.use_chzzk = False
         self.use_youtube = False
+        self.results = {}
         
+        self.check_item_signal.connect(self._on_check_item)
         self.check_finished_signal.connect(self._on_check_finished)
 
         layout = QVBoxLayout()
@@ -118,11 +133,20 @@ class StartupCheckDialog(QDialog):
         layout.addLayout(btn_layout)
         
         self.setLayout(layout)
-        QTimer.singleShot(100, self.run_checks)
+        # (라벨, 표시 접두어)
+        self.labels = {
+            "chzzk": (self.lbl_chzzk, "치지직: "),
+            "youtube": (self.lbl_yt, "유튜브: "),
+            "db": (self.lbl_db, "DB 상태: "),
+            "env": (self.lbl_env, ""),
+        }
+        self.run_checks()
 
     def run_checks(self):
         self.progress.setRange(0, 0)
         self.btn_next.setEnabled(False)
+        self.btn_retry.setEnabled(False)
+        self.results = {}
         self.lbl_chzzk.setText("치지직 확인 중...")
         self.lbl_yt.setText("유튜브 확인 중...")
         self.lbl_db.setText("DB 연결 확인 중...")
@@ -132,66 +156,32 @@ class StartupCheckDialog(QDialog):
         threading.Thread(target=self._check_logic_thread, daemon=True).start()
 
     def _check_logic_thread(self):
-        chzzk_ok, chzzk_msg = self.chzzk.check_live_status_sync()
-        yt_ok, yt_msg = self.youtube.check_live_status_sync()
-        is_db_ok, msg_db = self.db.test_db_integrity()
-        is_env_ok = False
-        env_msg = ""
-        env_date_str = os.getenv("db_reset_time")
-        if not env_date_str:
-            env_msg = "환경변수(db_reset_time) 없음"
-        else:
-            try:
-                env_dt = datetime.strptime(env_date_str, "%Y.%m.%d %H:%M:%S")
-                now = datetime.now()
-                if env_dt > now: env_msg = f"미래 날짜 감지 ({env_date_str})"
-                else:
-                    env_msg = f"날짜 정상 ({env_date_str})"
-                    is_env_ok = True
-            except ValueError:
-                env_msg = f"날짜 형식 오류 ({env_date_str})"
-        self.check_finished_signal.emit(chzzk_ok, chzzk_msg, yt_ok, yt_msg, is_db_ok, msg_db, is_env_ok, env_msg)
-
-    def _on_check_finished(self, chzzk_ok, chzzk_msg, yt_ok, yt_msg, is_db_ok, msg_db, is_env_ok, env_msg):
-        style_ok = "color: green; font-weight: bold;"
-        style_no = "color: red; font-weight: bold;"
-        
-        if chzzk_ok:
-            self.lbl_chzzk.setText(f"✔ 치지직: {chzzk_msg}")
-            self.lbl_chzzk.setStyleSheet(style_ok)
-            self.use_chzzk = True
-        else:
-            self.lbl_chzzk.setText(f"❌ 치지직: {chzzk_msg}")
-            self.lbl_chzzk.setStyleSheet(style_no)
-            self.use_chzzk = False
-
-        if yt_ok:
-            self.lbl_yt.setText(f"✔ 유튜브: {yt_msg}")
-            self.lbl_yt.setStyleSheet(style_ok)
-            self.use_youtube = True
-        else:
-            self.lbl_yt.setText(f"❌ 유튜브: {yt_msg}")
-            self.lbl_yt.setStyleSheet(style_no)
-            self.use_youtube = False
-
-        if is_db_ok:
-            self.lbl_db.setText(f"✔ DB 상태: {msg_db}")
-            self.lbl_db.setStyleSheet(style_ok)
-        else:
-            self.lbl_db.setText(f"❌ DB 상태: {msg_db}")
-            self.lbl_db.setStyleSheet(style_no)
-
-        if is_env_ok:
-            self.lbl_env.setText(f"✔ {env_msg}")
-            self.lbl_env.setStyleSheet(style_ok)
-        else:
-            self.lbl_env.setText(f"❌ {env_msg}")
-            self.lbl_env.setStyleSheet(style_no)
-
+        # 네 가지 점검을 동시에 실행하고 점검마다 제한 시간(STARTUP_CHECK_TIMEOUT)을 둠
+        run_startup_checks({
+            "chzzk": self.chzzk.check_live_status_sync,
+            "youtube": self.youtube.check_live_status_sync,
+            "db": self.db.test_db_integrity,
+            "env": check_db_reset_time,
+        }, on_result=self.check_item_signal.emit)
+        self.check_finished_signal.emit()
+
+    def _on_check_item(self, name, ok, msg):
+        self.results[name] = ok
+        lbl, prefix = self.labels[name]
+        lbl.setText(f"{'✔' if ok else '❌'} {prefix}{msg}")
+        lbl.setStyleSheet("color: green; font-weight: bold;" if ok else "color: red; font-weight: bold;")
+        if name == "chzzk":
+            self.use_chzzk = ok
+        elif name == "youtube":
+            self.use_youtube = ok
+
+    def _on_check_finished(self):
+        startup_timer.mark("checks")
         self.progress.setRange(0, 100)
         self.progress.setValue(100)
+        self.btn_retry.setEnabled(True)
 
-        if is_db_ok and is_env_ok and (self.use_chzzk or self.use_youtube):
+        if self.results.get("db") and self.results.get("env") and (self.use_chzzk or self.use_youtube):
             self.btn_next.setEnabled(True)
 
 class StartWordOptionDialog(QDialog):
@@ -287,15 +277,13 @@ class ConsoleWindow(QWidget):
                 if getattr(self.main_window, 'is_paused', False):
                     self.log("[오류] 이미 게임이 일시정지 상태입니다.")
                 else:
-                    self.main_window.is_paused = True
-                    self.main_window.lbl_pause_status.show()
+                    self.main_window.engine.set_paused(True)
                     self.log("[성공] 게임이 일시정지 되었습니다.")
             elif len(args) == 1 and args[0] == "start":
                 if not getattr(self.main_window, 'is_paused', False):
                     self.log("[오류] 게임이 일시정지 상태가 아닙니다.")
                 else:
-                    self.main_window.is_paused = False
-                    self.main_window.lbl_pause_status.hide()
+                    self.main_window.engine.set_paused(False)
                     self.log("[성공] 게임이 재개되었습니다.")
             else:
                 self.log("[오류] 사용법: game stop 또는 game start")
@@ -309,8 +297,57 @@ class ConsoleWindow(QWidget):
             else:
                 self.log("[오류] 사용법: ban {한글자}")
                 
+        elif command == "stats":
+            if len(args) == 1 and args[0] == "reset":
+                metrics.reset()
+                self.log("[성공] 측정값을 초기화했습니다.")
+            elif not args:
+                self.log(metrics.format_summary())
+                self.log(self.main_window.ingestion.format_summary())
+                self.log(self.main_window.monitors.format_summary())
+                self.log(unknown_words.format_summary())
+                self.log(violation_users.format_summary())
+                self.log(mail_outbox.format_summary())
+            else:
+                self.log("[오류] 사용법: stats 또는 stats reset")
+
+        elif command == "registry":
+            if args == ["export"]:
+                try:
+                    for registry in (unknown_words, violation_users):
+                        self.log(f"[성공] {registry.name} 횟수 저장: {registry.export_counts()}")
+                except OSError as e:
+                    self.log(f"[오류] 횟수 저장 실패: {e}")
+            elif not args:
+                self.log(unknown_words.format_summary())
+                self.log(violation_users.format_summary())
+            else:
+                self.log("[오류] 사용법: registry 또는 registry export")
+                
+        elif command == "dbstats":
+            if len(args) == 1 and args[0] == "reset":
+                query_stats.reset()
+                self.log("[성공] 쿼리 통계를 초기화했습니다.")
+            elif not args or (len(args) == 1 and args[0].isdigit()):
+                self.log(query_stats.format_summary(int(args[0]) if args else 10))
+            else:
+                self.log("[오류] 사용법: dbstats [개수] 또는 dbstats reset")
+
+        elif command == "trace":
+            self.log(tracer.format_summary())
+
+        elif command == "profile":
+            if args and args[0] == "start":
+                seconds = next((float(a) for a in args[1:] if a.replace('.', '', 1).isdigit()), None)
+                mode = next((a for a in args[1:] if not a.replace('.', '', 1).isdigit()), "sample")
+                self.log(self.main_window.start_profiling(seconds, mode))
+            elif args == ["stop"]:
+                self.log(self.main_window.stop_profiling())
+            else:
+                self.log("[오류] 사용법: profile start [초] [sample|cprofile] 또는 profile stop")
+                
         else:
-            self.log("[오류] 알 수 없는 명령어입니다. 사용 가능한 명령어: chcw, restart, game stop, game start, ban")
+            self.log("[오류] 알 수 없는 명령어입니다. 사용 가능한 명령어: chcw, restart, game stop, game start, ban, stats, dbstats, registry, trace, profile")
 
 class GameOverWidget(QWidget):
     def __init__(self):
@@ -357,7 +394,29 @@ class GameOverWidget(QWidget):
     def update_countdown(self, seconds):
         self.lbl_countdown.setText(f"{seconds}초 후에 다시 시작합니다....")
 
+def _engine_state(name):
+    # 콘솔/명령어 코드가 쓰던 창 속성을 엔진 상태로 연결
+    return property(lambda self: getattr(self.engine, name), lambda self, value: setattr(self.engine, name, value))
+
 class ChzzkGameGUI(QWidget):
+    """
+    GameEngine 의 Qt 뷰. 게임 규칙/상태는 엔진에 있고, 이 창은 엔진이 호출하는 EngineView 메서드(show_* 등)로 화면만 갱신합니다.
+    """
+    engine_class = GameEngine
+
+    current_word_text = _engine_state("current_word")
+    is_paused = _engine_state("is_paused")
+    answer_check_enabled = _engine_state("answer_check_enabled")
+    input_locked = _engine_state("input_locked")
+    current_fail_count = _engine_state("current_fail_count")
+    last_platform = _engine_state("last_platform")
+    last_user = _engine_state("last_user")
+    last_change_time = _engine_state("last_change_time")
+    email_sent_flag = _engine_state("email_sent_flag")
+    platform_status = _engine_state("platform_status")
+    is_global_offline = _engine_state("is_global_offline")
+    current_game_start_dt = _engine_state("current_game_start_dt")
+
     def __init__(self):
         super().__init__()
         
@@ -370,81 +429,68 @@ class ChzzkGameGUI(QWidget):
             sys.exit(0)
 
         self.signals = GameSignals()
-        self.chzzk_monitor = ChzzkMonitor(self.signals)
-        self.youtube_monitor = YouTubeMonitor(self.signals)
-        self.db_manager = DatabaseManager()
+        # [신규] CHAT_RECORD_PATH 가 설정된 경우 모든 채팅을 압축 로그로 기록
+        self.chat_recorder = create_recorder_from_env()
+        # [신규] 채팅 폭주 시 GUI 이벤트 큐가 넘치지 않도록 정답 후보를 묶어서 전달하는 수집 큐
+        # 정규화/금지어/길이/한글/두음 검사는 현재 단어 스냅샷을 기준으로 수집 단계의 작업 스레드에서 수행
+        self.word_snapshot = WordSnapshot()
         self.profanity_filter = ProfanityFilter()
-        
-        self.start_time = None 
-        self.program_start_dt = datetime.now() 
-        self.current_game_start_dt = datetime.now() # CSV 백업을 위한 게임 시작시간 변수
-        self.last_change_time = time.time()
-        self.current_word_text = ""
+        self.ingestion = create_ingestion_from_env(self.signals, self.word_snapshot, self.profanity_filter)
+        # [신규] 여러 치지직 채널/유튜브 영상을 한 게임에 연결 (CHZZK_CHANNEL_IDS, YOUTUBE_VIDEO_IDS)
+        self.monitors = MonitorManager(self.signals, recorder=self.chat_recorder, ingestion=self.ingestion)
+        # [신규] METRICS_PORT 가 설정된 경우 127.0.0.1 에서 Prometheus 형식 측정값 제공
+        self.metrics_server = start_metrics_server_from_env()
+        # [신규] TRACE_PATH 가 설정된 경우 채팅별 지연 추적을 JSONL 로 기록
+        tracer.open_from_env()
+        self.db_manager = DatabaseManager()
+        # [신규] 게임 규칙/상태는 UI 와 분리된 엔진이 담당하고 이 창은 뷰 역할만 함
+        self.engine = self.engine_class(self.signals, self.db_manager, self.profanity_filter, self.word_snapshot,
+                                        view=self)
+        # 사전 검사에서 탈락한 후보는 GUI 스레드로 오지 않고 수집 작업 스레드에서 바로 기록/집계
+        self.ingestion.rejection_handler = self.engine.record_rejections
         
         self.use_chzzk = False
         self.use_youtube = False
-        self.platform_status = {}
-        self.is_global_offline = False
-
-        self.current_fail_count = 0
-        self.last_platform = None
-        self.last_user = None
-
-        self.db_reset_date = os.getenv("db_reset_time", "알 수 없음")
-        
-        self.is_paused = False
-
-        self.input_locked = False
-        self.unlock_fallback_timer = QTimer(self)
-        self.unlock_fallback_timer.setSingleShot(True)
-        self.unlock_fallback_timer.timeout.connect(self.force_unlock_input)
-        
-        self.email_sent_flag = False 
-        self.last_sent_hour = -1 
         
         self.console_window = None
-        self.answer_check_enabled = True
-        
-        self.restart_timer = QTimer(self)
-        self.restart_timer.timeout.connect(self.tick_restart_countdown)
-        self.countdown_val = 10
-
-        self.reset_thread = None
-        
-        self.last_offline_log_time = {} 
+        self.profiler = CPUProfiler()
+        self.log_line_count = 0
 
         self.init_ui()
         self.setup_connections()
+
+        # [신규] MEMORY_WATCHDOG=1 인 경우 주기적으로 메모리 증가 위치를 app_logs 에 기록
+        self.memory_watchdog = create_watchdog_from_env(
+            self.db_manager.log_system,
+            self.signals.gui_log_message.emit,
+            probes={
+                "log_queue": self.db_manager.log_queue.qsize,
+                "log_lines": lambda: self.log_line_count,
+                "banned_chars": lambda: len(self.db_manager.banned_chars),
+                "unknown_words": lambda: len(unknown_words.entries),
+                "threads": threading.active_count,
+            }
+        )
         
-        QTimer.singleShot(100, self.run_startup_sequence)
+        QTimer.singleShot(0, self.run_startup_sequence)
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_runtime)
         self.timer.start(1000)
 
-    def safe_log_unknown_word(self, word):
-        filepath = resource_path("unknown_words.txt")
-        try:
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    if word in f.read().splitlines():
-                        return 
-            with open(filepath, 'a', encoding='utf-8') as f:
-                f.write(word + "\n")
-        except Exception as e:
-            print(f"[오류] 미등록 단어 기록 실패: {e}")
+        # [신규] STALL_DETECTOR=1 인 경우 이벤트 루프가 멈춘 순간의 메인 스레드 스택을 logs/stalls.log 에 기록
+        self.stall_detector = create_stall_detector_from_env(self.db_manager.log_system)
+        if self.stall_detector:
+            self.heartbeat_timer = QTimer(self)
+            self.heartbeat_timer.timeout.connect(self.stall_detector.beat)
+            self.heartbeat_timer.start(self.stall_detector.heartbeat_ms)
 
     def start_monitor_service(self):
         loop = asyncio.get_event_loop()
-        if self.use_chzzk:
-            loop.create_task(self.chzzk_monitor.run())
-            self.platform_status['치지직'] = False 
-        
-        if self.use_youtube:
-            loop.create_task(self.youtube_monitor.run())
-            self.platform_status['유튜브'] = False
+        loop.create_task(self.ingestion.run())
+        self.platform_status.update(self.monitors.start(self.use_chzzk, self.use_youtube))
 
     def run_startup_sequence(self):
-        check_dlg = StartupCheckDialog(self.chzzk_monitor, self.youtube_monitor, self.db_manager)
+        check_dlg = StartupCheckDialog(self.monitors.chzzk, self.monitors.youtube, self.db_manager)
         if check_dlg.exec() != QDialog.DialogCode.Accepted:
             sys.exit() 
         
@@ -457,6 +503,7 @@ class ChzzkGameGUI(QWidget):
         if word_dlg.exec() == QDialog.DialogCode.Accepted:
             mode = word_dlg.selected_mode
             start_word = "시작"
+            restore_time = False
             if mode == "INPUT":
                 text = word_dlg.input_text
                 if text and re.fullmatch(r'[가-힣]+', text):
@@ -464,16 +511,12 @@ class ChzzkGameGUI(QWidget):
             elif mode == "RANDOM":
                 start_word = self.db_manager.get_random_start_word()
             elif mode == "RECENT":
-                ret = self.db_manager.get_last_used_word()
-                if isinstance(ret, tuple):
-                    start_word = ret[0]
-                    start_user = ret[1]
-                else:
-                    start_word = str(ret)
-                    start_user = None
+                start_word, start_user, restore_time = self.engine.recent_start_word()
             
             self.start_monitor_service()
-            self.start_game_logic(start_word, start_user=start_user, restore_time=False)
+            self.start_game_logic(start_word, start_user=start_user, restore_time=restore_time)
+            startup_timer.mark("ready")
+            startup_timer.report(self.db_manager.log_system)
         else:
             sys.exit()
 
@@ -490,13 +533,24 @@ class ChzzkGameGUI(QWidget):
 
         shutdown_dlg.set_status("로그 및 데이터 백업 중...")
         end_dt = datetime.now()
-        start_dt = getattr(self, 'current_game_start_dt', end_dt)
         # [수정 반영] 프로그램 강제 종료 시 game_history 파일 백업 및 비우기
-        self.db_manager.export_and_clear_game_history(start_dt, end_dt)
+        self.db_manager.export_and_clear_game_history(self.current_game_start_dt, end_dt)
         time.sleep(0.5) 
         
         shutdown_dlg.set_status("데이터베이스 연결 해제 중...")
+        self.engine.stop()
+        self.ingestion.stop()
+        self.monitors.stop()
         self.db_manager.close()
+        if self.chat_recorder:
+            self.chat_recorder.close()
+        if self.metrics_server:
+            self.metrics_server.close()
+        tracer.close()
+        if self.memory_watchdog:
+            self.memory_watchdog.stop()
+        if self.stall_detector:
+            self.stall_detector.stop()
         
         time.sleep(0.3)
         shutdown_dlg.set_status("프로그램을 종료합니다.")
@@ -576,7 +630,7 @@ class ChzzkGameGUI(QWidget):
         lb_reset = QLabel("사용된 단어 목록 초기화 된 시간")
         lb_reset.setStyleSheet(lbl_style_title)
         lb_reset.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.lbl_reset_time = QLabel(self.db_reset_date)
+        self.lbl_reset_time = QLabel(self.engine.db_reset_date)
         self.lbl_reset_time.setStyleSheet(lbl_style_val)
         self.lbl_reset_time.setAlignment(Qt.AlignmentFlag.AlignCenter)
         lb_elapsed = QLabel("현재 단어 경과 시간")
@@ -651,10 +705,40 @@ class ChzzkGameGUI(QWidget):
             self.console_window = ConsoleWindow(self)
         self.console_window.show()
 
+    def start_profiling(self, seconds=None, mode="sample"):
+        # [신규] 게임을 멈추지 않고 CPU 프로파일링 시작 (seconds 지정 시 자동 종료)
+        try:
+            session_id = self.profiler.start(mode)
+        except (RuntimeError, ValueError) as e:
+            return f"[오류] {e}"
+        if seconds:
+            QTimer.singleShot(int(seconds * 1000), lambda: self._auto_stop_profiling(session_id))
+            return f"[성공] 프로파일링 시작 ({mode}, {seconds:g}초 후 자동 종료)"
+        return f"[성공] 프로파일링 시작 ({mode}, profile stop 으로 종료)"
+
+    def stop_profiling(self):
+        try:
+            path, summary = self.profiler.stop()
+        except RuntimeError as e:
+            return f"[오류] {e}"
+        except Exception as e:
+            return f"[오류] 프로파일링 종료 실패: {e}"
+        self.log_message(f"[시스템] 프로파일 저장: {path}")
+        return f"[성공] 프로파일 저장: {path}\n{summary}"
+
+    def _auto_stop_profiling(self, session_id):
+        # 그 사이 수동으로 멈추고 다시 시작한 경우에는 새 세션을 건드리지 않음
+        if not self.profiler.running or self.profiler.session_id != session_id:
+            return
+        result = self.stop_profiling()
+        if self.console_window is not None:
+            self.console_window.log(result)
+
     def log_message(self, message):
         current_time_str = datetime.now().strftime("[%H:%M:%S]")
         formatted_message = f"{current_time_str} {message}"
         self.log_display.append(formatted_message)
+        self.log_line_count += 1
         self.log_display.verticalScrollBar().setValue(self.log_display.verticalScrollBar().maximum())
 
     def set_responsive_text(self, text):
@@ -692,318 +776,93 @@ class ChzzkGameGUI(QWidget):
         self.lbl_current_word.setFont(font)
         self.lbl_current_word.setText(formatted_text)
 
-    def _send_start_email_bg(self, word, user):
-        success, msg = send_game_start_email(word, user)
-        if success: self.async_log_system(1, "Mail", "게임 시작 알림 메일 발송 성공")
-        else: self.async_log_system(8, "Mail", "게임 시작 알림 메일 발송 실패", msg)
-
     def _update_banned_chars_gui(self):
-        banned = self.db_manager.get_banned_end_chars()
-        if banned:
-            self.lbl_banned_chars.setText(f"금지된 끝 글자 : {', '.join(banned)}")
-        else:
-            self.lbl_banned_chars.setText("금지된 끝 글자 : 없음")
+        self.engine.refresh_banned_chars()
 
     def start_game_logic(self, start_word, start_user=None, restore_time=False):
-        if isinstance(start_word, (tuple, list)):
-            start_word = str(start_word[0]) if start_word else "시작"
-
-        self.start_time = time.time()
-        self.current_word_text = start_word
-        
-        # [추가 반영] 현재 라운드 게임 시작 시간을 명확히 기록 (CSV 파일명 용도)
-        self.current_game_start_dt = datetime.now()
-        
-        self.current_fail_count = 0
-        self.db_manager.start_new_game_session(start_word)
-        
-        self.set_responsive_text(start_word)
-        self.lbl_current_word.repaint()     
-        QApplication.processEvents()        
-        
-        if restore_time:
-            saved_str = os.getenv("last_word_change_time")
-            if saved_str:
-                try: self.last_change_time = datetime.strptime(saved_str, "%Y.%m.%d %H:%M:%S").timestamp()
-                except ValueError: self.last_change_time = time.time()
-            else: self.last_change_time = time.time()
-        else: self.last_change_time = time.time()
-        
-        curr_dt_str = datetime.fromtimestamp(self.last_change_time).strftime("%Y.%m.%d %H:%M:%S")
-        update_env_variable("last_word_change_time", curr_dt_str)
+        self.engine.start_game(start_word, start_user=start_user, restore_time=restore_time)
 
-        if start_user:
-            d_user = start_user if len(start_user) < 20 else "그 긴 거"
-            self.lbl_last_winner.setText(f"현재 단어를 맞춘 사람: {d_user}")
-        else:
-            self.lbl_last_winner.setText("현재 단어를 맞춘 사람: -")
-
-        self.log_display.clear()
-        self.answer_check_enabled = True
-        
-        self.is_paused = False
-        self.lbl_pause_status.hide()
-        
-        self.lbl_word_count.setText(str(self.db_manager.get_used_word_count()))
-        
-        self.async_log_system(1, "Game", f"게임 시작 (시작 단어: {start_word})")
-        self.update_hint(start_word[-1])
-        self.log_message(f"[시스템] 게임 시작! 시작 단어: {start_word}")
-        
-        self._update_banned_chars_gui()
-        threading.Thread(target=self._send_start_email_bg, args=(start_word, start_user), daemon=True).start()
+    def process_game_over(self, last_word, last_winner):
+        self.engine.process_game_over(last_word, last_winner)
 
     def setup_connections(self):
-        self.signals.word_detected.connect(self.handle_new_word)
-        self.signals.stream_offline.connect(self.handle_stream_offline)
-        self.signals.stream_connected.connect(self.handle_stream_connected)
-        self.signals.log_request.connect(self.async_log_system)
+        self.signals.word_detected.connect(self.engine.handle_new_word)
+        self.signals.word_batch.connect(self.engine.handle_word_batch)
+        self.signals.stream_offline.connect(self.engine.handle_stream_offline)
+        self.signals.stream_connected.connect(self.engine.handle_stream_connected)
+        self.signals.log_request.connect(self.engine.async_log_system)
         self.signals.gui_log_message.connect(self.log_message)
-        self.signals.game_check_result.connect(self.on_word_check_finished)
-
-    def handle_stream_offline(self, platform_name):
-        if platform_name in self.platform_status:
-            self.platform_status[platform_name] = False
-        
-        if not any(self.platform_status.values()):
-            if not self.is_global_offline:
-                self.is_global_offline = True
-                self.async_log_system(10, "Game", "모든 방송 연결 끊김. 대기 모드 진입.")
-                self.lbl_current_word.setText("방송 연결 대기 중...")
-                self.lbl_current_word.setStyleSheet("color: orange;")
-                font = self.lbl_current_word.font()
-                font.setPointSize(50)
-                self.lbl_current_word.setFont(font)
-                self.log_message("[시스템] 모든 방송 연결이 끊겼습니다. 재접속 대기 중...")
-        else:
-            now = time.time()
-            last_log = self.last_offline_log_time.get(platform_name, 0)
-            if now - last_log > 30:
-                self.log_message(f"[시스템] {platform_name} 연결 불안정. 재접속 시도 중...")
-                self.last_offline_log_time[platform_name] = now
-
-    def handle_stream_connected(self, platform_name):
-        was_connected = self.platform_status.get(platform_name, False)
-        if not was_connected:
-            self.log_message(f"[시스템] {platform_name} 방송 연결됨.")
-            self.platform_status[platform_name] = True
-
-        if self.is_global_offline:
-            self.is_global_offline = False
-            self.lbl_current_word.setStyleSheet("color: white;")
-            self.set_responsive_text(self.current_word_text)
-            self.log_message("[시스템] 방송 연결 복구. 게임 재개.")
 
     def update_runtime(self):
-        if self.start_time is None:
-            self.lbl_runtime.setText(f"{self.program_start_dt.strftime('%Y.%m.%d %H:%M:%S')} / 0:00:00")
-            return
-            
-        now_ts = time.time()
-        start_str = self.program_start_dt.strftime('%Y.%m.%d %H:%M:%S')
-        running_time_str = str(timedelta(seconds=int(now_ts - self.start_time)))
-        self.lbl_runtime.setText(f"{start_str} / {running_time_str}")
-        self.lbl_word_elapsed.setText(str(timedelta(seconds=int(now_ts - self.last_change_time))))
-        
-        now = datetime.now()
-        if now.minute == 0 and self.last_sent_hour != now.hour:
-            self.last_sent_hour = now.hour
-            self.async_log_system(6, "Game", f"정각({now.hour}시) 알림 메일 발송")
-            threading.Thread(target=self.thread_send_mail, daemon=True).start()
-
-        if int(now_ts) % 10 == 0:
-            self._update_banned_chars_gui()
-
-    def thread_send_mail(self):
-        success, msg = send_alert_email(self.current_word_text, self.last_user)
-        if success: self.async_log_system(1, "Mail", "알림 메일 발송 성공")
-        else: self.async_log_system(8, "Mail", "메일 발송 실패", msg)
+        runtime, elapsed = self.engine.runtime_text()
+        self.lbl_runtime.setText(runtime)
+        if elapsed is not None:
+            self.lbl_word_elapsed.setText(elapsed)
 
     def update_hint(self, last_char):
         valid_starts = apply_dueum_rule(last_char)
         self.lbl_next_hint.setText(f"다음 글자: '{last_char}' (가능: {', '.join([f'!{c}...' for c in valid_starts])})")
-        
-    def unlock_input(self):
-        self.input_locked = False
-        if self.unlock_fallback_timer.isActive():
-            self.unlock_fallback_timer.stop()
-
-    def force_unlock_input(self):
-        if self.input_locked:
-            self.input_locked = False
-            self.log_message("[시스템 주의] 단어 검증 지연 발생. 입력 잠금 강제 해제됨.")
-
-    def async_log_system(self, level, source, message, trace=None):
-        self.db_manager.log_system(level, source, message, trace)
-
-    def async_log_history(self, nickname, input_word, previous_word, status, reason=None):
-        self.db_manager.log_history(nickname, input_word, previous_word, status, reason)
-
-    def _check_and_send_rare_word(self, word, nickname):
-        count = self.db_manager.check_rare_end_word(word[-1])
-        if count != -1 and count <= 10:
-            success, msg = send_rare_word_email(word, nickname)
-            if success: self.async_log_system(1, "Mail", f"희귀단어 알림 발송 ({word})")
-            else: self.async_log_system(8, "Mail", "희귀단어 알림 발송 실패", msg)
-
-    def handle_new_word(self, platform, nickname, word):
-        if self.is_paused: return 
-        
-        if self.input_locked: return
-        if self.stacked_widget.currentIndex() == 1: return
-        if not self.answer_check_enabled: return
-        if self.is_global_offline: return
-
-        word = unicodedata.normalize('NFC', word)
-
-        is_bad, bad_word = self.profanity_filter.check(word)
-        if is_bad:
-            self.current_fail_count += 1
-            self.log_message(f"[차단] {platform} - {nickname}: {word} (금지어: {bad_word})")
-            self.async_log_history(nickname, word, self.current_word_text, "Fail", f"금지어({bad_word})")
-            threading.Thread(target=self.db_manager.mark_word_as_forbidden, args=(word,), daemon=True).start()
-            return
 
-        if len(word) < 2: 
-            self.current_fail_count += 1
-            self.async_log_history(nickname, word, self.current_word_text, "Fail", "한 글자")
-            self.log_message(f"[실패] {platform} - {nickname}: {word} [한 글자 금지]")
-            return
-            
-        if not re.fullmatch(r'[가-힣]+', word):
-            self.current_fail_count += 1
-            self.async_log_history(nickname, word, self.current_word_text, "Fail", "한글 아님")
-            return
+    # ---- EngineView ----
 
-        if self.current_word_text:
-            valid_starts = apply_dueum_rule(self.current_word_text[-1])
-            if word[0] not in valid_starts:
-                self.current_fail_count += 1
-                self.async_log_history(nickname, word, self.current_word_text, "Fail", "규칙 위반")
-                self.log_message(f"[실패] {platform} - {nickname}: {word} [초성 불일치]")
-                return
+    def log(self, message):
+        self.log_message(message)
 
-        self.input_locked = True
-        self.unlock_fallback_timer.start(5000) 
-        
-        threading.Thread(target=self._bg_check_word, args=(platform, word, nickname), daemon=True).start()
+    def clear_log(self):
+        self.log_display.clear()
 
-    def _bg_check_word(self, platform, word, nickname):
-        try:
-            result = self.db_manager.check_and_use_word(word, nickname)
-            is_game_over = False
-
-            if result == "success":
-                next_starts = apply_dueum_rule(word[-1])
-                any_left = False
-                for char in next_starts:
-                    if self.db_manager.check_remaining_words(char) > 0:
-                        any_left = True
-                        break
-                if not any_left:
-                    is_game_over = True
-            
-            self.signals.game_check_result.emit(result, platform, nickname, word, is_game_over)
-        except Exception as e:
-            err_str = str(e).replace('\n', ' ')
-            print(f"[검증 스레드 외부 오류] {err_str}")
-            self.signals.game_check_result.emit(f"error:{err_str}", platform, nickname, word, False)
+    def flush(self):
+        self.lbl_current_word.repaint()
+        QApplication.processEvents()
 
-    def on_word_check_finished(self, result_status, platform, nickname, word, is_game_over):
-        if result_status == "success":
-            QTimer.singleShot(1000, self.unlock_input)
-            
-            self.last_platform = platform
-            self.last_user = nickname
-            
-            self.async_log_history(nickname, word, self.current_word_text, "Success")
-            
-            d_nick = nickname if len(nickname) < 20 else "그 긴 거"
-            self.lbl_last_winner.setText(f"현재 단어를 맞춘 사람: [{platform}] {d_nick}")
-            self.log_message(f"[성공] {platform} - {nickname}: {word}")
+    def show_word(self, word):
+        self.set_responsive_text(word)
 
-            threading.Thread(target=self._check_and_send_rare_word, args=(word, nickname), daemon=True).start()
+    def show_winner(self, platform, nickname):
+        if not nickname:
+            self.lbl_last_winner.setText("현재 단어를 맞춘 사람: -")
+            return
+        d_nick = nickname if len(nickname) < 20 else "그 긴 거"
+        self.lbl_last_winner.setText(f"현재 단어를 맞춘 사람: [{platform}] {d_nick}" if platform else f"현재 단어를 맞춘 사람: {d_nick}")
 
-            self.current_word_text = word
-            self.set_responsive_text(word)
-            
-            self.last_change_time = time.time()
-            update_env_variable("last_word_change_time", datetime.fromtimestamp(self.last_change_time).strftime("%Y.%m.%d %H:%M:%S"))
-            self.email_sent_flag = False 
-            
-            self.lbl_word_count.setText(str(int(self.lbl_word_count.text()) + 1))
-            self.update_runtime()
-            self.update_hint(word[-1])
+    def show_hint(self, last_char):
+        self.update_hint(last_char)
 
-            if is_game_over:
-                self.log_message(f"[시스템] 게임 종료!")
-                self.process_game_over(word, nickname)
+    def show_word_count(self, count):
+        self.lbl_word_count.setText(str(count))
+
+    def show_banned_chars(self, banned):
+        if banned:
+            self.lbl_banned_chars.setText(f"금지된 끝 글자 : {', '.join(banned)}")
         else:
-            self.unlock_input()
-            self.current_fail_count += 1
-            fail_msg = f"[실패] {platform} - {nickname}: {word}"
-            
-            if result_status == "not_found":
-                self.async_log_history(nickname, word, self.current_word_text, "Fail", "사전없음")
-                self.log_message(f"{fail_msg} [단어장에 없음]")
-                threading.Thread(target=self.safe_log_unknown_word, args=(word,), daemon=True).start()
-            elif result_status == "unavailable":
-                self.async_log_history(nickname, word, self.current_word_text, "Fail", "부적절")
-                self.log_message(f"{fail_msg} [사용 불가 단어]") 
-                threading.Thread(target=handle_violation_alert, args=(nickname, word), daemon=True).start()
-            elif result_status == "forbidden":
-                self.async_log_history(nickname, word, self.current_word_text, "Fail", "금지어")
-                self.log_message(f"{fail_msg} [금지됨]")
-            elif result_status == "forbidden_end_char":
-                self.async_log_history(nickname, word, self.current_word_text, "Fail", "끝글자금지")
-                self.log_message(f"{fail_msg} [금지됨]")
-            elif result_status == "used":
-                self.async_log_history(nickname, word, self.current_word_text, "Fail", "이미사용")
-                self.log_message(f"{fail_msg} [이미 사용됨]")
-            elif str(result_status).startswith("error:"):
-                error_detail = result_status.split(":", 1)[1] if ":" in result_status else "상세 오류 없음"
-                self.async_log_history(nickname, word, self.current_word_text, "Fail", f"DB에러: {error_detail[:10]}")
-                self.log_message(f"[시스템 오류] {fail_msg} (DB 에러: {error_detail})")
-            else:
-                self.log_message(f"[시스템 오류] {fail_msg} (알 수 없는 에러 상태: {result_status})")
+            self.lbl_banned_chars.setText("금지된 끝 글자 : 없음")
 
-    def process_game_over(self, last_word, last_winner):
-        self.db_manager.check_and_ban_start_char(last_word)
-        self._update_banned_chars_gui()
-        
-        self.db_manager.end_game_session(self.current_fail_count, last_word, self.last_platform, self.last_user)
-        
-        # [수정 반영] 게임 종료 시 game_history만 전용 백업 수행 후 비우기
-        end_dt = datetime.now()
-        start_dt = getattr(self, 'current_game_start_dt', end_dt)
-        threading.Thread(target=self.db_manager.export_and_clear_game_history, args=(start_dt, end_dt), daemon=True).start()
-        
-        today_str = datetime.now().strftime("%Y.%m.%d %H:%M:%S")
-        update_env_variable("db_reset_time", today_str)
-        self.lbl_reset_time.setText(today_str)
-        
-        self.game_over_widget.set_stats(last_word, last_winner, self.db_manager.get_used_word_count())
-        self.stacked_widget.setCurrentIndex(1)
-        self.countdown_val = 10
-        self.game_over_widget.update_countdown(self.countdown_val)
-        self.restart_timer.start(1000)
+    def show_paused(self, paused):
+        self.lbl_pause_status.setVisible(paused)
+
+    def show_offline(self, offline):
+        if offline:
+            self.lbl_current_word.setText("방송 연결 대기 중...")
+            self.lbl_current_word.setStyleSheet("color: orange;")
+            font = self.lbl_current_word.font()
+            font.setPointSize(50)
+            self.lbl_current_word.setFont(font)
+        else:
+            self.lbl_current_word.setStyleSheet("color: white;")
+            self.set_responsive_text(self.current_word_text)
 
-    def tick_restart_countdown(self):
-        self.countdown_val -= 1
-        self.game_over_widget.update_countdown(self.countdown_val)
+    def show_reset_time(self, text):
+        self.lbl_reset_time.setText(text)
 
-        if self.countdown_val == 9:
-            self.reset_thread = threading.Thread(target=self.db_manager.reset_all_tables, daemon=True)
-            self.reset_thread.start()
+    def show_game_over(self, last_word, last_winner, used_count):
+        self.game_over_widget.set_stats(last_word, last_winner, used_count)
+        self.stacked_widget.setCurrentIndex(1)
 
-        if self.countdown_val <= 0:
-            self.restart_timer.stop()
-            self.restart_game_auto()
+    def show_countdown(self, seconds):
+        self.game_over_widget.update_countdown(seconds)
 
-    def restart_game_auto(self):
-        if self.reset_thread and self.reset_thread.is_alive():
-            self.log_message("[시스템] 게임 재시작 최적화 진행 중... (약간의 대기)")
-            self.reset_thread.join()
+    def show_playing(self):
+        self.stacked_widget.setCurrentIndex(0)
 
-        self.start_game_logic(self.db_manager.get_random_start_word(), restore_time=False)
-        self.stacked_widget.setCurrentIndex(0)
\ No newline at end of file
+    def refresh_runtime(self):
+        self.update_runtime()
@@ -0,0 +1,167 @@
+# src/headless.py
+# 디스플레이 없는 서버용 실행 모드: PyQt 를 불러오지 않고 모니터 + 수집 큐 + GameEngine 만 asyncio 로 실행
+# 사용 예: python main.py --headless --start random
+import re
+import sys
+import signal
+import threading
+import asyncio
+import argparse
+import functools
+from datetime import datetime
+
+from .engine import GameEngine, EngineSignals, EngineView, check_db_reset_time
+from .database import DatabaseManager
+from .monitor_manager import MonitorManager
+from .chat_recorder import create_recorder_from_env
+from .ingestion import create_ingestion_from_env, WordSnapshot
+from .metrics import start_metrics_server_from_env
+from .tracing import tracer
+from .startup import startup_timer, run_startup_checks
+from .memory_watchdog import create_watchdog_from_env
+from .stall_detector import create_stall_detector_from_env
+from .utils import ProfanityFilter
+
+class ConsoleView(EngineView):
+    # 화면 대신 표준 출력으로 진행 상황을 남기는 뷰
+    def log(self, message):
+        print(f"{datetime.now().strftime('[%H:%M:%S]')} {message}", flush=True)
+
+    def show_banned_chars(self, banned):
+        text = ", ".join(banned) if banned else "없음"
+        if text != getattr(self, "_last_banned", None):
+            self._last_banned = text
+            self.log(f"[시스템] 금지된 끝 글자 : {text}")
+
+    def show_game_over(self, last_word, last_winner, used_count):
+        self.log(f"[시스템] 최종 단어: {last_word} / 최종 단어를 사용한 시청자: {last_winner or '-'} / 제시된 단어 수: {used_count}")
+
+    def show_countdown(self, seconds):
+        if seconds in (10, 5):
+            self.log(f"[시스템] {seconds}초 후에 다시 시작합니다.")
+
+def choose_start_word(engine, start):
+    # 시작 단어 대화상자의 INPUT / RANDOM / RECENT 에 해당 (반환: 단어, 사용자, 시간 복원 여부)
+    if start == "random":
+        return engine.db_manager.get_random_start_word(), None, False
+    if start == "recent":
+        return engine.recent_start_word()
+    return (start if start and re.fullmatch(r'[가-힣]+', start) else "시작"), None, False
+
+async def _heartbeat(detector):
+    # GUI 의 heartbeat QTimer 대신 이벤트 루프 태스크로 beat
+    while True:
+        detector.beat()
+        await asyncio.sleep(detector.heartbeat_ms / 1000)
+
+async def run(args):
+    loop = asyncio.get_running_loop()
+    startup_timer.mark("import")
+    view = ConsoleView()
+
+    signals = EngineSignals()
+    signals.bind(loop)
+    chat_recorder = create_recorder_from_env()
+    word_snapshot = WordSnapshot()
+    profanity_filter = ProfanityFilter()
+    ingestion = create_ingestion_from_env(signals, word_snapshot, profanity_filter)
+    monitors = MonitorManager(signals, recorder=chat_recorder, ingestion=ingestion)
+    metrics_server = start_metrics_server_from_env()
+    tracer.open_from_env()
+
+    db_manager = DatabaseManager()
+    engine = GameEngine(signals, db_manager, profanity_filter, word_snapshot, view=view)
+    ingestion.rejection_handler = engine.record_rejections
+
+    signals.word_detected.connect(engine.handle_new_word)
+    signals.word_batch.connect(engine.handle_word_batch)
+    signals.stream_offline.connect(engine.handle_stream_offline)
+    signals.stream_connected.connect(engine.handle_stream_connected)
+    signals.log_request.connect(engine.async_log_system)
+    signals.gui_log_message.connect(view.log)
+
+    memory_watchdog = create_watchdog_from_env(
+        db_manager.log_system,
+        signals.gui_log_message.emit,
+        probes={
+            "log_queue": db_manager.log_queue.qsize,
+            "banned_chars": lambda: len(db_manager.banned_chars),
+            "threads": threading.active_count,
+        }
+    )
+    stall_detector = create_stall_detector_from_env(db_manager.log_system)
+    heartbeat_task = loop.create_task(_heartbeat(stall_detector)) if stall_detector else None
+
+    # 사전 점검 (시스템 사전 점검 대화상자와 같은 항목, 동시에 실행하며 점검별 제한 시간 적용)
+    view.log("[시스템] 사전 점검 중...")
+    labels = {"chzzk": "치지직: ", "youtube": "유튜브: ", "db": "DB 상태: ", "env": ""}
+    results = await loop.run_in_executor(None, functools.partial(run_startup_checks, {
+        "chzzk": monitors.chzzk.check_live_status_sync,
+        "youtube": monitors.youtube.check_live_status_sync,
+        "db": db_manager.test_db_integrity,
+        "env": check_db_reset_time,
+    }, on_result=lambda name, ok, msg: view.log(f"{'✔' if ok else '❌'} {labels[name]}{msg}")))
+    startup_timer.mark("checks")
+    chzzk_ok, yt_ok = results["chzzk"][0], results["youtube"][0]
+    is_db_ok, is_env_ok = results["db"][0], results["env"][0]
+
+    stop_event = asyncio.Event()
+    exit_code = 0
+    if not (is_db_ok and is_env_ok and (chzzk_ok or yt_ok)):
+        view.log("[오류] 사전 점검을 통과하지 못해 종료합니다.")
+        exit_code = 1
+    else:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                # Windows 는 add_signal_handler 미지원 -> KeyboardInterrupt 로 종료
+                pass
+
+        start_word, start_user, restore_time = choose_start_word(engine, args.start)
+        loop.create_task(ingestion.run())
+        engine.platform_status.update(monitors.start(chzzk_ok, yt_ok))
+        engine.start_game(start_word, start_user=start_user, restore_time=restore_time)
+        startup_timer.mark("ready")
+        startup_timer.report(db_manager.log_system)
+        try:
+            await stop_event.wait()
+        except asyncio.CancelledError:
+            pass
+
+    # 종료 처리 (Qt 창의 closeEvent 와 같은 순서)
+    view.log("[시스템] 종료 중...")
+    if engine.start_time is not None:
+        db_manager.end_game_session(engine.current_fail_count, engine.current_word, engine.last_platform, engine.last_user)
+        db_manager.export_and_clear_game_history(engine.current_game_start_dt, datetime.now())
+    engine.stop()
+    ingestion.stop()
+    monitors.stop()
+    await asyncio.sleep(0.3)
+    db_manager.close()
+    if chat_recorder:
+        chat_recorder.close()
+    if metrics_server:
+        metrics_server.close()
+    tracer.close()
+    if heartbeat_task:
+        heartbeat_task.cancel()
+    if memory_watchdog:
+        memory_watchdog.stop()
+    if stall_detector:
+        stall_detector.stop()
+    return exit_code
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="한국어 끝말잇기 (헤드리스 모드)")
+    parser.add_argument("--headless", action="store_true", help="PyQt 없이 실행")
+    parser.add_argument("--start", default="random",
+                        help="시작 단어: random(DB 무작위, 기본) | recent(최근 사용한 단어) | 직접 입력한 단어")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
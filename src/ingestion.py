@@ -0,0 +1,194 @@
+# src/ingestion.py
+import os
+import re
+import time
+import asyncio
+import threading
+import unicodedata
+from collections import deque, Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import metrics
+from .tracing import tracer
+from .utils import apply_dueum_rule
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_duplicates")
+
+HANGUL_WORD = re.compile(r'[가-힣]+')
+
+class WordSnapshot:
+    # GUI 스레드가 현재 단어를 바꿀 때마다 (단어, 허용 시작 글자) 튜플을 통째로 교체하므로
+    # 다른 스레드는 잠금 없이도 항상 서로 맞는 한 쌍을 읽게 됨
+    def __init__(self):
+        self.state = ("", None)
+
+    def publish(self, word):
+        self.state = (word, frozenset(apply_dueum_rule(word[-1])) if word else None)
+
+def prevalidate(word, state, profanity_filter):
+    """
+    게임 상태와 무관한 사전 검사. (정규화된 단어, 탈락 사유)를 돌려주며 통과하면 사유는 None 입니다.
+    탈락 사유: ("profanity", 금지어) / ("too_short", None) / ("not_hangul", None) / ("wrong_start", None)
+    """
+    word = unicodedata.normalize('NFC', word)
+    is_bad, bad_word = profanity_filter.check(word)
+    if is_bad:
+        return word, ("profanity", bad_word)
+    if len(word) < 2:
+        return word, ("too_short", None)
+    if not HANGUL_WORD.fullmatch(word):
+        return word, ("not_hangul", None)
+    current_word, valid_starts = state
+    if valid_starts is not None and word[0] not in valid_starts:
+        return word, ("wrong_start", None)
+    return word, None
+
+class IngestionQueue:
+    """
+    모니터와 게임 로직 사이의 수집 단계.
+    정답 후보를 한 건씩 Qt 시그널로 보내는 대신 제한된 크기의 큐에 모았다가 interval_ms 마다 묶어서 전달합니다.
+    - drop_oldest     : 큐가 가득 차면 가장 오래된 후보를 버림
+    - drop_duplicates : 아직 전달되지 않은 같은 단어는 먼저 온 것만 남기고(coalesce), 가득 차면 새 후보를 버림
+    snapshot 과 profanity_filter 가 주어지면 묶음을 보내기 전에 전용 작업 스레드에서 prevalidate 를 수행하고,
+    각 항목에 (탈락 사유, 검사 기준 단어)를 붙여 보냅니다. 묶음에서 첫 통과 후보보다 앞선 탈락 후보는 GUI 스레드로 보내지 않고
+    같은 작업 스레드에서 rejection_handler(탈락 목록) 로 넘기며 (없으면 추적만 마무리),
+    첫 통과 후보부터는 도착 순서를 지키기 위해 탈락 후보도 함께 보냅니다 (앞 후보가 입력을 잠그면 무시되도록).
+    """
+    def __init__(self, signals, interval_ms=30, max_size=500, policy="drop_oldest", snapshot=None, profanity_filter=None):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"알 수 없는 overflow 정책: {policy} ({', '.join(OVERFLOW_POLICIES)})")
+        self.signals = signals
+        self.interval = interval_ms / 1000
+        self.max_size = max_size
+        self.policy = policy
+        self.items = deque()
+        self.pending_words = set()
+        self.lock = threading.Lock()
+        self.running = True
+        self.snapshot = snapshot
+        self.profanity_filter = profanity_filter
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest") \
+            if snapshot is not None and profanity_filter is not None else None
+        self.rejected = Counter()
+        # (platform, nickname, word, trace, (사유, 상세), 검사 기준 단어) 목록을 받는 함수. 수집 작업 스레드에서 호출됨
+        self.rejection_handler = None
+
+        self.submitted = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.batches = 0
+
+    def stop(self):
+        self.running = False
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+    def submit(self, platform, nickname, word, trace=None):
+        discarded = None
+        with self.lock:
+            self.submitted += 1
+            if self.policy == "drop_duplicates":
+                if word in self.pending_words:
+                    self.coalesced += 1
+                    discarded = (trace, "coalesced")
+                elif len(self.items) >= self.max_size:
+                    self.dropped += 1
+                    discarded = (trace, "dropped")
+                else:
+                    self.pending_words.add(word)
+                    self.items.append((platform, nickname, word, trace))
+            else:
+                if len(self.items) >= self.max_size:
+                    self.dropped += 1
+                    discarded = (self.items.popleft()[3], "dropped")
+                self.items.append((platform, nickname, word, trace))
+
+        if discarded is not None:
+            metrics.inc(f"ingest_{discarded[1]}")
+            tracer.finish(*discarded)
+
+    def drain(self):
+        with self.lock:
+            if not self.items:
+                return []
+            batch = list(self.items)
+            self.items.clear()
+            self.pending_words.clear()
+            self.delivered += len(batch)
+            self.batches += 1
+        return batch
+
+    def _prevalidate_batch(self, batch):
+        # 작업 스레드에서 실행. 묶음 전체를 같은 스냅샷 기준으로 검사하고, 첫 통과 후보 앞의 탈락 후보는 여기서 처리
+        state = self.snapshot.state
+        result = []
+        rejected = []
+        reasons = Counter()
+        for platform, nickname, word, trace in batch:
+            word, reject = prevalidate(word, state, self.profanity_filter)
+            if reject:
+                reasons[reject[0]] += 1
+                if not result:
+                    rejected.append((platform, nickname, word, trace, reject, state[0]))
+                    continue
+            result.append((platform, nickname, word, trace, (reject, state[0])))
+        if rejected:
+            self._handle_rejected(rejected)
+        return result, reasons
+
+    def _handle_rejected(self, rejected):
+        handler = self.rejection_handler
+        if handler is not None:
+            try:
+                handler(rejected)
+                return
+            except Exception as e:
+                print(f"[오류] 사전 탈락 처리 실패: {e}")
+        for item in rejected:
+            tracer.finish(item[3], "rejected")
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while self.running:
+            await asyncio.sleep(self.interval)
+            batch = self.drain()
+            if not batch:
+                continue
+            if self.executor is not None:
+                start = time.perf_counter()
+                batch, reasons = await loop.run_in_executor(self.executor, self._prevalidate_batch, batch)
+                metrics.observe("ingest_prevalidate", time.perf_counter() - start)
+                self.rejected.update(reasons)
+                for reason, count in reasons.items():
+                    metrics.inc(f"prevalidate_{reason}", count)
+                if not batch:
+                    continue
+            else:
+                batch = [item + (None,) for item in batch]
+            metrics.inc("ingest_batches")
+            metrics.inc("ingest_delivered", len(batch))
+            start = time.perf_counter()
+            self.signals.word_batch.emit(batch)
+            metrics.observe("word_batch_dispatch", time.perf_counter() - start)
+
+    def format_summary(self):
+        return (f"[수집] 정책 {self.policy}, 간격 {self.interval * 1000:g}ms, 최대 {self.max_size}건 | "
+                f"접수 {self.submitted:,} / 전달 {self.delivered:,} (묶음 {self.batches:,}회) / "
+                f"버림 {self.dropped:,} / 병합 {self.coalesced:,} / 대기 {len(self.items):,}"
+                + (" | 사전 탈락 " + ", ".join(f"{k} {v:,}" for k, v in sorted(self.rejected.items())) if self.rejected else ""))
+
+def create_ingestion_from_env(signals, snapshot=None, profanity_filter=None):
+    # INGEST_INTERVAL_MS (기본 30), INGEST_MAX_SIZE (기본 500), INGEST_POLICY (drop_oldest | drop_duplicates)
+    try:
+        return IngestionQueue(
+            signals,
+            interval_ms=float(os.getenv("INGEST_INTERVAL_MS", "30")),
+            max_size=int(os.getenv("INGEST_MAX_SIZE", "500")),
+            policy=os.getenv("INGEST_POLICY", "drop_oldest"),
+            snapshot=snapshot,
+            profanity_filter=profanity_filter,
+        )
+    except ValueError as e:
+        print(f"[오류] 수집 큐 설정 오류: {e}. 기본값을 사용합니다.")
+        return IngestionQueue(signals, snapshot=snapshot, profanity_filter=profanity_filter)
@@ -0,0 +1,328 @@
+# src/mailer.py
+import os
+import json
+import time
+import smtplib
+import itertools
+import threading
+from collections import deque
+from datetime import datetime
+from email.mime.text import MIMEText
+
+from .metrics import metrics
+
+def mail_config():
+    # 발송 설정. 빠진 값이 있으면 None (SSL 을 끈 로컬 SMTP 대역은 비밀번호 없이 사용 가능)
+    use_ssl = os.getenv("MAIL_USE_SSL", "1") != "0"
+    config = {
+        "server": os.getenv("MAIL_SERVER", "smtp.naver.com"),
+        "port": int(os.getenv("MAIL_PORT", 465 if use_ssl else 25)),
+        "use_ssl": use_ssl,
+        "sender": os.getenv("MAIL_SENDER"),
+        "password": os.getenv("MAIL_PASSWORD"),
+        "receiver": os.getenv("MAIL_RECEIVER"),
+    }
+    if not (config["sender"] and config["receiver"]) or (use_ssl and not config["password"]):
+        return None
+    return config
+
+class MailOutbox:
+    """
+    메일 발송 전용 작업 스레드 하나와 디스크 보관함.
+    enqueue() 는 메일을 보관함 파일에 한 줄 추가하고 바로 돌아오며, 작업 스레드가 로그인된 SMTP 연결 하나를 재사용해 순서대로 보냅니다.
+    보내지 못한 메일은 파일에 남아 다음 실행 때 이어서 보냅니다.
+    - MAIL_OUTBOX_PATH : 보관함 파일 (기본 mail_outbox.jsonl, 추가/완료 기록을 한 줄씩 쌓고 모두 보내면 비움)
+    - MAIL_RATE_PER_MIN : 분당 최대 발송 수 (기본 10, 넘치는 메일은 보관함에서 대기)
+    - MAIL_RETRY_MAX : 최대 시도 횟수 (기본 5, 5초부터 두 배씩 최대 5분 간격). 끝내 실패하면 logs/mail_failed.jsonl 로 옮김
+    - MAIL_IDLE_SECONDS : 이 시간 동안 보낼 메일이 없으면 SMTP 연결을 닫음 (기본 60)
+    - MAIL_USE_SSL=0 : SMTP_SSL 대신 평문 SMTP (로컬 SMTP 대역으로 시험할 때)
+    """
+    RETRY_BASE = 5.0
+    RETRY_MAX_DELAY = 300.0
+
+    def __init__(self):
+        self.path = None
+        self.failed_path = os.path.join("logs", "mail_failed.jsonl")
+        self.pending = {}      # id -> 메일 정보 (attempts, next_try 포함)
+        self.cond = threading.Condition()
+        self.file = None
+        self.worker = None
+        self.running = False
+        self.log_func = None   # (level, source, message, trace) -> app_logs
+        self.ids = itertools.count(1)
+        self.sent_times = deque()
+        self.conn = None
+        self.conn_used = 0.0
+        self.sending = False
+
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.connections = 0
+
+    # ---- 보관함 파일 ----
+
+    def start(self, log_func=None):
+        with self.cond:
+            if log_func is not None:
+                self.log_func = log_func
+            if self.worker is not None:
+                return
+            try:
+                self.rate_per_min = max(1, int(os.getenv("MAIL_RATE_PER_MIN", "10")))
+                self.retry_max = max(1, int(os.getenv("MAIL_RETRY_MAX", "5")))
+                self.idle_seconds = float(os.getenv("MAIL_IDLE_SECONDS", "60"))
+            except ValueError as e:
+                print(f"[오류] 메일 설정 오류: {e}. 기본값을 사용합니다.")
+                self.rate_per_min, self.retry_max, self.idle_seconds = 10, 5, 60.0
+            self.path = os.getenv("MAIL_OUTBOX_PATH", "mail_outbox.jsonl")
+            self._load()
+            self.running = True
+            self.worker = threading.Thread(target=self._worker_loop, name="mail-outbox", daemon=True)
+            self.worker.start()
+
+    def _load(self):
+        # 추가(add)/완료(done) 기록을 순서대로 적용해 남은 메일만 복원하고, 파일은 남은 메일만으로 다시 씀
+        last_id = 0
+        self.pending = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    last_id = max(last_id, record.get("id", 0))
+                    if record.get("op") == "add":
+                        self.pending[record["id"]] = record
+                    else:
+                        self.pending.pop(record.get("id"), None)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[오류] 메일 보관함 읽기 실패: {e}")
+        self.ids = itertools.count(last_id + 1)
+        for record in self.pending.values():
+            record["attempts"] = 0
+            record["next_try"] = 0.0
+        if self.pending:
+            print(f"[시스템] 보내지 못한 메일 {len(self.pending)}건을 이어서 발송합니다.")
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in self.pending.values():
+                f.write(self._dump(record) + "\n")
+        os.replace(tmp_path, self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _dump(record):
+        return json.dumps({key: record[key] for key in ("op", "id", "subject", "body", "label", "created") if key in record},
+                          ensure_ascii=False, separators=(",", ":"))
+
+    def _append(self, record):
+        # self.cond 를 잡은 상태에서 호출
+        try:
+            self.file.write(self._dump(record) + "\n")
+            self.file.flush()
+        except Exception as e:
+            print(f"[오류] 메일 보관함 기록 실패: {e}")
+
+    def enqueue(self, subject, body, label="메일"):
+        # 반환: (대기열 추가 여부, 메시지). 실제 발송 결과는 작업 스레드가 log_func 로 남김
+        if mail_config() is None:
+            return False, "설정 누락"
+        self.start()
+        with self.cond:
+            record = {"op": "add", "id": next(self.ids), "subject": subject, "body": body, "label": label,
+                      "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "attempts": 0, "next_try": 0.0}
+            self.pending[record["id"]] = record
+            self._append(record)
+            self.cond.notify()
+        metrics.inc("mail_enqueued")
+        return True, "발송 대기열 추가"
+
+    def _finish(self, record):
+        # self.cond 를 잡은 상태에서 호출. 남은 메일이 없으면 파일을 비움
+        self.pending.pop(record["id"], None)
+        self._append({"op": "done", "id": record["id"]})
+        if not self.pending:
+            try:
+                self.file.seek(0)
+                self.file.truncate()
+            except Exception:
+                pass
+        self.cond.notify_all()
+
+    # ---- 작업 스레드 ----
+
+    def _worker_loop(self):
+        while True:
+            idle_conn = None
+            with self.cond:
+                record = None
+                while self.running:
+                    now = time.time()
+                    due = [r for r in self.pending.values() if r["next_try"] <= now]
+                    if due:
+                        record = min(due, key=lambda r: r["id"])
+                        break
+                    if self.conn is not None and now - self.conn_used >= self.idle_seconds:
+                        # QUIT 은 잠금을 놓은 뒤에 보냄 (느린 서버 때문에 enqueue 가 막히지 않도록)
+                        idle_conn, self.conn = self.conn, None
+                        break
+                    wait = min((r["next_try"] for r in self.pending.values()), default=now + self.idle_seconds) - now
+                    self.cond.wait(timeout=max(0.05, min(wait, self.idle_seconds)))
+                if idle_conn is None:
+                    if not self.running:
+                        break
+                    self.sending = True
+            if idle_conn is not None:
+                self._quit(idle_conn)
+                continue
+            try:
+                if not self._wait_rate_limit():
+                    break
+                self._send(record)
+            except Exception as e:
+                self._on_failure(record, e)
+            else:
+                self._on_success(record)
+            finally:
+                with self.cond:
+                    self.sending = False
+                    self.cond.notify_all()
+        self._close_connection()
+
+    def _wait_rate_limit(self):
+        # 최근 1분 동안 보낸 수가 한도에 닿으면 가장 오래된 발송이 1분을 넘길 때까지 대기. 도중에 종료되면 False
+        while self.running:
+            now = time.time()
+            while self.sent_times and now - self.sent_times[0] >= 60:
+                self.sent_times.popleft()
+            if len(self.sent_times) < self.rate_per_min:
+                return True
+            metrics.inc("mail_rate_limited")
+            with self.cond:
+                self.cond.wait(timeout=60 - (now - self.sent_times[0]))
+        return False
+
+    def _connection(self, config, fresh=False):
+        if fresh:
+            self._close_connection()
+        if self.conn is None:
+            if config["use_ssl"]:
+                conn = smtplib.SMTP_SSL(config["server"], config["port"], timeout=10)
+            else:
+                conn = smtplib.SMTP(config["server"], config["port"], timeout=10)
+            if config["password"]:
+                conn.login(config["sender"], config["password"])
+            self.conn = conn
+            self.connections += 1
+        return self.conn
+
+    def _close_connection(self):
+        # self.cond 를 잡지 않은 상태에서 호출 (QUIT 응답을 최대 timeout 동안 기다릴 수 있음)
+        with self.cond:
+            conn, self.conn = self.conn, None
+        self._quit(conn)
+
+    @staticmethod
+    def _quit(conn):
+        if conn is not None:
+            try:
+                conn.quit()
+            except Exception:
+                pass
+
+    def _send(self, record):
+        config = mail_config()
+        if config is None:
+            raise RuntimeError("메일 설정 누락")
+        msg = MIMEText(record["body"])
+        msg['Subject'] = record["subject"]
+        msg['From'] = config["sender"]
+        msg['To'] = config["receiver"]
+        start = time.perf_counter()
+        try:
+            self._connection(config).send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # 오래 쉬는 동안 서버가 끊은 연결이면 한 번만 새로 연결해 다시 보냄
+            self._connection(config, fresh=True).send_message(msg)
+        metrics.observe("mail_send", time.perf_counter() - start)
+        self.conn_used = time.time()
+        self.sent_times.append(self.conn_used)
+
+    def _on_success(self, record):
+        with self.cond:
+            self._finish(record)
+        self.sent += 1
+        metrics.inc("mail_sent")
+        self._log(1, f"{record['label']} 발송 성공")
+
+    def _on_failure(self, record, error):
+        self._close_connection()
+        record["attempts"] += 1
+        if record["attempts"] >= self.retry_max:
+            self.failed += 1
+            metrics.inc("mail_failed")
+            self._write_failed(record, error)
+            with self.cond:
+                self._finish(record)
+            self._log(8, f"{record['label']} 발송 실패 ({record['attempts']}회 시도)", str(error))
+            return
+        delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE * 2 ** (record["attempts"] - 1))
+        record["next_try"] = time.time() + delay
+        self.retries += 1
+        metrics.inc("mail_retry")
+        print(f"[오류] {record['label']} 발송 실패, {delay:g}초 후 재시도 ({record['attempts']}/{self.retry_max}): {error}")
+
+    def _write_failed(self, record, error):
+        try:
+            log_dir = os.path.dirname(self.failed_path)
+            if log_dir and not os.path.exists(log_dir):
+                os.makedirs(log_dir)
+            with open(self.failed_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"id": record["id"], "subject": record["subject"], "body": record["body"],
+                                    "created": record.get("created"), "error": str(error)}, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"[오류] 실패 메일 기록 실패: {e}")
+
+    def _log(self, level, message, trace=None):
+        if self.log_func:
+            self.log_func(level, "Mail", message, trace)
+        else:
+            print(f"[Mail] {message}" + (f" ({trace})" if trace else ""))
+
+    # ---- 종료/상태 ----
+
+    def flush(self, timeout=10):
+        # 보관함이 빌 때까지 기다림 (크래시 리포트처럼 곧 종료되는 경우). 모두 보냈으면 True
+        deadline = time.time() + timeout
+        with self.cond:
+            while self.pending or self.sending:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self.cond.wait(timeout=remaining)
+        return True
+
+    def close(self, timeout=3):
+        # 보내지 못한 메일은 보관함 파일에 남아 다음 실행 때 발송
+        with self.cond:
+            worker, self.worker = self.worker, None
+            self.running = False
+            self.cond.notify_all()
+        if worker is not None:
+            worker.join(timeout=timeout)
+        with self.cond:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def format_summary(self):
+        return (f"[메일] 대기 {len(self.pending):,} / 발송 {self.sent:,} / 재시도 {self.retries:,} / 실패 {self.failed:,} "
+                f"(SMTP 연결 {self.connections:,}회, 분당 한도 {getattr(self, 'rate_per_min', '-')})")
+
+# 프로그램 전역에서 공유하는 메일 보관함
+mail_outbox = MailOutbox()
@@ -0,0 +1,149 @@
+# src/memory_watchdog.py
+import os
+import sys
+import threading
+import tracemalloc
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def get_rss_bytes():
+    # psutil 이 없으면 OS 기본 기능으로 현재 프로세스의 상주 메모리(RSS)를 읽음
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return None
+
+class MemoryWatchdog:
+    """
+    며칠씩 켜두는 방송용 PC에서 메모리 누수를 조기에 발견하기 위한 감시 스레드.
+    일정 간격으로 tracemalloc 스냅샷과 RSS 를 기록해 직전 대비 가장 많이 늘어난 할당 위치를 로그로 남기고,
+    시작 시점 대비 증가량이 기준치를 넘을 때마다 (기준치의 배수 단위로 한 번씩) 경고합니다.
+    """
+    def __init__(self, log_func, notify_func=None, interval=600, alert_mb=300, top_n=10, frames=1, probes=None):
+        self.log_func = log_func          # (level, source, message, trace) -> app_logs
+        self.notify_func = notify_func    # (message) -> 화면 로그
+        self.interval = interval
+        self.alert_bytes = alert_mb * 1024 * 1024
+        self.top_n = top_n
+        self.frames = frames
+        self.probes = probes or {}        # 이름 -> 크기를 돌려주는 함수 (큐 길이, 스레드 수 등)
+
+        self.running = False
+        self.alert_level = 0
+        self.baseline_rss = None
+        self.baseline_traced = None
+        self.previous = None
+        self.thread = None
+
+    def start(self):
+        if self.running:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.running = True
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="memory-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self.stop_event.set()
+        self.thread.join(timeout=5)
+        tracemalloc.stop()
+
+    def _take_snapshot(self):
+        # 감시 코드 자신과 tracemalloc 내부 할당은 결과에서 제외
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def _run(self):
+        self.previous = self._take_snapshot()
+        self.baseline_rss = get_rss_bytes()
+        self.baseline_traced = tracemalloc.get_traced_memory()[0]
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.log_func(8, "MemoryWatchdog", "메모리 점검 실패", str(e))
+
+    def check(self):
+        snapshot = self._take_snapshot()
+        stats = snapshot.compare_to(self.previous, "lineno")
+        self.previous = snapshot
+
+        rss = get_rss_bytes()
+        traced, peak = tracemalloc.get_traced_memory()
+        growth = (rss - self.baseline_rss) if (rss is not None and self.baseline_rss is not None) \
+            else traced - self.baseline_traced
+
+        mb = lambda value: value / 1024 / 1024
+        summary = (f"RSS {mb(rss):.1f}MB" if rss is not None else "RSS 알 수 없음") + \
+            f" | 추적 {mb(traced):.1f}MB (최대 {mb(peak):.1f}MB) | 시작 대비 {mb(growth):+.1f}MB"
+        for name, probe in self.probes.items():
+            try:
+                summary += f" | {name} {probe()}"
+            except Exception:
+                summary += f" | {name} ?"
+
+        growing = [stat for stat in stats if stat.size_diff > 0][:self.top_n]
+        detail = "\n".join(
+            f"{mb(stat.size_diff) * 1024:+.1f}KB ({stat.count_diff:+d}개) 누적 {mb(stat.size) * 1024:.1f}KB  {stat.traceback}"
+            for stat in growing
+        )
+        self.log_func(5, "MemoryWatchdog", summary, detail or None)
+
+        level = int(growth // self.alert_bytes) if self.alert_bytes > 0 else 0
+        if level > self.alert_level:
+            self.alert_level = level
+            message = f"[경고] 메모리 사용량이 시작 대비 {mb(growth):.0f}MB 증가했습니다. ({summary})"
+            self.log_func(9, "MemoryWatchdog", message, detail or None)
+            if self.notify_func:
+                self.notify_func(message)
+        return summary
+
+def create_watchdog_from_env(log_func, notify_func=None, probes=None):
+    # MEMORY_WATCHDOG=1 일 때만 동작 (tracemalloc 은 모든 할당에 비용이 들기 때문)
+    if os.getenv("MEMORY_WATCHDOG", "0") != "1":
+        return None
+    try:
+        watchdog = MemoryWatchdog(
+            log_func, notify_func,
+            interval=float(os.getenv("MEMORY_WATCHDOG_INTERVAL", "600")),
+            alert_mb=float(os.getenv("MEMORY_ALERT_MB", "300")),
+            frames=int(os.getenv("MEMORY_TRACE_FRAMES", "1")),
+            probes=probes,
+        )
+    except ValueError as e:
+        print(f"[오류] 메모리 감시 설정 오류: {e}")
+        return None
+    watchdog.start()
+    print(f"[시스템] 메모리 감시 시작 (간격 {watchdog.interval:g}초, 경고 기준 {watchdog.alert_bytes // 1024 // 1024}MB)")
+    return watchdog
@@ -0,0 +1,197 @@
+# src/metrics.py
+import os
+import time
+import bisect
+import threading
+import functools
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 히스토그램 버킷 상한(초). 고정 버킷이라 관측 한 번은 이진 탐색 + 덧셈뿐
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        idx = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            self.counts[idx] += 1
+            self.total += seconds
+            self.count += 1
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.counts), self.total, self.count, self.max
+
+    def quantile(self, q, snapshot=None):
+        counts, _, count, max_value = snapshot or self.snapshot()
+        if count == 0:
+            return 0.0
+        target = q * count
+        cumulative = 0
+        for idx, c in enumerate(counts):
+            if c == 0:
+                continue
+            if cumulative + c >= target:
+                lower = self.buckets[idx - 1] if idx > 0 else 0.0
+                upper = self.buckets[idx] if idx < len(self.buckets) else max_value
+                # 버킷 안에서는 선형 보간
+                return min(lower + (upper - lower) * (target - cumulative) / c, max_value)
+            cumulative += c
+        return max_value
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def histogram(self, name):
+        hist = self.histograms.get(name)
+        if hist is None:
+            with self.lock:
+                hist = self.histograms.setdefault(name, LatencyHistogram())
+        return hist
+
+    def observe(self, name, seconds):
+        self.histogram(name).observe(seconds)
+
+    def inc(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timer(self, name):
+        return _StageTimer(self.histogram(name))
+
+    def timed(self, name):
+        # 함수 실행 시간을 기록하는 데코레이터
+        def decorator(func):
+            hist = self.histogram(name)
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    hist.observe(time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self.lock:
+            for hist in self.histograms.values():
+                with hist.lock:
+                    hist.reset()
+            self.counters.clear()
+
+    def format_summary(self):
+        lines = [f"{'구간':<28} {'횟수':>8} {'평균':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'최대':>9} (ms)"]
+        for name in sorted(self.histograms):
+            hist = self.histograms[name]
+            snap = hist.snapshot()
+            _, total, count, max_value = snap
+            if count == 0:
+                continue
+            lines.append(
+                f"{name:<28} {count:>8} {total / count * 1000:>9.2f} "
+                f"{hist.quantile(0.5, snap) * 1000:>9.2f} {hist.quantile(0.95, snap) * 1000:>9.2f} "
+                f"{hist.quantile(0.99, snap) * 1000:>9.2f} {max_value * 1000:>9.2f}"
+            )
+        with self.lock:
+            counters = dict(self.counters)
+        if counters:
+            lines.append("")
+            for name in sorted(counters):
+                lines.append(f"{name:<28} {counters[name]:>8}")
+        if len(lines) == 1:
+            return "[알림] 아직 기록된 측정값이 없습니다."
+        return "\n".join(lines)
+
+    def render_prometheus(self):
+        out = ["# HELP wordchain_stage_seconds 단계별 처리 시간", "# TYPE wordchain_stage_seconds histogram"]
+        for name in sorted(self.histograms):
+            hist = self.histograms[name]
+            counts, total, count, _ = hist.snapshot()
+            cumulative = 0
+            for bound, c in zip(hist.buckets, counts):
+                cumulative += c
+                out.append(f'wordchain_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            out.append(f'wordchain_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {count}')
+            out.append(f'wordchain_stage_seconds_sum{{stage="{name}"}} {total}')
+            out.append(f'wordchain_stage_seconds_count{{stage="{name}"}} {count}')
+
+        with self.lock:
+            counters = dict(self.counters)
+        out.append("# HELP wordchain_events_total 이벤트 누적 횟수")
+        out.append("# TYPE wordchain_events_total counter")
+        for name in sorted(counters):
+            out.append(f'wordchain_events_total{{name="{name}"}} {counters[name]}')
+        return "\n".join(out) + "\n"
+
+class _StageTimer:
+    __slots__ = ("hist", "start")
+
+    def __init__(self, hist):
+        self.hist = hist
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.start)
+        return False
+
+# 프로그램 전역에서 공유하는 측정 저장소
+metrics = MetricsRegistry()
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsServer:
+    # 로컬호스트 전용 Prometheus 형식 엔드포인트 (http://127.0.0.1:{port}/metrics)
+    def __init__(self, port, host="127.0.0.1"):
+        self.server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def start_metrics_server_from_env():
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return None
+    try:
+        server = MetricsServer(int(port))
+        print(f"[시스템] 측정 엔드포인트 시작: http://127.0.0.1:{port}/metrics")
+        return server
+    except Exception as e:
+        print(f"[오류] 측정 엔드포인트 시작 실패: {e}")
+        return None
@@ -0,0 +1,126 @@
+# src/monitor_manager.py
+import os
+import asyncio
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from .network import ChzzkMonitor, YouTubeMonitor, HTTP2_AVAILABLE, HTTP_TIMEOUT
+
+def read_source_ids(list_env, single_env):
+    # CHZZK_CHANNEL_IDS="id1,id2" 처럼 쉼표로 나열. 없으면 기존 단일 변수 사용 (없어도 [None] 하나를 돌려 기존 오류 메시지 유지)
+    ids = [value.strip() for value in os.getenv(list_env, "").split(",") if value.strip()]
+    if not ids:
+        ids = [os.getenv(single_env)]
+    return list(dict.fromkeys(ids))
+
+def source_name(platform_name, source_id, total):
+    return platform_name if total == 1 or not source_id else f"{platform_name}({source_id[:6]})"
+
+class MonitorGroup:
+    """
+    같은 플랫폼의 소스 묶음. 사전 점검 다이얼로그에는 기존 단일 모니터처럼 보이도록 check_live_status_sync 를 제공하고,
+    점검에서 방송 중으로 확인된 소스만 실행합니다.
+    """
+    def __init__(self, platform_name, monitors):
+        self.platform_name = platform_name
+        self.monitors = monitors
+        self.live = set()
+
+    def check_live_status_sync(self):
+        if len(self.monitors) == 1:
+            ok, msg = self.monitors[0].check_live_status_sync()
+            self.live = {self.monitors[0].source} if ok else set()
+            return ok, msg
+        with ThreadPoolExecutor(max_workers=min(8, len(self.monitors)), thread_name_prefix="startup-check") as pool:
+            results = list(pool.map(lambda monitor: monitor.check_live_status_sync(), self.monitors))
+        self.live = {monitor.source for monitor, (ok, _) in zip(self.monitors, results) if ok}
+        details = ", ".join(f"{monitor.source} {msg}" for monitor, (ok, msg) in zip(self.monitors, results))
+        return bool(self.live), f"{len(self.live)}/{len(self.monitors)} 방송 중 ({details})"
+
+class MonitorManager:
+    """
+    여러 치지직 채널/유튜브 영상을 한 게임에 연결하는 모니터 관리자.
+    모든 모니터는 기존 qasync 이벤트 루프의 태스크로 실행되며, 치지직은 HTTP 세션 하나를, 유튜브는 크기가 고정된 스레드 풀 하나를 공유합니다.
+    - CHZZK_CHANNEL_IDS / YOUTUBE_VIDEO_IDS : 쉼표로 구분한 목록 (없으면 CHZZK_CHANNEL_ID / YOUTUBE_VIDEO_ID)
+    - YOUTUBE_POLL_WORKERS : 유튜브 영상들이 함께 쓰는 pytchat 호출용 스레드 수 상한 (기본 4)
+      폴링 한 번은 HTTP 요청 시간만큼만 스레드를 쓰고 간격 대기는 이벤트 루프에서 하므로, 영상 수가 스레드 수보다 많아도
+      서로의 대기 시간 뒤에 밀리지 않습니다. 풀이 부족하면 youtube_pool_wait 지표가 늘어납니다.
+    """
+    def __init__(self, signals, recorder=None, ingestion=None):
+        self.signals = signals
+        chzzk_ids = read_source_ids("CHZZK_CHANNEL_IDS", "CHZZK_CHANNEL_ID")
+        youtube_ids = read_source_ids("YOUTUBE_VIDEO_IDS", "YOUTUBE_VIDEO_ID")
+
+        # 채널마다 상태 확인/토큰 요청이 드물게 일어나므로 채널 수에 비례한 연결 수면 충분
+        limit = max(4, 2 * len(chzzk_ids))
+        self.http = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE, timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit, keepalive_expiry=300),
+        )
+        workers = int(os.getenv("YOUTUBE_POLL_WORKERS", "4"))
+        self.executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(youtube_ids))),
+                                           thread_name_prefix="youtube-poll")
+
+        self.chzzk = MonitorGroup("치지직", [
+            ChzzkMonitor(signals, recorder=recorder, ingestion=ingestion, channel_id=channel_id,
+                         source=source_name("치지직", channel_id, len(chzzk_ids)), http=self.http)
+            for channel_id in chzzk_ids
+        ])
+        self.youtube = MonitorGroup("유튜브", [
+            YouTubeMonitor(signals, recorder=recorder, ingestion=ingestion, video_id=video_id,
+                           source=source_name("유튜브", video_id, len(youtube_ids)), executor=self.executor)
+            for video_id in youtube_ids
+        ])
+        self.tasks = {}
+
+    @property
+    def monitors(self):
+        return self.chzzk.monitors + self.youtube.monitors
+
+    def start(self, use_chzzk, use_youtube):
+        # 사전 점검을 통과한 소스만 태스크로 실행하고 {소스 이름: SourceStats} 를 돌려줌 (GUI 의 platform_status)
+        loop = asyncio.get_event_loop()
+        status = {}
+        for group, enabled in ((self.chzzk, use_chzzk), (self.youtube, use_youtube)):
+            if not enabled:
+                continue
+            for monitor in group.monitors:
+                if monitor.source not in group.live or monitor.source in self.tasks:
+                    continue
+                self.tasks[monitor.source] = loop.create_task(self._run_monitor(monitor))
+                status[monitor.source] = monitor.stats
+        return status
+
+    async def _run_monitor(self, monitor):
+        # 한 소스의 예기치 못한 오류가 다른 소스에 영향을 주지 않도록 격리
+        try:
+            await monitor.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            source_tag = "Chzzk" if isinstance(monitor, ChzzkMonitor) else "YouTube"
+            self.signals.log_request.emit(9, source_tag, f"모니터 비정상 종료 ({monitor.source})", traceback.format_exc())
+            self.signals.gui_log_message.emit(f"[오류] {monitor.source} 모니터 중단: {e}")
+            self.signals.stream_offline.emit(monitor.source)
+        finally:
+            self.tasks.pop(monitor.source, None)
+
+    def stop(self):
+        for monitor in self.monitors:
+            monitor.stop()
+        self.executor.shutdown(wait=False)
+        try:
+            asyncio.get_event_loop().create_task(self.http.aclose())
+        except RuntimeError:
+            pass
+
+    def format_summary(self):
+        stats = [monitor.stats for monitor in self.monitors if monitor.source in self.tasks]
+        if not stats:
+            return "[알림] 실행 중인 방송 소스가 없습니다."
+        online = sum(1 for s in stats if s.online)
+        lines = [f"[소스] {online}/{len(stats)}개 연결됨"]
+        lines.extend("  " + s.format_line() for s in stats)
+        return "\n".join(lines)
@@ -1,40 +1,180 @@
 # src/network.py
 import os
 import json
-import requests
-import websockets
+import time
+import httpx
 import traceback
+import random
 import asyncio
-from functools import partial
-from .signals import GameSignals
+import functools
+from .utils import extract_guess
+from .metrics import metrics
+from .tracing import tracer
+from .chzzk_decoder import decode_frame, parse_nickname, CHAT_CMD
+
+# 채팅 서버 접속(cmd 100)에 대한 응답
+CONNECTED_CMD = 10100
+# 이 시간 이상 유지된 연결이 끊기면 재접속 백오프를 처음부터 다시 시작
+RECONNECT_STABLE_SECONDS = 30
 
 try:
-    import pytchat
+    import h2  # noqa: F401 (httpx 의 HTTP/2 지원에 필요)
+    HTTP2_AVAILABLE = True
 except ImportError:
-    pytchat = None
-    print("[경고] pytchat 라이브러리가 설치되지 않았습니다. 유튜브 연동이 불가능합니다.")
+    HTTP2_AVAILABLE = False
+
+HTTP_TIMEOUT = httpx.Timeout(5.0, connect=3.0)
+HTTP_LIMITS = httpx.Limits(max_connections=4, max_keepalive_connections=4, keepalive_expiry=300)
+LIVE_STATUS_URL = "https://api.chzzk.naver.com/polling/v2/channels/{channel_id}/live-status"
+CHAT_SERVER_URL = "wss://kr-ss{server_id}.chat.naver.com/chat"
+CHAT_SERVER_COUNT = 9
+
+def chat_endpoint_candidates(chat_channel_id):
+    # CHZZK_CHAT_ENDPOINTS 가 있으면 그 목록, 없으면 공식 웹 클라이언트가 고르는 서버(채널 ID 글자 코드 합 % 9 + 1)를 앞에 두고 나머지 노드
+    configured = [url.strip() for url in os.getenv("CHZZK_CHAT_ENDPOINTS", "").split(",") if url.strip()]
+    if configured:
+        return configured
+    preferred = sum(ord(c) for c in chat_channel_id) % CHAT_SERVER_COUNT + 1
+    return [CHAT_SERVER_URL.format(server_id=server_id)
+            for server_id in [preferred] + [n for n in range(1, CHAT_SERVER_COUNT + 1) if n != preferred]]
+
+def endpoint_host(url):
+    return url.split("//", 1)[-1].split("/", 1)[0].split(".", 1)[0]
+
+# 유튜브 채팅 폴링 간격 범위(초)
+YOUTUBE_MIN_INTERVAL = float(os.getenv("YOUTUBE_MIN_INTERVAL", 0.2))
+YOUTUBE_MAX_INTERVAL = float(os.getenv("YOUTUBE_MAX_INTERVAL", 3.0))
+
+_pytchat = None
+
+def load_pytchat():
+    # pytchat 은 불러오는 데 시간이 걸리므로 유튜브 소스를 실제로 점검/실행할 때 처음 한 번만 import (없으면 None)
+    global _pytchat
+    if _pytchat is None:
+        try:
+            import pytchat
+            _pytchat = pytchat
+        except ImportError:
+            _pytchat = False
+            print("[경고] pytchat 라이브러리가 설치되지 않았습니다. 유튜브 연동이 불가능합니다.")
+    return _pytchat or None
+
+def dispatch_guess(signals, ingestion, platform, nickname, guess, trace):
+    # 수집 큐가 있으면 묶음 전달, 없으면 기존처럼 시그널로 바로 전달
+    if ingestion is not None:
+        ingestion.submit(platform, nickname, guess, trace)
+        return
+    with metrics.timer("word_detected_dispatch"):
+        signals.word_detected.emit(platform, nickname, guess, trace)
+
+class SourceStats:
+    # 소스(채널/영상) 하나의 연결 이력과 처리량. 이벤트 루프 스레드에서만 갱신
+    def __init__(self, source, platform_name):
+        self.source = source
+        self.platform_name = platform_name
+        self.online = False          # GUI 가 stream_connected/offline 시그널로 관리하는 게임 기준 연결 상태
+        self.sessions = 0
+        self.disconnects = 0
+        self.connected_since = None
+        self.messages = 0
+        self.guesses = 0
+        self.last_message = None
+        self.endpoint = None             # (서버 이름, 핸드셰이크 ms)
+        self.outages = 0
+        self.last_outage = None
+        self.max_outage = 0.0
+        self.started = time.time()
+
+    def on_connected(self):
+        self.sessions += 1
+        self.connected_since = time.time()
+
+    def on_disconnected(self):
+        if self.connected_since is not None:
+            self.disconnects += 1
+            self.connected_since = None
+
+    def on_outage(self, seconds):
+        # 연결이 끊긴 뒤 다시 붙기까지 걸린 시간
+        self.outages += 1
+        self.last_outage = seconds
+        self.max_outage = max(self.max_outage, seconds)
+
+    def on_messages(self, count, guesses=0):
+        if count:
+            self.messages += count
+            self.guesses += guesses
+            self.last_message = time.time()
+
+    def format_line(self):
+        now = time.time()
+        minutes = max((now - self.started) / 60, 1 / 60)
+        state = "연결됨" if self.online else "끊김"
+        if self.connected_since is not None:
+            state += f" {int(now - self.connected_since)}초째"
+        idle = f"{now - self.last_message:.0f}초 전" if self.last_message else "없음"
+        if self.endpoint:
+            state += f" [{self.endpoint[0]} {self.endpoint[1]:.0f}ms]"
+        return (f"{self.source:<16} {state} | 세션 {self.sessions}회, 끊김 {self.disconnects}회 | "
+                f"채팅 {self.messages:,} ({self.messages / minutes:.1f}/분), 정답 후보 {self.guesses:,} | 마지막 채팅 {idle}"
+                + (f" | 재접속 {self.outages}회 (최근 {self.last_outage:.2f}초, 최대 {self.max_outage:.2f}초)" if self.outages else ""))
 
 class ChzzkMonitor:
-    def __init__(self, signals: GameSignals):
+    def __init__(self, signals, recorder=None, ingestion=None, channel_id=None, source=None, http=None):
         self.platform_name = "치지직"
-        self.channel_id = os.getenv("CHZZK_CHANNEL_ID")
-        self.ws_url = "wss://kr-ss1.chat.naver.com/chat"
+        self.channel_id = channel_id or os.getenv("CHZZK_CHANNEL_ID")
+        # 여러 채널을 함께 돌릴 때 로그/상태에 쓰는 소스 이름 (단일 채널이면 플랫폼 이름과 같음)
+        self.source = source or self.platform_name
+        self.stats = SourceStats(self.source, self.platform_name)
+        # 현재 접속 중인 채팅 서버와 지연 측정 결과 (chatChannelId 별로 한 번 측정, 세션 중 백그라운드로 갱신)
+        self.ws_url = None
+        self.endpoint_ranking = None      # {"channel": chatChannelId, "urls": [빠른 순], "rtts": {url: 초 또는 None}, "at": 측정 시각}
+        self.probe_timeout = float(os.getenv("CHZZK_PROBE_TIMEOUT", 2))
+        self.probe_ttl = float(os.getenv("CHZZK_PROBE_TTL", 600))
         self.signals = signals
+        self.recorder = recorder
+        self.ingestion = ingestion
         self.running = True
+        # 상태 확인/토큰 발급에 재사용하는 HTTP 세션 (keep-alive, 가능하면 HTTP/2)
+        # MonitorManager 가 넘겨준 공유 세션은 여기서 닫지 않음
+        self.http = http
+        self.owns_http = http is None
+
+        # 재접속 지연을 줄이기 위한 캐시/설정
+        self.chat_channel_id = None
+        self.prefetched_token = None       # (토큰, 받은 시각)
+        self.token_refresh = float(os.getenv("CHZZK_TOKEN_REFRESH", 300))
+        self.token_max_age = float(os.getenv("CHZZK_TOKEN_MAX_AGE", 900))
+        self.reconnect_min = float(os.getenv("CHZZK_RECONNECT_MIN", 0.5))
+        self.reconnect_max = float(os.getenv("CHZZK_RECONNECT_MAX", 30))
+        self.ping_interval = float(os.getenv("CHZZK_PING_INTERVAL", 20))
+        self.reconnect_attempts = 0
+        self.outage_started = None
 
     # [신규] 외부에서 루프 종료 요청
     def stop(self):
         self.running = False
 
+    def _get_http(self):
+        if self.owns_http and (self.http is None or self.http.is_closed):
+            self.http = httpx.AsyncClient(http2=HTTP2_AVAILABLE, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+        return self.http
+
     async def _async_get(self, url):
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, partial(requests.get, url, timeout=5))
+        with metrics.timer("chzzk_http_get"):
+            return await self._get_http().get(url)
+
+    async def close_http(self):
+        if self.owns_http and self.http is not None:
+            await self.http.aclose()
+            self.http = None
 
     def check_live_status_sync(self):
         if not self.channel_id: return False, "Channel ID 누락"
         try:
-            status_url = f"https://api.chzzk.naver.com/polling/v2/channels/{self.channel_id}/live-status"
-            res = requests.get(status_url, timeout=5)
+            status_url = LIVE_STATUS_URL.format(channel_id=self.channel_id)
+            with httpx.Client(http2=HTTP2_AVAILABLE, timeout=HTTP_TIMEOUT) as client:
+                res = client.get(status_url)
             if res.status_code != 200: return False, f"API 오류 ({res.status_code})"
             data = res.json()
             content = data.get('content', {})
@@ -47,77 +187,262 @@ class ChzzkMonitor:
             self.signals.log_request.emit(10, "Chzzk", "환경변수 누락", None)
             return
         
+        try:
+            await self._run_loop()
+        finally:
+            await self.close_http()
+
+    async def _fetch_live_content(self):
+        res_obj = await self._async_get(LIVE_STATUS_URL.format(channel_id=self.channel_id))
+        return res_obj.json().get('content') or {}
+
+    async def _fetch_token(self, chat_channel_id):
+        token_url = f"https://comm-api.game.naver.com/nng_main/v1/chats/access-token?channelId={chat_channel_id}&chatType=STREAMING"
+        token_res_obj = await self._async_get(token_url)
+        return token_res_obj.json()['content']['accessToken']
+
+    async def _take_token(self, chat_channel_id):
+        # 미리 받아 둔 토큰이 있고 오래되지 않았으면 바로 사용 (한 번 쓴 토큰은 버림)
+        token, fetched_at = self.prefetched_token or (None, 0)
+        self.prefetched_token = None
+        if token and time.time() - fetched_at < self.token_max_age:
+            metrics.inc("chzzk_token_prefetch_hits")
+            return token
+        return await self._fetch_token(chat_channel_id)
+
+    async def _session_helper(self, websocket, chat_channel_id, from_cache):
+        # 연결 직후 백그라운드에서: (캐시로 접속했다면) 방송 상태 재확인 + 다음 재접속용 토큰을 미리 받아 두고 주기적으로 갱신
+        try:
+            content = await self._fetch_live_content() if from_cache else None
+            if content is not None and (content.get('status') != 'OPEN' or content.get('chatChannelId') != chat_channel_id):
+                # 캐시한 채팅 채널이 더 이상 유효하지 않으면 캐시를 비우고 연결을 끊어 처음부터 다시 확인
+                self.chat_channel_id = None
+                self.prefetched_token = None
+                await websocket.close()
+                return
+            while self.running:
+                try:
+                    self.prefetched_token = (await self._fetch_token(chat_channel_id), time.time())
+                except Exception as e:
+                    print(f"[Chzzk Warning] 토큰 미리 받기 실패: {e}")
+                ranking = self.endpoint_ranking
+                if ranking and ranking["channel"] == chat_channel_id and time.time() - ranking["at"] >= self.probe_ttl:
+                    # 오래된 지연 측정은 연결을 유지한 채로 갱신해 다음 재접속에 반영
+                    await self._rank_endpoints(chat_channel_id)
+                await asyncio.sleep(min(self.token_refresh, self.probe_ttl))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[Chzzk Warning] 방송 상태 재확인 실패: {e}")
+
+    async def _probe_endpoint(self, url):
+        # 웹소켓 핸드셰이크(TCP+TLS+업그레이드)까지 걸린 시간. 실패하면 None
+        import websockets  # 치지직을 쓸 때만 불러옴 (import 시간이 측정에 섞이지 않도록 시작 전에)
+        start = time.perf_counter()
+        try:
+            websocket = await asyncio.wait_for(websockets.connect(url, ping_interval=None, close_timeout=1), timeout=self.probe_timeout)
+        except Exception:
+            return None
+        rtt = time.perf_counter() - start
+        try: await websocket.close()
+        except Exception: pass
+        return rtt
+
+    async def _rank_endpoints(self, chat_channel_id):
+        urls = chat_endpoint_candidates(chat_channel_id)
+        rtts = dict(zip(urls, await asyncio.gather(*(self._probe_endpoint(url) for url in urls))))
+        ranked = sorted(urls, key=lambda url: (rtts[url] is None, rtts[url] or 0))
+        self.endpoint_ranking = {"channel": chat_channel_id, "urls": ranked, "rtts": rtts, "at": time.time()}
+        for url in ranked:
+            if rtts[url] is not None:
+                metrics.observe("chzzk_endpoint_probe", rtts[url])
+        summary = ", ".join(f"{endpoint_host(url)} {rtts[url] * 1000:.0f}ms" if rtts[url] is not None else f"{endpoint_host(url)} 실패"
+                            for url in ranked)
+        self.signals.log_request.emit(1, "Chzzk", "채팅 서버 지연 측정", f"{self.source}: {summary}")
+        return ranked
+
+    def _demote_endpoint(self, url):
+        # 오류/타임아웃이 난 서버는 다음 재접속에서 마지막 순서로
+        ranking = self.endpoint_ranking
+        if ranking and url in ranking["urls"] and len(ranking["urls"]) > 1:
+            ranking["urls"].remove(url)
+            ranking["urls"].append(url)
+
+    async def _connect_fastest(self, chat_channel_id):
+        import websockets
+        ranking = self.endpoint_ranking
+        urls = ranking["urls"] if ranking and ranking["channel"] == chat_channel_id else await self._rank_endpoints(chat_channel_id)
+        last_error = None
+        for url in list(urls):
+            start = time.perf_counter()
+            try:
+                # 프로토콜 ping 으로 죽은 연결을 ping_interval + ping_timeout 안에 감지 (WS_TIMEOUT 은 최후의 안전장치)
+                websocket = await asyncio.wait_for(
+                    websockets.connect(url, ping_interval=self.ping_interval, ping_timeout=self.ping_interval, close_timeout=1),
+                    timeout=self.probe_timeout * 2)
+            except Exception as e:
+                last_error = e
+                metrics.inc("chzzk_endpoint_failover")
+                self._demote_endpoint(url)
+                self.signals.gui_log_message.emit(f"[{self.source}] 채팅 서버 {endpoint_host(url)} 접속 실패. 다음 서버로 전환...")
+                continue
+            rtt = time.perf_counter() - start
+            if url != self.ws_url:
+                self.signals.log_request.emit(1, "Chzzk", f"채팅 서버 선택: {endpoint_host(url)} ({rtt * 1000:.0f}ms)",
+                                              None if self.source == self.platform_name else self.source)
+            self.ws_url = url
+            self.stats.endpoint = (endpoint_host(url), rtt * 1000)
+            return websocket
+        raise last_error or ConnectionError("채팅 서버 후보 없음")
+
+    def _next_backoff(self):
+        # 지수 백오프 + 지터: 0.5초 전후에서 시작해 최대 RECONNECT_MAX 초까지
+        delay = min(self.reconnect_max, self.reconnect_min * (2 ** self.reconnect_attempts))
+        self.reconnect_attempts += 1
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _sleep(self, seconds):
+        # stop 요청에 빨리 반응하도록 잘게 나눠서 대기
+        deadline = time.monotonic() + seconds
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: break
+            await asyncio.sleep(min(remaining, 0.5))
+
+    def _record_reconnect(self):
+        if self.outage_started is None:
+            return
+        outage = time.time() - self.outage_started
+        self.outage_started = None
+        metrics.observe("chzzk_reconnect", outage)
+        self.stats.on_outage(outage)
+        self.signals.log_request.emit(1, "Chzzk", f"재접속 완료 ({outage:.2f}초)", None if self.source == self.platform_name else self.source)
+        self.signals.gui_log_message.emit(f"[{self.source}] 재접속 완료 ({outage:.2f}초 끊김)")
+
+    async def _run_loop(self):
+        TIMEOUT_SECONDS = float(os.getenv("WS_TIMEOUT", 600.0))
         # running 플래그가 True일 때만 루프 실행
         while self.running:
+            connected_at = None
             try:
-                status_url = f"https://api.chzzk.naver.com/polling/v2/channels/{self.channel_id}/live-status"
-                res_obj = await self._async_get(status_url)
-                res = res_obj.json()
-                content = res.get('content', {})
-                live_status = content.get('status')
-                
-                if live_status != 'OPEN':
-                    self.signals.gui_log_message.emit(f"[{self.platform_name}] 방송 종료 감지. 10초 후 재접속 시도...")
-                    self.signals.stream_offline.emit(self.platform_name)
-                    for _ in range(10): # 1초씩 10번 대기 (stop 반응성 향상)
-                        if not self.running: break
-                        await asyncio.sleep(1)
-                    continue
+                # 방송 중인 동안은 chatChannelId 를 캐시해서 재접속 시 상태 조회를 건너뜀
+                from_cache = self.chat_channel_id is not None
+                if not from_cache:
+                    content = await self._fetch_live_content()
+                    live_status = content.get('status')
+
+                    if live_status != 'OPEN':
+                        self.signals.gui_log_message.emit(f"[{self.source}] 방송 종료 감지. 10초 후 재접속 시도...")
+                        self.signals.stream_offline.emit(self.source)
+                        # 방송 자체가 꺼진 동안은 끊김 시간으로 집계하지 않음
+                        self.outage_started = None
+                        self.reconnect_attempts = 0
+                        await self._sleep(10)
+                        continue
+                    self.chat_channel_id = content['chatChannelId']
 
-                chat_channel_id = content['chatChannelId']
-                token_url = f"https://comm-api.game.naver.com/nng_main/v1/chats/access-token?channelId={chat_channel_id}&chatType=STREAMING"
-                token_res_obj = await self._async_get(token_url)
-                token_res = token_res_obj.json()
-                access_token = token_res['content']['accessToken']
-                TIMEOUT_SECONDS = float(os.getenv("WS_TIMEOUT", 600.0))
+                chat_channel_id = self.chat_channel_id
+                access_token = await self._take_token(chat_channel_id)
 
-                async with websockets.connect(self.ws_url, ping_interval=None) as websocket:
-                    self.signals.log_request.emit(1, "Chzzk", "채팅 서버 연결 성공", None)
-                    self.signals.stream_connected.emit(self.platform_name)
+                websocket = await self._connect_fastest(chat_channel_id)
+                try:
+                    connected_at = time.time()
+                    self.signals.log_request.emit(1, "Chzzk", "채팅 서버 연결 성공", None if self.source == self.platform_name else self.source)
+                    self.signals.stream_connected.emit(self.source)
+                    self.stats.on_connected()
+                    self._record_reconnect()
                     
                     await websocket.send(json.dumps({
                         "ver": "2", "cmd": 100, "svcid": "game", "cid": chat_channel_id, "tid": 1,
                         "bdy": {"uid": None, "devType": 2001, "accTkn": access_token, "auth": "READ"}
                     }))
+                    helper = asyncio.ensure_future(self._session_helper(websocket, chat_channel_id, from_cache))
 
-                    while self.running:
-                        try:
-                            res = await asyncio.wait_for(websocket.recv(), timeout=TIMEOUT_SECONDS)
-                            data = json.loads(res)
-                            cmd = data.get('cmd')
-                            if cmd == 93101:
-                                for chat in data.get('bdy', []):
-                                    msg = chat.get('msg', '').strip()
-                                    profile = json.loads(chat.get('profile', '{}'))
-                                    nickname = profile.get('nickname', '익명')
-                                    if "클린봇" in msg: continue 
-                                    if msg.startswith("!"):
-                                        content = msg[1:].strip()
-                                        if content:
-                                            self.signals.word_detected.emit(self.platform_name, nickname, content.split()[0])
-                            elif cmd == 0:
-                                await websocket.send(json.dumps({"ver": "2", "cmd": 10000}))
-                        except asyncio.TimeoutError:
-                            self.signals.gui_log_message.emit(f"[{self.platform_name}] 응답 없음(Zombie). 재접속 시도...")
-                            break 
-                        except Exception: break 
+                    last_frame_at = None
+                    try:
+                        while self.running:
+                            try:
+                                res = await asyncio.wait_for(websocket.recv(), timeout=TIMEOUT_SECONDS)
+                                # chzzk_ws_gap: 프레임 사이 간격(대기 시간), chzzk_frame_handle: 프레임을 받은 뒤 해석/전달에 걸린 시간 (네트워크 대기 제외)
+                                arrived = time.perf_counter()
+                                if last_frame_at is not None:
+                                    metrics.observe("chzzk_ws_gap", arrived - last_frame_at)
+                                last_frame_at = arrived
+                                with metrics.timer("chzzk_frame_handle"):
+                                    # 채팅 기록 중이 아니면 '!' 채팅이 없는 프레임은 해석 없이 건너뜀
+                                    cmd, data = decode_frame(res, keep_all=self.recorder is not None)
+                                    metrics.observe("chzzk_json_decode", time.perf_counter() - arrived)
+                                    if cmd == CHAT_CMD:
+                                        if data is None:
+                                            metrics.inc("chzzk_frames_skipped")
+                                            self.stats.on_messages(res.count('"msgTime"'))
+                                            continue
+                                        chats = data.get('bdy', [])
+                                        guesses = 0
+                                        for chat in chats:
+                                            msg = (chat.get('msg') or '').strip()
+                                            guess = extract_guess(msg)
+                                            if not guess and not self.recorder: continue
+                                            nickname = parse_nickname(chat.get('profile'))
+                                            if self.recorder:
+                                                self.recorder.record(self.platform_name, nickname, msg, chat.get('msgTime'))
+                                            if "클린봇" in msg: continue 
+                                            if guess:
+                                                guesses += 1
+                                                trace = tracer.new_trace(self.platform_name, chat.get('msgTime'))
+                                                dispatch_guess(self.signals, self.ingestion, self.platform_name, nickname, guess, trace)
+                                        self.stats.on_messages(len(chats), guesses)
+                                    elif cmd == CONNECTED_CMD and data.get('retCode') not in (None, 0):
+                                        # 토큰이 거절되면 캐시를 비우고 새로 받아서 재접속
+                                        self.signals.log_request.emit(8, "Chzzk", "채팅 서버 인증 실패", str(data.get('retMsg')))
+                                        self.chat_channel_id = None
+                                        self.prefetched_token = None
+                                        break
+                                if cmd == 0:
+                                    # 서버 ping 응답은 전송 대기가 섞이지 않도록 측정 구간 밖에서 보냄
+                                    await websocket.send(json.dumps({"ver": "2", "cmd": 10000}))
+                            except asyncio.TimeoutError:
+                                self.signals.gui_log_message.emit(f"[{self.source}] 응답 없음(Zombie). 재접속 시도...")
+                                self._demote_endpoint(self.ws_url)
+                                break 
+                            except Exception:
+                                self._demote_endpoint(self.ws_url)
+                                break 
+                    finally:
+                        helper.cancel()
+                finally:
+                    await websocket.close()
             except Exception as e:
                 self.signals.log_request.emit(9, "Chzzk", "접속 오류", str(e))
-                self.signals.gui_log_message.emit(f"[{self.platform_name}] 접속 오류. 10초 후 재시도...")
-                self.signals.stream_offline.emit(self.platform_name)
-                for _ in range(10):
-                    if not self.running: break
-                    await asyncio.sleep(1)
-                continue
-            
-            if self.running: await asyncio.sleep(3)
+                self.signals.gui_log_message.emit(f"[{self.source}] 접속 오류. 재접속 시도...")
+                self.signals.stream_offline.emit(self.source)
+                # 상태 조회/토큰/접속 중 어디서 실패했는지 모르므로 캐시를 비우고 처음부터 확인
+                self.chat_channel_id = None
+                self.prefetched_token = None
+
+            self.stats.on_disconnected()
+            if not self.running:
+                break
+            if self.outage_started is None:
+                self.outage_started = time.time()
+            # 충분히 오래 유지된 연결이 끊긴 경우에는 백오프를 처음(1초 미만)부터 다시 시작
+            if connected_at is not None and time.time() - connected_at >= RECONNECT_STABLE_SECONDS:
+                self.reconnect_attempts = 0
+            await self._sleep(self._next_backoff())
 
 
 class YouTubeMonitor:
-    def __init__(self, signals: GameSignals):
+    def __init__(self, signals, recorder=None, ingestion=None, video_id=None, source=None, executor=None):
         self.platform_name = "유튜브"
-        self.video_id = os.getenv("YOUTUBE_VIDEO_ID")
+        self.video_id = video_id or os.getenv("YOUTUBE_VIDEO_ID")
+        self.source = source or self.platform_name
+        self.stats = SourceStats(self.source, self.platform_name)
         self.signals = signals
+        self.recorder = recorder
+        self.ingestion = ingestion
+        # pytchat 의 blocking 호출을 실행할 스레드 풀 (None 이면 이벤트 루프 기본 풀)
+        # 영상이 여러 개여도 소스마다 스레드를 두지 않고 MonitorManager 의 공유 풀을 사용
+        self.executor = executor
         self.running = True
 
     # [신규] 외부 종료 요청
@@ -125,6 +450,7 @@ class YouTubeMonitor:
         self.running = False
 
     def check_live_status_sync(self):
+        pytchat = load_pytchat()
         if not pytchat: return False, "모듈 미설치"
         if not self.video_id: return False, "Video ID 누락"
         try:
@@ -136,7 +462,7 @@ class YouTubeMonitor:
         except Exception as e: return False, f"오류: {str(e)}"
 
     async def run(self):
-        if not pytchat:
+        if not load_pytchat():
             self.signals.gui_log_message.emit("[오류] pytchat 모듈 미설치로 유튜브 기능 비활성화")
             return
         if not self.video_id:
@@ -144,52 +470,100 @@ class YouTubeMonitor:
             return
 
         while self.running:
-            try:
-                chat = pytchat.create(video_id=self.video_id, interruptable=False)
-                if not chat.is_alive():
-                    self.signals.gui_log_message.emit(f"[{self.platform_name}] 방송을 찾을 수 없음. 10초 후 재시도...")
-                    self.signals.stream_offline.emit(self.platform_name)
-                    for _ in range(10):
-                        if not self.running: break
-                        await asyncio.sleep(1)
-                    continue
+            reason = await self._poll_session()
 
-                self.signals.stream_connected.emit(self.platform_name)
-                self.signals.log_request.emit(1, "YouTube", f"채팅 리스너 시작 ({self.video_id})", None)
+            if reason == "not_found":
+                self.signals.gui_log_message.emit(f"[{self.source}] 방송을 찾을 수 없음. 10초 후 재시도...")
+                self.signals.stream_offline.emit(self.source)
+            elif reason == "dead":
+                self.signals.gui_log_message.emit(f"[{self.source}] 라이브러리 연결 상태: Dead")
+                self.signals.gui_log_message.emit(f"[{self.source}] 연결 끊김. 10초 후 재접속...")
+                self.signals.stream_offline.emit(self.source)
+            elif isinstance(reason, Exception):
+                self.signals.log_request.emit(9, "YouTube", "접속 오류", str(reason))
+                self.signals.gui_log_message.emit(f"[{self.source}] 오류 발생({reason}). 10초 후 재시도...")
+                self.signals.stream_offline.emit(self.source)
 
-                while self.running:
-                    if not chat.is_alive():
-                        self.signals.gui_log_message.emit(f"[{self.platform_name}] 라이브러리 연결 상태: Dead")
-                        break 
-                    try:
-                        data = chat.get()
-                        items = data.sync_items()
-                        for c in items:
-                            msg = c.message.strip()
-                            nickname = c.author.name
-                            if msg.startswith("!"):
-                                content = msg[1:].strip()
-                                if content:
-                                    self.signals.word_detected.emit(self.platform_name, nickname, content.split()[0])
-                        await asyncio.sleep(0.2)
-                    except Exception as e:
-                        print(f"[YouTube Warning] 데이터 읽기 중 경미한 오류: {e}")
-                        await asyncio.sleep(1)
-                        continue
+            for _ in range(10):
+                if not self.running: break
+                await asyncio.sleep(1)
+
+    async def _blocking(self, func, *args):
+        # 공유 풀이 모자라 다른 영상의 폴링 뒤에서 기다린 시간을 youtube_pool_wait 로 기록
+        submitted = time.perf_counter()
+        def run():
+            metrics.observe("youtube_pool_wait", time.perf_counter() - submitted)
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, run)
+
+    async def _poll_session(self):
+        # pytchat 은 blocking HTTP 를 사용하므로 호출만 스레드 풀에서 하고, 폴링 간격 대기는 이벤트 루프에서 처리
+        # 반환값: None(정상 종료) / "not_found" / "dead" / Exception
+        try:
+            chat = await self._blocking(functools.partial(load_pytchat().create, video_id=self.video_id, interruptable=False))
+        except Exception as e:
+            return e
+        try:
+            if not await self._blocking(chat.is_alive):
+                return "not_found"
+            self.signals.stream_connected.emit(self.source)
+            self.signals.log_request.emit(1, "YouTube", f"채팅 리스너 시작 ({self.video_id})", None)
+            self.stats.on_connected()
 
-                self.signals.gui_log_message.emit(f"[{self.platform_name}] 연결 끊김. 10초 후 재접속...")
-                self.signals.stream_offline.emit(self.platform_name)
-                try: chat.terminate()
-                except: pass
-                
-                for _ in range(10):
-                    if not self.running: break
+            interval = YOUTUBE_MIN_INTERVAL
+            while self.running:
+                try:
+                    chats = await self._blocking(self._fetch, chat)
+                except Exception as e:
+                    print(f"[YouTube Warning] 데이터 읽기 중 경미한 오류: {e}")
                     await asyncio.sleep(1)
+                    continue
+                if chats is None:
+                    return "dead"
 
-            except Exception as e:
-                self.signals.log_request.emit(9, "YouTube", "접속 오류", str(e))
-                self.signals.gui_log_message.emit(f"[{self.platform_name}] 오류 발생({e}). 10초 후 재시도...")
-                self.signals.stream_offline.emit(self.platform_name)
-                for _ in range(10):
-                    if not self.running: break
-                    await asyncio.sleep(1)
\ No newline at end of file
+                guesses = 0
+                for nickname, msg, timestamp, guess, trace in chats:
+                    if self.recorder:
+                        self.recorder.record(self.platform_name, nickname, msg, timestamp)
+                    if guess:
+                        guesses += 1
+                        dispatch_guess(self.signals, self.ingestion, self.platform_name, nickname, guess, trace)
+                self.stats.on_messages(len(chats), guesses)
+
+                if chats:
+                    # 채팅이 몰릴 때는 간격을 줄이고, 조용할 때는 점점 늘려서 불필요한 요청을 줄임
+                    interval = max(YOUTUBE_MIN_INTERVAL, interval / 2)
+                else:
+                    metrics.inc("youtube_empty_polls")
+                    interval = min(YOUTUBE_MAX_INTERVAL, interval * 1.5)
+                metrics.observe("youtube_poll_interval", interval)
+                await asyncio.sleep(interval)
+            return None
+        except Exception as e:
+            return e
+        finally:
+            self.stats.on_disconnected()
+            try: chat.terminate()
+            except: pass
+
+    def _fetch(self, chat):
+        # 스레드 풀에서 실행. 방송이 끝났으면 None
+        if not chat.is_alive():
+            return None
+        poll_start = time.perf_counter()
+        # sync_items() 는 항목 사이에 sleep 을 넣어 호출마다 1초 이상 걸리므로, 받은 목록(items)을 바로 사용
+        # (간격 조절은 _poll_session 의 YOUTUBE_MIN_INTERVAL/MAX_INTERVAL 이 담당)
+        items = chat.get().items
+        metrics.observe("youtube_poll", time.perf_counter() - poll_start)
+
+        chats = []
+        for c in items:
+            msg = c.message.strip()
+            timestamp = getattr(c, 'timestamp', None)
+            guess = extract_guess(msg)
+            # 정답 후보는 폴링 결과를 받은 시점부터 지연 추적
+            trace = tracer.new_trace(self.platform_name, timestamp) if guess else None
+            chats.append((c.author.name, msg, timestamp, guess, trace))
+        metrics.inc("youtube_polls")
+        metrics.inc("youtube_poll_items", len(chats))
+        return chats
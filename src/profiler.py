@@ -0,0 +1,158 @@
+# src/profiler.py
+import os
+import io
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from datetime import datetime
+
+PROFILE_DIR = "logs"
+SAMPLE_INTERVAL = 0.005  # 샘플링 간격(초)
+TOP_N = 15
+
+class CPUProfiler:
+    """
+    방송 중에도 게임을 멈추지 않고 CPU 사용 구간을 측정합니다.
+    - sample  : 별도 스레드가 모든 스레드의 스택을 주기적으로 수집 (부하 낮음, 기존 스레드 포함)
+    - cprofile: 메인 스레드와 측정 중에 새로 시작된 스레드의 모든 함수 호출을 기록 (정확하지만 부하 큼)
+    start/stop 은 cProfile 특성상 메인(GUI) 스레드에서 호출해야 합니다.
+    Python 3.12 이상은 cProfile 이 sys.monitoring 을 써서 프로파일러를 하나만 켤 수 있으므로 cprofile 모드를 막고 sample 모드만 지원합니다.
+    """
+    MODES = ("sample", "cprofile")
+
+    def __init__(self):
+        self.mode = None
+        self.started_at = None
+        self.session_id = 0
+
+    @property
+    def running(self):
+        return self.mode is not None
+
+    def start(self, mode="sample"):
+        if self.running:
+            raise RuntimeError("이미 프로파일링 중입니다.")
+        if mode not in self.MODES:
+            raise ValueError(f"알 수 없는 모드: {mode} (sample 또는 cprofile)")
+        if mode == "cprofile" and sys.version_info >= (3, 12):
+            raise RuntimeError("Python 3.12 이상에서는 cprofile 모드를 쓸 수 없습니다. sample 모드를 사용하세요.")
+
+        self.session_id += 1
+        self.started_at = time.time()
+        self.mode = mode
+        if mode == "sample":
+            self._stacks = Counter()
+            self._sample_count = 0
+            self._stop_event = threading.Event()
+            self._sampler = threading.Thread(target=self._sample_loop, name="cpu-profiler", daemon=True)
+            self._sampler.start()
+        else:
+            self._thread_profiles = []
+            self._main_profile = cProfile.Profile()
+            threading.setprofile(self._enable_thread_profile)
+            self._main_profile.enable()
+        return self.session_id
+
+    def stop(self):
+        """측정을 끝내고 (저장 파일 경로, 상위 함수 요약 문자열)을 돌려줍니다."""
+        if not self.running:
+            raise RuntimeError("프로파일링 중이 아닙니다.")
+        mode, self.mode = self.mode, None
+        elapsed = time.time() - self.started_at
+
+        if not os.path.exists(PROFILE_DIR):
+            os.makedirs(PROFILE_DIR)
+        stamp = datetime.fromtimestamp(self.started_at).strftime("%Y%m%d_%H%M%S")
+
+        if mode == "sample":
+            self._stop_event.set()
+            self._sampler.join(timeout=2)
+            path = os.path.join(PROFILE_DIR, f"profile_{stamp}.collapsed")
+            self._write_collapsed(path)
+            summary = self._sample_summary(elapsed)
+        else:
+            self._main_profile.disable()
+            threading.setprofile(None)
+            path = os.path.join(PROFILE_DIR, f"profile_{stamp}.pstats")
+            summary = self._cprofile_summary(path, elapsed)
+        return path, summary
+
+    # --- sample 모드 ---
+    def _sample_loop(self):
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(SAMPLE_INTERVAL):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self._stacks[tuple(reversed(stack))] += 1
+            self._sample_count += 1
+
+    def _write_collapsed(self, path):
+        # flamegraph.pl / speedscope 에서 바로 열 수 있는 collapsed stack 형식
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(";".join(part.replace(";", ":") for part in stack) + f" {count}\n")
+
+    def _sample_summary(self, elapsed):
+        if not self._sample_count:
+            return "[알림] 수집된 샘플이 없습니다."
+        cumulative = Counter()
+        own = Counter()
+        for stack, count in self._stacks.items():
+            # 스레드 이름(첫 항목)은 제외하고, 재귀 호출은 한 번만 집계
+            for func in set(stack[1:]):
+                cumulative[func] += count
+            if len(stack) > 1:
+                own[stack[-1]] += count
+
+        total = self._sample_count
+        lines = [f"[시스템] 샘플 {total:,}회 / {elapsed:.1f}초 (스레드별 샘플 비율, 100% = 해당 시간 내내 실행)",
+                 f"{'누적%':>7} {'자체%':>7}  함수"]
+        for func, count in cumulative.most_common(TOP_N):
+            lines.append(f"{count / total * 100:>6.1f}% {own[func] / total * 100:>6.1f}%  {func}")
+        return "\n".join(lines)
+
+    # --- cprofile 모드 ---
+    def _enable_thread_profile(self, frame, event, arg):
+        # threading.setprofile 로 등록되어 새 스레드의 첫 이벤트에서 한 번 호출됨
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # 다른 프로파일러가 이미 켜져 있으면 이 스레드는 측정 없이 그대로 실행 (훅도 해제해 매 호출마다 다시 시도하지 않음)
+            sys.setprofile(None)
+            return
+        self._thread_profiles.append((threading.current_thread(), profile))
+
+    def _cprofile_summary(self, path, elapsed):
+        stats = pstats.Stats(self._main_profile)
+        skipped = 0
+        for thread, profile in self._thread_profiles:
+            # 아직 실행 중인 스레드의 프로파일러는 다른 스레드에서 안전하게 멈출 수 없으므로 제외
+            if thread.is_alive():
+                skipped += 1
+                continue
+            try:
+                stats.add(profile)
+            except TypeError:
+                # 호출 기록이 하나도 없는 프로파일러
+                skipped += 1
+        self._thread_profiles = []
+        stats.dump_stats(path)
+
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(TOP_N)
+        header = f"[시스템] cProfile {elapsed:.1f}초 (메인 스레드 + 종료된 작업 스레드, 실행 중이거나 기록 없는 스레드 {skipped}개 제외)"
+        body = "\n".join(line for line in out.getvalue().splitlines() if line.strip())
+        return header + "\n" + body
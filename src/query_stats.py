@@ -0,0 +1,151 @@
+# src/query_stats.py
+import os
+import re
+import time
+import threading
+from datetime import datetime
+
+from .metrics import metrics
+
+SLOW_LOG_PATH = os.path.join("logs", "slow_query.log")
+EXPLAIN_COOLDOWN = 300  # 같은 형태의 쿼리는 5분에 한 번만 EXPLAIN
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "INSERT", "REPLACE")
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_REPEATED_OR = re.compile(r"(\w+ LIKE %s)(?: OR \1)+")
+
+def normalize_sql(sql):
+    # 값만 다른 쿼리를 하나로 묶기 위한 형태(shape): 공백 정리, 리터럴/가변 길이 목록 치환
+    shape = _WHITESPACE.sub(" ", sql).strip()
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(...)", shape)
+    shape = _REPEATED_OR.sub(r"\1 OR ...", shape)
+    return shape
+
+class QueryStats:
+    def __init__(self, slow_ms=100, slow_log_path=SLOW_LOG_PATH):
+        self.slow_seconds = slow_ms / 1000
+        self.slow_log_path = slow_log_path
+        self.lock = threading.Lock()
+        self.shapes = {}  # shape -> [횟수, 총 시간, 최대 시간, 총 행 수, 느린 횟수]
+        self.last_explain = {}
+
+    def record(self, shape, elapsed, rows):
+        with self.lock:
+            entry = self.shapes.get(shape)
+            if entry is None:
+                entry = self.shapes[shape] = [0, 0.0, 0.0, 0, 0]
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+            entry[3] += max(rows, 0)
+            if elapsed >= self.slow_seconds:
+                entry[4] += 1
+        metrics.observe("db_query", elapsed)
+
+    def should_explain(self, shape):
+        now = time.time()
+        with self.lock:
+            if now - self.last_explain.get(shape, 0) < EXPLAIN_COOLDOWN:
+                return False
+            self.last_explain[shape] = now
+            return True
+
+    def write_slow_log(self, query, elapsed, rows, plan):
+        log_dir = os.path.dirname(self.slow_log_path)
+        try:
+            if log_dir and not os.path.exists(log_dir):
+                os.makedirs(log_dir)
+            with self.lock, open(self.slow_log_path, "a", encoding="utf-8") as f:
+                f.write(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {elapsed * 1000:.1f}ms, {rows}행\n{query.strip()}\n")
+                if plan:
+                    f.write(plan + "\n")
+                f.write("\n")
+        except Exception as e:
+            print(f"[오류] 느린 쿼리 기록 실패: {e}")
+
+    def reset(self):
+        with self.lock:
+            self.shapes.clear()
+            self.last_explain.clear()
+
+    def format_summary(self, limit=10):
+        with self.lock:
+            items = [(shape, list(entry)) for shape, entry in self.shapes.items()]
+        if not items:
+            return "[알림] 아직 기록된 쿼리가 없습니다."
+        items.sort(key=lambda item: item[1][1], reverse=True)
+        lines = [f"[시스템] 쿼리 형태 {len(items)}종 (총 시간 순 상위 {min(limit, len(items))}개, 느린 기준 {self.slow_seconds * 1000:g}ms)",
+                 f"{'횟수':>7} {'총(ms)':>10} {'평균':>8} {'최대':>8} {'평균행':>8} {'느림':>5}  쿼리"]
+        for shape, (count, total, max_time, rows, slow) in items[:limit]:
+            text = shape if len(shape) <= 120 else shape[:117] + "..."
+            lines.append(f"{count:>7} {total * 1000:>10.1f} {total / count * 1000:>8.2f} {max_time * 1000:>8.2f} "
+                         f"{rows / count:>8.1f} {slow:>5}  {text}")
+        return "\n".join(lines)
+
+def _load_slow_ms():
+    try:
+        return float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+    except ValueError:
+        return 100.0
+
+# DatabaseManager 의 모든 연결이 공유하는 통계
+query_stats = QueryStats(_load_slow_ms())
+
+def _build_instrumented_cursor():
+    # pymysql 은 DB 에 처음 연결할 때 불러옴 (창이 뜨기 전 import 시간 단축)
+    import pymysql
+
+    class InstrumentedCursor(pymysql.cursors.Cursor):
+        """
+        execute 마다 쿼리 형태별 소요 시간/행 수를 기록하고, 기준보다 느린 쿼리는 EXPLAIN 결과와 함께 느린 쿼리 로그에 남기는 커서.
+        executemany 도 내부적으로 execute 를 거치므로 함께 기록됩니다.
+        """
+        def execute(self, query, args=None):
+            start = time.perf_counter()
+            try:
+                return super().execute(query, args)
+            finally:
+                elapsed = time.perf_counter() - start
+                shape = normalize_sql(query)
+                query_stats.record(shape, elapsed, self.rowcount)
+                if elapsed >= query_stats.slow_seconds:
+                    self._log_slow(query, args, shape, elapsed)
+
+        def _log_slow(self, query, args, shape, elapsed):
+            try:
+                full_query = self.mogrify(query, args)
+            except Exception:
+                full_query = query
+            plan = None
+            if full_query.lstrip().upper().startswith(EXPLAINABLE) and query_stats.should_explain(shape):
+                plan = self._explain(full_query)
+            query_stats.write_slow_log(full_query, elapsed, self.rowcount, plan)
+
+        def _explain(self, full_query):
+            # 계측되지 않는 기본 커서로 실행해 재귀 기록을 피하고, 현재 커서의 결과는 그대로 둠
+            try:
+                with pymysql.cursors.Cursor(self.connection) as cursor:
+                    cursor.execute("EXPLAIN " + full_query)
+                    columns = [desc[0] for desc in cursor.description]
+                    rows = cursor.fetchall()
+            except Exception as e:
+                return f"(EXPLAIN 실패: {e})"
+            lines = [" | ".join(columns)]
+            lines.extend(" | ".join("NULL" if value is None else str(value) for value in row) for row in rows)
+            return "\n".join(lines)
+
+    return InstrumentedCursor
+
+def __getattr__(name):
+    # from .query_stats import InstrumentedCursor 를 처음 사용할 때 클래스를 만듦
+    if name == "InstrumentedCursor":
+        cursor_class = _build_instrumented_cursor()
+        globals()["InstrumentedCursor"] = cursor_class
+        return cursor_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
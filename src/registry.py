@@ -0,0 +1,174 @@
+# src/registry.py
+import os
+import csv
+import time
+import queue
+import threading
+from collections import Counter
+from datetime import datetime
+
+from .metrics import metrics
+
+class WordRegistry:
+    """
+    한 줄에 항목 하나씩 쌓이는 기록 파일(unknown_words.txt, violation_users.txt)의 메모리 색인.
+    open() 하면 작업 스레드가 파일을 한 번만 읽어 set 으로 올린 뒤, 이후 새 항목을 모아서 한 번에 append 합니다.
+    중복 확인은 set 조회(O(1))라 파일이 커져도 느려지지 않습니다.
+    - counts : 이번 실행에서 항목별로 몇 번 들어왔는지 (export_counts 로 CSV 저장)
+    - REGISTRY_ROTATE_KB : 설정하면 파일이 그보다 커질 때 이름_YYYYmmdd_HHMMSS.txt 로 옮기고 새 파일에 이어 씀
+      (옮긴 파일은 다음 실행에서 읽지 않으므로 그 안의 항목은 한 번 더 기록될 수 있음)
+    - REGISTRY_EXPORT_COUNTS=1 : 종료할 때 logs/이름_counts_시각.csv 로 항목별 횟수 저장
+    """
+    FLUSH_INTERVAL = 0.5
+
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name
+        self.entries = set()
+        self.counts = Counter()
+        self.rotate_bytes = 0
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.writer_queue = None
+        self.writer = None
+        self.written = 0
+        self.rotations = 0
+
+    def open(self):
+        with self.lock:
+            if self.writer is not None:
+                return
+            try:
+                self.rotate_bytes = int(float(os.getenv("REGISTRY_ROTATE_KB", "0")) * 1024)
+            except ValueError:
+                print("[오류] REGISTRY_ROTATE_KB 값이 올바르지 않습니다. 순환 기록을 사용하지 않습니다.")
+                self.rotate_bytes = 0
+            self.ready.clear()
+            self.writer_queue = queue.Queue()
+            self.writer = threading.Thread(target=self._writer_loop, args=(self.writer_queue,),
+                                           name=f"registry-{self.name}", daemon=True)
+            self.writer.start()
+
+    def _load(self):
+        start = time.perf_counter()
+        entries = set()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries.update(line.strip() for line in f if line.strip())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[오류] {self.path} 읽기 실패: {e}")
+        with self.lock:
+            self.entries |= entries
+        metrics.observe(f"registry_{self.name}_load", time.perf_counter() - start)
+
+    def _wait_ready(self):
+        if self.writer is None:
+            self.open()
+        self.ready.wait()
+
+    def reserve(self, entry):
+        # 처음 보는 항목이면 색인에만 추가하고 True (파일 기록은 commit). 이미 있으면 False. 횟수는 항상 셈
+        self._wait_ready()
+        with self.lock:
+            self.counts[entry] += 1
+            if entry in self.entries:
+                return False
+            self.entries.add(entry)
+        return True
+
+    def commit(self, entry):
+        items = self.writer_queue
+        if items is not None:
+            items.put(entry)
+
+    def release(self, entry):
+        # reserve 후 처리에 실패한 경우 다음에 다시 시도할 수 있도록 색인에서 제거
+        with self.lock:
+            self.entries.discard(entry)
+
+    def add(self, entry):
+        if not self.reserve(entry):
+            return False
+        self.commit(entry)
+        metrics.inc(f"registry_{self.name}_new")
+        return True
+
+    def __contains__(self, entry):
+        self._wait_ready()
+        return entry in self.entries
+
+    def _writer_loop(self, items):
+        self._load()
+        self.ready.set()
+        while True:
+            batch = [items.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(items.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            lines = [entry for entry in batch if entry is not None]
+            if lines:
+                try:
+                    self._rotate_if_needed()
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+                    self.written += len(lines)
+                except Exception as e:
+                    print(f"[오류] {self.path} 기록 실패: {e}")
+            if batch[-1] is None:
+                break
+
+    def _rotate_if_needed(self):
+        if not self.rotate_bytes:
+            return
+        try:
+            if os.path.getsize(self.path) < self.rotate_bytes:
+                return
+        except OSError:
+            return
+        base, ext = os.path.splitext(self.path)
+        os.replace(self.path, f"{base}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{ext}")
+        self.rotations += 1
+        print(f"[시스템] {self.path} 순환 기록 (누적 {self.rotations}회)")
+
+    def export_counts(self, path=None):
+        # 항목별 횟수를 많은 순으로 CSV 저장. 저장한 경로 반환
+        path = path or os.path.join("logs", f"{self.name}_counts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        log_dir = os.path.dirname(path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+        with self.lock:
+            rows = self.counts.most_common()
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([self.name, "count"])
+            writer.writerows(rows)
+        return path
+
+    def format_summary(self):
+        return (f"[{self.name}] 등록 {len(self.entries):,}건 / 이번 실행 {sum(self.counts.values()):,}회 "
+                f"(새 항목 {self.written:,}건 기록, 순환 {self.rotations}회)")
+
+    def close(self):
+        writer, items = self.writer, self.writer_queue
+        self.writer = self.writer_queue = None
+        if items is not None:
+            items.put(None)
+        if writer is not None:
+            writer.join(timeout=3)
+        if self.counts and os.getenv("REGISTRY_EXPORT_COUNTS", "0") == "1":
+            try:
+                print(f"[시스템] {self.name} 횟수 저장: {self.export_counts()}")
+            except Exception as e:
+                print(f"[오류] {self.name} 횟수 저장 실패: {e}")
+
+# 프로그램 전역에서 공유하는 기록 색인
+unknown_words = WordRegistry("unknown_words.txt", "unknown_words")
+violation_users = WordRegistry("violation_users.txt", "violation_users")
@@ -2,9 +2,14 @@
 from PyQt6.QtCore import QObject, pyqtSignal
 
 class GameSignals(QObject):
-    # 네트워크 -> GUI: 채팅 감지 (플랫폼, 닉네임, 단어)
-    word_detected = pyqtSignal(str, str, str)         
+    # Qt 창에서 쓰는 시그널. 헤드리스 모드는 같은 이름의 순수 파이썬 구현(engine.EngineSignals)을 사용
+    # 네트워크 -> GUI: 채팅 감지 (플랫폼, 닉네임, 단어, 지연 추적 ChatTrace)
+    word_detected = pyqtSignal(str, str, str, object)         
     
+    # 수집 큐 -> GUI: 일정 간격으로 묶은 정답 후보 목록
+    # [(플랫폼, 닉네임, 단어, ChatTrace, 사전검사 결과 (탈락 사유, 검사 기준 단어) 또는 None), ...]
+    word_batch = pyqtSignal(object)
+
     # 네트워크 -> GUI: 방송 종료 감지 (신호 보낸 플랫폼 이름)
     stream_offline = pyqtSignal(str)                
     
@@ -16,7 +21,3 @@ class GameSignals(QObject):
     
     # 시스템 -> GUI: 화면 로그 출력
     gui_log_message = pyqtSignal(str)
-    
-    # 백그라운드 스레드 -> GUI: 단어 검증 결과 (플랫폼 추가)
-    # 인자: result_status(str), platform(str), nickname(str), word(str), is_game_over(bool)
-    game_check_result = pyqtSignal(str, str, str, str, bool)
\ No newline at end of file
@@ -0,0 +1,99 @@
+# src/stall_detector.py
+import os
+import sys
+import time
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+from .metrics import metrics
+
+class StallDetector:
+    """
+    메인(Qt/qasync) 스레드의 이벤트 루프 멈춤 감지기.
+    GUI 쪽 QTimer 가 heartbeat_ms 마다 beat() 를 호출하고, 감시 스레드는 마지막 beat 이후
+    threshold_ms 가 지나면 그 순간의 메인 스레드 파이썬 스택을 기록합니다.
+    루프가 다시 돌기 시작하면 실제 멈춘 시간을 함께 남깁니다.
+    """
+    def __init__(self, threshold_ms=200, heartbeat_ms=50, log_path=os.path.join("logs", "stalls.log"), log_func=None):
+        self.threshold = threshold_ms / 1000
+        self.heartbeat_ms = heartbeat_ms
+        self.log_path = log_path
+        self.log_func = log_func  # (level, source, message, trace) -> app_logs
+        self.main_ident = threading.get_ident()  # 메인 스레드에서 생성해야 함
+        self.last_beat = time.perf_counter()
+        self.stall_count = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        log_dir = os.path.dirname(log_path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+
+    def beat(self):
+        self.last_beat = time.perf_counter()
+
+    def start(self):
+        self.beat()
+        self.thread = threading.Thread(target=self._watch_loop, name="stall-detector", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def _capture_main_stack(self):
+        frame = sys._current_frames().get(self.main_ident)
+        if frame is None:
+            return "(메인 스레드 스택을 찾을 수 없음)"
+        return "".join(traceback.format_stack(frame))
+
+    def _write(self, text):
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(text)
+        except Exception as e:
+            print(f"[오류] 멈춤 기록 실패: {e}")
+
+    def _watch_loop(self):
+        poll = max(self.threshold / 4, 0.005)
+        stalled_beat = None
+        stack = None
+        while not self.stop_event.wait(poll):
+            last_beat = self.last_beat
+            if stalled_beat is None:
+                if time.perf_counter() - last_beat > self.threshold:
+                    # 멈춘 순간의 스택을 먼저 남겨두어 프로그램이 아예 응답하지 않는 경우에도 원인을 알 수 있게 함
+                    stalled_beat = last_beat
+                    stack = self._capture_main_stack()
+                    started = datetime.now() - timedelta(seconds=time.perf_counter() - last_beat)
+                    self._write(f"[{started:%Y-%m-%d %H:%M:%S}] 이벤트 루프 멈춤 감지 (>{self.threshold * 1000:.0f}ms)\n{stack}\n")
+            elif last_beat != stalled_beat:
+                # 다음 beat 까지의 간격에서 정상 heartbeat 주기를 빼면 실제 멈춘 시간
+                duration = last_beat - stalled_beat - self.heartbeat_ms / 1000
+                self._record(duration, stack)
+                stalled_beat = None
+                stack = None
+
+    def _record(self, duration, stack):
+        self.stall_count += 1
+        metrics.observe("event_loop_stall", duration)
+        message = f"이벤트 루프 {duration * 1000:.0f}ms 멈춤"
+        self._write(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message} (누적 {self.stall_count}회)\n\n")
+        if self.log_func:
+            self.log_func(7, "StallDetector", message, stack)
+
+def create_stall_detector_from_env(log_func=None):
+    # STALL_DETECTOR=1 일 때만 동작, 기준 시간은 STALL_THRESHOLD_MS (기본 200ms)
+    if os.getenv("STALL_DETECTOR", "0") != "1":
+        return None
+    try:
+        threshold_ms = float(os.getenv("STALL_THRESHOLD_MS", "200"))
+    except ValueError:
+        print("[오류] STALL_THRESHOLD_MS 값이 올바르지 않습니다.")
+        return None
+    detector = StallDetector(threshold_ms=threshold_ms, log_func=log_func)
+    detector.start()
+    print(f"[시스템] 이벤트 루프 멈춤 감지 시작 (기준 {threshold_ms:g}ms, 기록: {detector.log_path})")
+    return detector
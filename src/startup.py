@@ -0,0 +1,110 @@
+# src/startup.py
+# 시작 시간 측정과 사전 점검 실행. main.py 가 가장 먼저 불러오므로 가벼운 표준 모듈만 사용
+import os
+import time
+import queue
+import threading
+
+from .metrics import metrics
+
+class StartupTimer:
+    """
+    프로그램 시작 구간별 경과 시간. 모듈을 처음 불러온 시각을 기준점으로 삼습니다.
+    - import      : GUI/엔진 모듈 불러오기 완료
+    - window      : 메인 창 생성 완료
+    - first_frame : 첫 화면 그리기 완료
+    - checks      : 사전 점검 완료
+    - ready       : 게임 시작 (시작 단어 대화상자에서 기다린 시간 포함)
+    """
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.marks = {}
+        self.reported = False
+
+    def mark(self, name):
+        # 같은 구간은 처음 한 번만 기록 (다시 검사 등)
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.origin
+
+    def format_report(self):
+        parts = []
+        previous = 0.0
+        for name, at in sorted(self.marks.items(), key=lambda item: item[1]):
+            parts.append(f"{name} {at * 1000:.0f}ms (+{(at - previous) * 1000:.0f})")
+            previous = at
+        return "[시스템] 시작 시간: " + " / ".join(parts)
+
+    def report(self, log_func=None):
+        # log_func: DatabaseManager.log_system (app_logs 에 남김)
+        if self.reported:
+            return
+        self.reported = True
+        for name, at in self.marks.items():
+            metrics.observe(f"startup_{name}", at)
+        message = self.format_report()
+        print(message)
+        if log_func:
+            log_func(6, "Startup", message, None)
+
+startup_timer = StartupTimer()
+
+def check_timeouts():
+    # STARTUP_CHECK_TIMEOUT (기본 8초), 점검별로 STARTUP_CHECK_TIMEOUT_DB 처럼 덮어쓸 수 있음
+    try:
+        default = float(os.getenv("STARTUP_CHECK_TIMEOUT", "8"))
+    except ValueError:
+        default = 8.0
+    def get(name):
+        try:
+            return float(os.getenv(f"STARTUP_CHECK_TIMEOUT_{name.upper()}", default))
+        except ValueError:
+            return default
+    return get
+
+def run_startup_checks(checks, timeout=None, on_result=None):
+    """
+    사전 점검을 동시에 실행합니다. checks 는 {이름: 인자 없는 함수 -> (성공 여부, 메시지)}.
+    점검마다 제한 시간이 지나면 (False, "시간 초과") 로 처리하고, 끝나지 않은 점검 스레드는 daemon 이라 종료를 막지 않습니다.
+    on_result(이름, 성공 여부, 메시지) 는 결과가 나오는 대로 이 스레드에서 호출됩니다.
+    반환: {이름: (성공 여부, 메시지)}
+    """
+    timeout = timeout or check_timeouts()
+    start = time.perf_counter()
+    deadlines = {name: start + timeout(name) for name in checks}
+    results = queue.Queue()
+
+    def worker(name, func):
+        try:
+            ok, msg = func()
+        except Exception as e:
+            ok, msg = False, f"오류: {e}"
+        results.put((name, ok, msg, time.perf_counter()))
+
+    for name, func in checks.items():
+        threading.Thread(target=worker, args=(name, func), name=f"startup-{name}", daemon=True).start()
+
+    done = {}
+
+    def finish(name, ok, msg):
+        done[name] = (ok, msg)
+        if on_result:
+            on_result(name, ok, msg)
+
+    while len(done) < len(checks):
+        pending = [name for name in checks if name not in done]
+        wait = min(deadlines[name] for name in pending) - time.perf_counter()
+        try:
+            name, ok, msg, finished = results.get(timeout=max(wait, 0))
+        except queue.Empty:
+            # 제한 시간이 지난 점검만 먼저 실패 처리하고 나머지는 계속 기다림
+            now = time.perf_counter()
+            for name in pending:
+                if deadlines[name] <= now:
+                    metrics.inc("startup_check_timeout")
+                    finish(name, False, f"시간 초과 ({timeout(name):g}초)")
+            continue
+        if name in done:
+            continue
+        metrics.observe(f"startup_check_{name}", finished - start)
+        finish(name, ok, msg)
+    return done
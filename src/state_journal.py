@@ -0,0 +1,167 @@
+# src/state_journal.py
+import os
+import json
+import time
+import queue
+import threading
+
+# 기록하는 키: current_word, last_change_time, last_platform, last_user, db_reset_time, banned_chars
+TIME_FORMAT = "%Y.%m.%d %H:%M:%S"
+
+class StateJournal:
+    """
+    게임 진행 상태를 추가 전용(JSONL) 파일에 기록하는 저널. .env 를 통째로 다시 쓰던 방식을 대체합니다.
+    update() 는 메모리 상태만 바꾸고 변경분을 큐에 넣으므로 호출한 스레드(이벤트 루프)를 막지 않습니다.
+    작업 스레드는 flush_interval 동안 모인 변경을 한 줄로 합쳐 쓰고 fsync 는 묶음마다 한 번만 합니다.
+    줄 수가 compact_every 를 넘으면 현재 상태 한 줄짜리 파일로 교체(os.replace)합니다.
+    - STATE_JOURNAL_PATH (기본 state_journal.jsonl), STATE_JOURNAL_FLUSH_MS (기본 1000), STATE_JOURNAL_COMPACT (기본 1000줄)
+    """
+    def __init__(self):
+        self.path = None
+        self.state = {}
+        self.flush_interval = 1.0
+        self.compact_every = 1000
+        self.lines = 0
+        self.compact_at = 1000
+        self.compactions = 0
+        self.writes = 0
+        self.writer_queue = None
+        self.writer = None
+        self.lock = threading.Lock()
+
+    def open_from_env(self):
+        try:
+            flush_ms = float(os.getenv("STATE_JOURNAL_FLUSH_MS", "1000"))
+            compact_every = int(os.getenv("STATE_JOURNAL_COMPACT", "1000"))
+        except ValueError as e:
+            print(f"[오류] 상태 저널 설정 오류: {e}. 기본값을 사용합니다.")
+            flush_ms, compact_every = 1000, 1000
+        self.open(os.getenv("STATE_JOURNAL_PATH", "state_journal.jsonl"), flush_ms / 1000, compact_every)
+
+    def open(self, path, flush_interval=1.0, compact_every=1000):
+        with self.lock:
+            if self.writer is not None:
+                return
+            self.path = path
+            self.flush_interval = flush_interval
+            self.compact_every = max(1, compact_every)
+            self.compact_at = self.compact_every
+            start = time.perf_counter()
+            self.state, self.lines = self._load(path)
+            if self.state:
+                print(f"[시스템] 상태 저널 복원: {len(self.state)}개 항목, {self.lines}줄 ({(time.perf_counter() - start) * 1000:.1f}ms)")
+            self.writer_queue = queue.Queue()
+            self.writer = threading.Thread(target=self._writer_loop, args=(self.writer_queue, dict(self.state)),
+                                           name="state-journal", daemon=True)
+            self.writer.start()
+
+    @staticmethod
+    def _load(path):
+        # 줄마다 변경된 키만 들어 있으므로 순서대로 덮어쓰면 마지막 상태가 됨.
+        # 쓰는 도중 종료되어 잘린 줄은 건너뜀
+        state = {}
+        lines = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        changes = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(changes, dict):
+                        state.update(changes)
+                        lines += 1
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[오류] 상태 저널 읽기 실패: {e}")
+        return state, lines
+
+    def get(self, key, default=None):
+        return self.state.get(key, default)
+
+    def update(self, **changes):
+        self.state.update(changes)
+        if self.writer_queue is not None:
+            self.writer_queue.put(changes)
+
+    def _writer_loop(self, items, written):
+        # written: 파일에 실제로 기록된 상태 (압축 시 이 상태를 한 줄로 씀)
+        try:
+            f = open(self.path, "a", encoding="utf-8")
+        except Exception as e:
+            print(f"[오류] 상태 저널 열기 실패: {e}")
+            self.writer_queue = None
+            return
+        while True:
+            batch = [items.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(items.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            merged = {}
+            for changes in batch:
+                if changes is not None:
+                    merged.update(changes)
+            if merged:
+                written.update(merged)
+                try:
+                    if f.closed:
+                        # 이전 압축/기록 중 닫힌 채로 남은 경우 다시 열어서 이어 씀
+                        f = open(self.path, "a", encoding="utf-8")
+                    f.write(json.dumps(merged, ensure_ascii=False, separators=(",", ":")) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self.lines += 1
+                    self.writes += 1
+                    if self.lines >= self.compact_at:
+                        f = self._compact(f, written)
+                except Exception as e:
+                    print(f"[오류] 상태 저널 기록 실패: {e}")
+            if batch[-1] is None:
+                break
+        f.close()
+
+    def _compact(self, f, written):
+        # 현재 상태 한 줄을 임시 파일에 쓰고 fsync 후 교체 -> 도중에 종료되어도 기존 파일 또는 새 파일 중 하나는 온전함
+        # 교체에 실패하면(Windows 에서 백신/백업 도구가 파일을 잡고 있는 경우 등) 기존 파일에 계속 쓰고 나중에 다시 시도
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as tmp:
+                tmp.write(json.dumps(written, ensure_ascii=False, separators=(",", ":")) + "\n")
+                tmp.flush()
+                os.fsync(tmp.fileno())
+        except Exception as e:
+            print(f"[오류] 상태 저널 압축 실패: {e}")
+            self.compact_at = self.lines + max(1, self.compact_every // 10)
+            return f
+
+        # Windows 는 열려 있는 파일을 교체할 수 없으므로 닫은 뒤 교체하고, 성공 여부와 관계없이 다시 엶
+        f.close()
+        try:
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"[오류] 상태 저널 압축 실패: {e}. 기존 파일에 계속 기록합니다.")
+            self.compact_at = self.lines + max(1, self.compact_every // 10)
+        else:
+            self.lines = 1
+            self.compact_at = self.compact_every
+            self.compactions += 1
+        return open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        writer, items = self.writer, self.writer_queue
+        self.writer = self.writer_queue = None
+        if items is not None:
+            items.put(None)
+        if writer is not None:
+            writer.join(timeout=3)
+
+# 프로그램 전역에서 공유하는 상태 저널
+journal = StateJournal()
@@ -0,0 +1,137 @@
+# src/tracing.py
+import os
+import json
+import time
+import queue
+import itertools
+import threading
+from datetime import datetime
+
+from .metrics import metrics
+
+# 지연 분포에서 제외하고 파일에만 남기는 결과 (게임 상태로 무시됨, 수집 큐에서 버려짐/병합됨)
+UNMEASURED_OUTCOMES = ("ignored", "dropped", "coalesced")
+
+# (구간 이름, 시작 시점, 끝 시점)
+TRACE_STAGES = (
+    ("platform", "server_time", "received"),   # 플랫폼 메시지 시각 -> 모니터 수신
+    ("ingest", "received", "dispatched"),      # 모니터 수신 -> handle_new_word 진입
+    ("validate", "dispatched", "validated"),   # 판정 시작 -> DB 검증 완료
+    ("render", "validated", "rendered"),       # 검증 완료 -> 화면 반영 완료
+)
+
+class ChatTrace:
+    # 채팅 한 건이 모니터에서 화면까지 가는 동안의 시각(epoch 초) 기록
+    __slots__ = ("trace_id", "platform", "server_time", "received", "dispatched", "validated", "rendered")
+
+    def __init__(self, trace_id, platform, server_time=None):
+        self.trace_id = trace_id
+        self.platform = platform
+        self.server_time = server_time
+        self.received = time.time()
+        self.dispatched = None
+        self.validated = None
+        self.rendered = None
+
+    def mark(self, stage):
+        setattr(self, stage, time.time())
+
+    def durations(self):
+        result = {}
+        for name, start_attr, end_attr in TRACE_STAGES:
+            start, end = getattr(self, start_attr), getattr(self, end_attr)
+            if start is not None and end is not None:
+                result[name] = end - start
+        if self.rendered is not None:
+            result["total"] = self.rendered - (self.server_time if self.server_time is not None else self.received)
+        return result
+
+class Tracer:
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.platforms = set()
+        self.writer_queue = None
+        self.writer = None
+        self.path = None
+
+    def new_trace(self, platform, server_time_ms=None):
+        # server_time_ms: 플랫폼이 알려준 메시지 시각 (치지직 msgTime, 유튜브 timestamp, 밀리초)
+        server_time = server_time_ms / 1000 if isinstance(server_time_ms, (int, float)) and server_time_ms > 0 else None
+        return ChatTrace(next(self._ids), platform, server_time)
+
+    def finish(self, trace, outcome):
+        if trace is None:
+            return
+        if trace.rendered is None:
+            trace.mark("rendered")
+        durations = trace.durations()
+        if outcome not in UNMEASURED_OUTCOMES:
+            self.platforms.add(trace.platform)
+            for name, seconds in durations.items():
+                metrics.observe(f"trace_{trace.platform}_{name}", max(seconds, 0.0))
+        if self.writer_queue is not None:
+            self.writer_queue.put({
+                "id": trace.trace_id, "p": trace.platform, "outcome": outcome,
+                "st": trace.server_time, "recv": trace.received, "disp": trace.dispatched,
+                "valid": trace.validated, "render": trace.rendered,
+                "ms": {name: round(seconds * 1000, 2) for name, seconds in durations.items()},
+            })
+
+    def format_summary(self):
+        if not self.platforms:
+            return "[알림] 아직 기록된 추적 정보가 없습니다."
+        names = [stage[0] for stage in TRACE_STAGES] + ["total"]
+        lines = ["[시스템] 플랫폼별 지연 (p50 / p95 / 최대, ms) - platform 구간은 플랫폼과 PC 시계 차이를 포함합니다."]
+        for platform in sorted(self.platforms):
+            lines.append(f"[{platform}]")
+            for name in names:
+                hist = metrics.histograms.get(f"trace_{platform}_{name}")
+                if hist is None:
+                    continue
+                snap = hist.snapshot()
+                if snap[2] == 0:
+                    continue
+                lines.append(f"  {name:<9} {snap[2]:>7}건  {hist.quantile(0.5, snap) * 1000:>9.1f} / "
+                             f"{hist.quantile(0.95, snap) * 1000:>9.1f} / {snap[3] * 1000:>9.1f}")
+        return "\n".join(lines)
+
+    def open_from_env(self):
+        # TRACE_PATH 예: logs/trace_%Y%m%d_%H%M%S.jsonl (strftime 형식 지원)
+        path = os.getenv("TRACE_PATH")
+        if not path or self.writer is not None:
+            return
+        self.path = datetime.now().strftime(path)
+        log_dir = os.path.dirname(self.path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+        self.writer_queue = queue.Queue()
+        self.writer = threading.Thread(target=self._writer_loop, args=(self.writer_queue,), daemon=True)
+        self.writer.start()
+        print(f"[시스템] 지연 추적 기록 활성화: {self.path}")
+
+    def _writer_loop(self, items):
+        try:
+            f = open(self.path, "a", encoding="utf-8")
+        except Exception as e:
+            print(f"[오류] 추적 파일 열기 실패: {e}")
+            self.writer_queue = None
+            return
+        with f:
+            while True:
+                item = items.get()
+                if item is None:
+                    break
+                f.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n")
+                if items.empty():
+                    f.flush()
+
+    def close(self):
+        writer, items = self.writer, self.writer_queue
+        self.writer = self.writer_queue = None
+        if items is not None:
+            items.put(None)
+        if writer is not None:
+            writer.join(timeout=3)
+
+# 프로그램 전역에서 공유하는 추적기
+tracer = Tracer()
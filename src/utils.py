@@ -1,11 +1,13 @@
 # src/utils.py
 import re
 import os
-import smtplib
 import threading
-from email.mime.text import MIMEText
 from datetime import datetime
 
+from .metrics import metrics
+from .registry import unknown_words, violation_users
+from .mailer import mail_outbox
+
 # 파일 접근 경합 방지용 락
 file_lock = threading.Lock()
 
@@ -55,110 +57,51 @@ def update_env_variable(key, value):
             print(f"[시스템] .env 업데이트 실패: {e}")
 
 def log_unknown_word(word):
+    # 중복 확인은 메모리 색인에서, 파일 기록은 색인의 작업 스레드가 모아서 처리
     if len(word) < 2:
         return
-
-    file_path = "unknown_words.txt"
-    
-    with file_lock:
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    existing_words = {line.strip() for line in f}
-                
-                if word in existing_words:
-                    return 
-            except Exception:
-                pass 
-
-        try:
-            with open(file_path, "a", encoding="utf-8") as f:
-                f.write(f"{word}\n")
-        except Exception as e:
-            print(f"[오류] 없는 단어 기록 실패: {e}")
+    unknown_words.add(word)
 
 def handle_violation_alert(nickname, word):
-    record_file = "violation_users.txt"
-    
-    with file_lock:
-        if os.path.exists(record_file):
-            try:
-                with open(record_file, "r", encoding="utf-8") as f:
-                    sent_users = [line.strip() for line in f.readlines()]
-                    if nickname in sent_users:
-                        return False
-            except Exception:
-                pass
-
-    smtp_server = os.getenv("MAIL_SERVER", "smtp.naver.com")
-    smtp_port = int(os.getenv("MAIL_PORT", 465))
-    sender = os.getenv("MAIL_SENDER")
-    password = os.getenv("MAIL_PASSWORD")
-    receiver = os.getenv("MAIL_RECEIVER")
-
-    if not (sender and password and receiver):
+    # 사용자마다 한 번만 알림. 메일 보관함에 넣지 못하면(설정 누락) 색인에서 빼서 다음 위반 때 다시 시도
+    if not violation_users.reserve(nickname):
         return False
 
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    try:
-        msg = MIMEText(f"다음 사용자가 부적절한 단어를 사용했습니다.\n\n"
-                       f"- 닉네임: {nickname}\n"
-                       f"- 입력 단어: {word}\n"
-                       f"- 감지 시간: {current_time}\n")
-        
-        msg['Subject'] = f"[경고] 부적절한 단어 사용 감지 ({nickname})"
-        msg['From'] = sender
-        msg['To'] = receiver
-
-        # [수정] 무한 대기 방지를 위해 timeout=10 적용
-        with smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=10) as server:
-            server.login(sender, password)
-            server.send_message(msg)
-        
-        with file_lock:
-            try:
-                with open(record_file, "a", encoding="utf-8") as f:
-                    f.write(f"{nickname}\n")
-            except:
-                pass
-        return True
-    except Exception as e:
-        print(f"[오류] 경고 메일 발송 실패: {e}")
+    queued, _ = mail_outbox.enqueue(
+        f"[경고] 부적절한 단어 사용 감지 ({nickname})",
+        f"다음 사용자가 부적절한 단어를 사용했습니다.\n\n"
+        f"- 닉네임: {nickname}\n"
+        f"- 입력 단어: {word}\n"
+        f"- 감지 시간: {current_time}\n",
+        label="경고 메일",
+    )
+    if not queued:
+        violation_users.release(nickname)
         return False
+    # 보관함은 디스크에 남아 재시도되므로 넣은 시점에 기록
+    violation_users.commit(nickname)
+    return True
 
 def send_crash_report_email(error_log):
-    smtp_server = os.getenv("MAIL_SERVER", "smtp.naver.com")
-    smtp_port = int(os.getenv("MAIL_PORT", 465))
-    sender = os.getenv("MAIL_SENDER")
-    password = os.getenv("MAIL_PASSWORD")
-    receiver = os.getenv("MAIL_RECEIVER")
-
-    if not (sender and password and receiver):
+    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    queued, _ = mail_outbox.enqueue(
+        "[긴급] 프로그램 비정상 종료 (Crash Report)",
+        f"프로그램이 치명적인 오류로 인해 비정상 종료되었습니다.\n\n"
+        f"- 발생 시간: {current_time}\n"
+        f"- 오류 내용:\n{error_log}",
+        label="크래시 리포트",
+    )
+    if not queued:
         print("[Utils] 메일 설정 누락으로 크래시 리포트 발송 실패")
         return False
 
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    try:
-        msg = MIMEText(f"프로그램이 치명적인 오류로 인해 비정상 종료되었습니다.\n\n"
-                       f"- 발생 시간: {current_time}\n"
-                       f"- 오류 내용:\n{error_log}")
-        
-        msg['Subject'] = "[긴급] 프로그램 비정상 종료 (Crash Report)"
-        msg['From'] = sender
-        msg['To'] = receiver
-
-        # [수정] timeout=10 적용
-        with smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=10) as server:
-            server.login(sender, password)
-            server.send_message(msg)
-        
+    # 곧 종료되므로 잠시 기다려 바로 보내 봄. 못 보내면 보관함에 남아 다음 실행 때 발송
+    if mail_outbox.flush(timeout=10):
         print("[시스템] 관리자에게 크래시 리포트 메일을 발송했습니다.")
         return True
-    except Exception as e:
-        print(f"[오류] 크래시 리포트 발송 실패: {e}")
-        return False
+    print("[알림] 크래시 리포트를 메일 보관함에 저장했습니다. 다음 실행 때 발송합니다.")
+    return False
 
 class ProfanityFilter:
     def __init__(self, filepath="bad_words.txt"):
@@ -185,6 +128,7 @@ class ProfanityFilter:
         except Exception as e:
             print(f"[오류] 금지어 로드 실패: {e}")
 
+    @metrics.timed("profanity_check")
     def check(self, text):
         text_clean = text.replace(" ", "")
         for bad in self.bad_words:
@@ -192,6 +136,14 @@ class ProfanityFilter:
                 return True, bad
         return False, None
 
+def extract_guess(msg):
+    # 채팅 메시지에서 '!단어' 형식의 정답 후보를 꺼냄 (첫 단어만 사용)
+    msg = msg.strip()
+    if not msg.startswith("!"):
+        return None
+    content = msg[1:].strip()
+    return content.split()[0] if content else None
+
 def apply_dueum_rule(char):
     if not re.match(r'[가-힣]', char):
         return [char]
@@ -229,91 +181,22 @@ def apply_dueum_rule(char):
     return variations
 
 def send_alert_email(current_word, current_winner):
-    smtp_server = os.getenv("MAIL_SERVER", "smtp.naver.com")
-    smtp_port = int(os.getenv("MAIL_PORT", 465))
-    sender = os.getenv("MAIL_SENDER")
-    password = os.getenv("MAIL_PASSWORD")
-    receiver = os.getenv("MAIL_RECEIVER")
-
-    if not (sender and password and receiver):
-        return False, "설정 누락"
-
-    try:
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        winner_text = current_winner if current_winner else "없음"
-        
-        body_text = f"현재 시간 {current_time} 에 {winner_text} 이/가 {current_word} (으)로 진행 중"
-        msg = MIMEText(body_text)
-        
-        msg['Subject'] = "[알림] 끝말잇기 게임 1시간 정시 알림"
-        msg['From'] = sender
-        msg['To'] = receiver
-
-        # [수정] timeout=10 적용
-        with smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=10) as server:
-            server.login(sender, password)
-            server.send_message(msg)
-        
-        return True, "발송 성공"
-    except Exception as e:
-        return False, str(e)
+    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    winner_text = current_winner if current_winner else "없음"
+    return mail_outbox.enqueue("[알림] 끝말잇기 게임 1시간 정시 알림",
+                               f"현재 시간 {current_time} 에 {winner_text} 이/가 {current_word} (으)로 진행 중",
+                               label="알림 메일")
 
 def send_rare_word_email(current_word, current_winner):
-    smtp_server = os.getenv("MAIL_SERVER", "smtp.naver.com")
-    smtp_port = int(os.getenv("MAIL_PORT", 465))
-    sender = os.getenv("MAIL_SENDER")
-    password = os.getenv("MAIL_PASSWORD")
-    receiver = os.getenv("MAIL_RECEIVER")
-
-    if not (sender and password and receiver):
-        return False, "설정 누락"
-
-    try:
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        winner_text = current_winner if current_winner else "없음"
-        
-        body_text = f"현재 시간 {current_time} 에 {winner_text} 이/가 {current_word} (으)로 희귀끝단어 입력"
-        msg = MIMEText(body_text)
-        
-        msg['Subject'] = "[알림] 희귀 끝단어 감지"
-        msg['From'] = sender
-        msg['To'] = receiver
-
-        # [수정] timeout=10 적용
-        with smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=10) as server:
-            server.login(sender, password)
-            server.send_message(msg)
-        
-        return True, "발송 성공"
-    except Exception as e:
-        return False, str(e)
+    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    winner_text = current_winner if current_winner else "없음"
+    return mail_outbox.enqueue("[알림] 희귀 끝단어 감지",
+                               f"현재 시간 {current_time} 에 {winner_text} 이/가 {current_word} (으)로 희귀끝단어 입력",
+                               label=f"희귀단어 알림({current_word})")
 
 def send_game_start_email(start_word, start_user):
-    smtp_server = os.getenv("MAIL_SERVER", "smtp.naver.com")
-    smtp_port = int(os.getenv("MAIL_PORT", 465))
-    sender = os.getenv("MAIL_SENDER")
-    password = os.getenv("MAIL_PASSWORD")
-    receiver = os.getenv("MAIL_RECEIVER")
-
-    if not (sender and password and receiver):
-        return False, "설정 누락"
-
-    try:
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        winner_text = start_user if start_user else "없음"
-        
-        body_text = f"현재 시간 {current_time} 에 {winner_text} 이/가 {start_word} (으)로 게임을 시작했습니다."
-        msg = MIMEText(body_text)
-        
-        msg['Subject'] = "[알림] 끝말잇기 게임 시작"
-        msg['From'] = sender
-        msg['To'] = receiver
-
-        # [수정] timeout=10 적용
-        with smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=10) as server:
-            server.login(sender, password)
-            server.send_message(msg)
-        
-        return True, "발송 성공"
-    except Exception as e:
-        return False, str(e)
\ No newline at end of file
+    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    winner_text = start_user if start_user else "없음"
+    return mail_outbox.enqueue("[알림] 끝말잇기 게임 시작",
+                               f"현재 시간 {current_time} 에 {winner_text} 이/가 {start_word} (으)로 게임을 시작했습니다.",
+                               label="게임 시작 알림 메일")
@@ -0,0 +1,75 @@
+# tests/test_profiler.py
+import sys
+import threading
+
+import pytest
+
+from src import profiler as profiler_module
+from src.profiler import CPUProfiler
+
+def _busy(results):
+    results.append(sum(i * i for i in range(20000)))
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler_module, "PROFILE_DIR", str(tmp_path))
+
+@pytest.mark.skipif(sys.version_info >= (3, 12), reason="3.12 이상은 cprofile 모드를 막음")
+def test_cprofile_thread_started_during_profile_runs():
+    profiler = CPUProfiler()
+    profiler.start("cprofile")
+    results = []
+    try:
+        worker = threading.Thread(target=_busy, args=(results,))
+        worker.start()
+        worker.join(timeout=5)
+    finally:
+        path, summary = profiler.stop()
+    assert results, "프로파일링 중 시작한 스레드의 작업이 실행되지 않음"
+    assert path.endswith(".pstats")
+    assert "_busy" in summary or "cProfile" in summary
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="3.12 이상에서만 해당")
+def test_cprofile_refused_on_312_and_threads_still_run():
+    profiler = CPUProfiler()
+    with pytest.raises(RuntimeError):
+        profiler.start("cprofile")
+    assert not profiler.running
+    results = []
+    worker = threading.Thread(target=_busy, args=(results,))
+    worker.start()
+    worker.join(timeout=5)
+    assert results
+
+def test_thread_hook_survives_active_profiler(monkeypatch):
+    # 다른 프로파일러가 이미 켜져 있어 enable() 이 실패해도 스레드 작업은 그대로 실행되어야 함
+    profiler = CPUProfiler()
+    profiler._thread_profiles = []
+
+    class FailingProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiler_module.cProfile, "Profile", FailingProfile)
+    results = []
+    def target():
+        sys.setprofile(profiler._enable_thread_profile)
+        try:
+            _busy(results)
+        finally:
+            sys.setprofile(None)
+
+    worker = threading.Thread(target=target)
+    worker.start()
+    worker.join(timeout=5)
+    assert results
+    assert profiler._thread_profiles == []
+
+def test_sample_mode_start_stop():
+    profiler = CPUProfiler()
+    profiler.start("sample")
+    results = []
+    _busy(results)
+    path, summary = profiler.stop()
+    assert path.endswith(".collapsed")
+    assert not profiler.running